@@ -8,16 +8,10 @@
 # ============================================================
 
 import RPi.GPIO as GPIO
-import time, serial, os, threading
-from shutil import which
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import time, serial, threading
+import meeting_profiles, chromium_session, composite_camera, session_scheduler, usb_planner, camera_probe, camera_watcher
+import browser_profiles, asset_proxy, prewarm, request_blocking, cdp_channel, session_state, resource_governor
+import session_supervisor, hedged_join, camera_registry, providers, modal_guard, meet_control, rtc_stats
 
 # ----------------------------------------------------------------------
 # ⚙️ GPIO & MODEM SETUP
@@ -26,9 +20,41 @@ PIN_SMS   = 5
 PIN_CALL  = 6
 PIN_CONF  = 13
 PIN_EXIT  = 19
+# optional buttons, IFrame API mode only (PROVIDER = "jitsi_iframe"); None = not wired
+PIN_MUTE   = None           # toggle microphone
+PIN_CAMERA = None           # next connected camera
+
+MEETING_PROFILE = "default"   # "default" or "low_power" (see meeting_profiles.py)
+DUAL_MODE = "two_browsers"    # "two_browsers", "single_browser" (one Chromium, two windows)
+                              # or "composite" (both cameras in one track, same room only)
+COMPOSITE_LAYOUT = "side_by_side"   # "side_by_side" or "pip"
+LAUNCH_POLICY = "pipelined"   # "parallel", "staggered", "pipelined" or "sequential" (see session_scheduler.py)
+
+# "/dev/videoN", or "port:<usb path>" / "serial:<serial>" to survive renumbering on replug
+CAMERAS = ["/dev/video0", "/dev/video2"]
+ACTIVE_CAMERAS = set()        # devices currently streaming into a meeting
+# persistent Chromium profile per session (HTTP + V8 code cache, media grants); None = throwaway
+PROFILE_SLOTS = {"CareBridge Cam 1": "1", "CareBridge Cam 2": "2", "CareBridge Bedside": "1"}
+SINGLE_BROWSER_SLOT = "dual"
+ASSET_PROXY = False           # serve meet.jit.si static assets from a local disk cache (asset_proxy.py)
+PREWARM = True                # keep a launched, preconnected Chromium per slot while idle (prewarm.py)
+BLOCK_REQUESTS = True         # drop analytics / fonts / welcome imagery (request_blocking.py)
+LOG_DRAIN_S = 30              # empty chromedriver's performance log this often during a call
+AUTOMATION = "selenium"       # "selenium" or "cdp" (direct DevTools websocket) for the pre-join steps
+PAGE_LOAD_STRATEGY = "normal" # "normal", "eager" or "none" — eager/none start pre-join on the provider's ready predicate
+REATTACH = False              # opt-in: browsers outlive a panel restart and are reattached (session_state.py)
+RECYCLE = False               # opt-in: after a call, hang up and keep the browser for the next one (needs PREWARM)
+PROVIDER = "jitsi"            # meeting service for MEETING_URL (providers/); "jitsi_iframe" = IFrame API control page
+MEETING_URL = "https://meet.jit.si/FollowingWavesSupposeAcross"
+HEDGED_JOIN = False           # PROVIDER not in the meeting after HEDGE_BUDGET_S → race HEDGE_PROVIDER (hedged_join.py)
+HEDGE_BUDGET_S = 15
+HEDGE_PROVIDER = "webex"
+HEDGE_URL = "https://meet1492.webex.com/meet/pr23680413308"
+MODAL_GUARD = True           # dismiss blocking dialogs in-page for the whole call (modal_guard.py)
+RTC_STATS = True             # bitrate / fps / jitter / loss / RTT ring buffer, flushed at call end (rtc_stats.py)
 
 GPIO.setmode(GPIO.BCM)
-for pin in [PIN_SMS, PIN_CALL, PIN_CONF, PIN_EXIT]:
+for pin in [p for p in (PIN_SMS, PIN_CALL, PIN_CONF, PIN_EXIT, PIN_MUTE, PIN_CAMERA) if p is not None]:
     GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
 
 ser = serial.Serial('/dev/ttyS0', baudrate=9600, timeout=1)
@@ -90,6 +116,8 @@ def listen_for_calls():
                 continue
             if "RING" in line:
                 print("\n📲 Incoming call detected! Press GPIO 19 to answer.")
+                if PREWARM:
+                    STANDBY.trigger(standby_slots(), "incoming call")
                 while True:
                     if GPIO.input(PIN_EXIT) == GPIO.LOW:
                         print("✅ Answering call …")
@@ -111,121 +139,446 @@ def listen_for_calls():
 # ----------------------------------------------------------------------
 # 🎥 JITSI MEETING HANDLERS
 # ----------------------------------------------------------------------
-def join_meeting_instance(meeting_url, camera, name):
-    """Launch Chromium, join Jitsi, and stay until Exit is pressed."""
-    print(f"🌐 Launching Jitsi: {meeting_url}  with camera {camera}")
-    os.environ["SELENIUM_MANAGER_DISABLE"] = "1"
-
-    chrome_options = Options()
-    chrome_options.binary_location = "/usr/bin/chromium-browser"
-    chrome_options.add_argument("--start-fullscreen")
-    chrome_options.add_argument("--disable-infobars")
-    chrome_options.add_argument("--disable-extensions")
-    chrome_options.add_argument("--noerrdialogs")
-    chrome_options.add_argument("--autoplay-policy=no-user-gesture-required")
-    chrome_options.add_argument("--use-fake-ui-for-media-stream")
-    chrome_options.add_argument("--alsa-output-device=default")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument(f"--video-input-device={camera}")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option("useAutomationExtension", False)
-
-    chromedriver_path = which("chromedriver") or "/usr/bin/chromedriver"
-    driver = webdriver.Chrome(service=Service(chromedriver_path), options=chrome_options)
-    driver.get(meeting_url)
-    print(f"✅ Page loaded: {meeting_url}")
-
-    # Wait for pre-join UI to appear
-    time.sleep(8)
-
-    # Switch into iframe if needed
+def provider_join(provider, driver, name, ctl=None):
+    """provider.join over the configured automation backend."""
+    own = ctl is None
+    ctl = ctl or cdp_channel.backend(driver, AUTOMATION)
     try:
-        frames = driver.find_elements(By.TAG_NAME, "iframe")
-        if frames:
-            driver.switch_to.frame(frames[0])
-            print(f"🧭 Switched into iframe (found {len(frames)})")
-    except Exception as e:
-        print(f"⚠️ Frame switch error: {e}")
+        return provider.join(driver, name, ctl)
+    finally:
+        if own:
+            ctl.close()
+
+def exit_pressed():
+    return GPIO.input(PIN_EXIT) == GPIO.LOW
+
+def join_meeting_instance(meeting_url, camera, name, profile=MEETING_PROFILE, scheduler=None, before_load=None):
+    """Launch Chromium, join Jitsi, and stay until Exit is pressed — rejoining if the browser dies."""
+    def attempt(budget):
+        # a rejoin runs on its own, not under the original launch policy
+        sched = scheduler if budget.lost_at is None else None
+        run_meeting_instance(meeting_url, camera, name, profile, sched, before_load, budget)
+    session_supervisor.supervise(name, attempt, exit_pressed)
+
+def run_meeting_instance(meeting_url, camera, name, profile=MEETING_PROFILE, scheduler=None, before_load=None,
+                         budget=None):
+    """One join + stay; raises SessionLost if the browser dies mid-call."""
+    budget = budget or session_supervisor.RestartBudget(name)
+    profile = meeting_profiles.get_profile(profile)
+    scheduler = scheduler or session_scheduler.NullScheduler()
+
+    slot = PROFILE_SLOTS.get(name)
+    browser_profiles.wait_warm()
 
-    # --- Enter display name ---
     try:
-        name_box = None
-        for selector in [
-            "//input[contains(@placeholder,'name')]",
-            "//input[@aria-label='Your name']",
-            "//input[@name='userName']"
-        ]:
-            try:
-                name_box = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, selector))
-                )
-                if name_box:
-                    name_box.clear()
-                    name_box.send_keys(name)
-                    print(f"✏️ Entered display name: {name}")
-                    break
-            except TimeoutException:
-                continue
-    except Exception as e:
-        print(f"⚠️ Name entry error: {e}")
-
-    # --- Click Join button ---
-    join_selectors = [
-        "//button[normalize-space()='Join']",
-        "//button[contains(translate(.,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'join meeting')]",
-        "button[data-testid='prejoin.joinMeeting']",
-        "//button[contains(.,'Join')]",
-        "//div[@role='button' and contains(.,'Join')]"
-    ]
-    joined = False
-    for sel in join_selectors:
-        try:
-            btn = driver.find_element(By.XPATH, sel)
-            driver.execute_script("arguments[0].scrollIntoView(true);", btn)
-            time.sleep(0.3)
-            driver.execute_script("arguments[0].click();", btn)
-            print(f"🟢 Clicked Join using selector: {sel}")
-            joined = True
-            break
-        except Exception:
-            continue
-    if not joined:
-        print("⚠️ Join button not found — meeting may auto-join or require manual click.")
-
-    # --- Stay in meeting until Exit pressed ---
+        if HEDGED_JOIN and slot:
+            driver, slot, meeting_url = hedged_meeting_join(meeting_url, camera, name, profile, slot,
+                                                            scheduler, before_load, budget)
+        else:
+            driver = open_meeting(providers.get(PROVIDER), meeting_url, camera, name, profile, slot,
+                                  scheduler, before_load, budget)
+        scheduler.mark_joined(name, driver)
+        budget.recovered()
+        if ASSET_PROXY:
+            asset_proxy.report(name)
+        if BLOCK_REQUESTS:
+            request_blocking.report(driver, name)
+        if getattr(driver, "browser_pid", None):
+            session_state.record(slot, kind="meeting", name=name, url=meeting_url, camera=camera,
+                                 profile=profile["name"], windows=None, provider=driver.cb_provider)
+    finally:
+        # never leave the other session waiting on a slot we hold
+        scheduler.release(name)
+
+    stay_in_meeting(driver, name, camera, profile, slot)
+
+def prepare_window(driver, provider, camera, name):
+    """Per-window setup before the meeting page loads."""
+    meeting_profiles.install_rtc_hook(driver)
+    if RTC_STATS:
+        rtc_stats.install(driver)
+    if MODAL_GUARD:
+        modal_guard.start(driver, name)
+    if BLOCK_REQUESTS and provider.blocklist:
+        request_blocking.apply(driver, provider.blocklist)
+    if camera:
+        chromium_session.pin_camera(driver, camera)
+
+def open_meeting(provider, meeting_url, camera, name, profile, slot, scheduler, before_load, budget, leg=None):
+    """Browser for slot (warm if possible) → provider pre-join → Join clicked. Returns the driver."""
+    print(f"🌐 Launching {provider.name}: {meeting_url}  with camera {camera} (profile {profile['name']})")
+    with scheduler.phase(name, "launch"):
+        driver = STANDBY.take(slot) if PREWARM and slot else None
+        if driver is None:
+            driver = launch_browser(slot, camera, profile["name"])
+    if leg:
+        leg.attach(driver)
+    driver.cb_provider = provider.name
+    prepare_window(driver, provider, camera, name)
+    if before_load:
+        before_load(driver)
+    with scheduler.phase(name, "load"):
+        ctl = cdp_channel.backend(driver, AUTOMATION)
+        chromium_session.navigate(driver, asset_proxy.proxied_url(provider.url(meeting_url, profile)), provider.ready,
+                                  budget.timeout(provider.timeouts["ready"]), ctl=ctl, label=name)
+        print(f"✅ Page loaded: {meeting_url}")
+        provider_join(provider, driver, name, ctl)
+        ctl.close()
+    return driver
+
+def hedge_slot(slot):
+    return f"{slot}-webex"
+
+def hedged_meeting_join(meeting_url, camera, name, profile, slot, scheduler, before_load, budget):
+    """
+    PROVIDER first; HEDGE_PROVIDER on the hedge slot's browser if the first
+    is not in the meeting within HEDGE_BUDGET_S. Returns (driver, slot, url)
+    of the winner.
+    """
+    def leg(provider, url, leg_slot, sched, load_hook):
+        def run(leg):
+            driver = open_meeting(provider, url, camera, name, profile, leg_slot, sched, load_hook, budget, leg)
+            if not provider.wait_joined(driver, budget.timeout(provider.timeouts["join"]), leg.cancel):
+                raise RuntimeError(f"{provider.name} did not reach the meeting")
+            return driver
+        return hedged_join.Leg(provider.name, run, chromium_session.close_browser)
+
+    first = leg(providers.get(PROVIDER), meeting_url, slot, scheduler, before_load)
+    second = leg(providers.get(HEDGE_PROVIDER), HEDGE_URL, hedge_slot(slot),
+                 session_scheduler.NullScheduler(), None)
+    winner = hedged_join.race(first, second, HEDGE_BUDGET_S)
+    if winner is None:
+        raise RuntimeError(f"neither {PROVIDER} nor {HEDGE_PROVIDER} joined")
+    if winner is first:
+        return winner.result, slot, meeting_url
+    session_state.forget(slot)
+    if camera:
+        # the first leg held the camera while both raced; take it over now that it is gone
+        camera_registry.switch_camera(winner.result, camera)
+    return winner.result, hedge_slot(slot), HEDGE_URL
+
+class ControlButtons:
+    """Edge-triggered PIN_MUTE / PIN_CAMERA presses → the window's MeetControl (IFrame API mode)."""
+
+    def __init__(self, control):
+        self.control = control
+        self.prev = {p: GPIO.HIGH for p in (PIN_MUTE, PIN_CAMERA) if p is not None}
+
+    def poll(self, camera):
+        """Act on new presses; returns the camera now in use."""
+        for pin in self.prev:
+            level = GPIO.input(pin)
+            if level == GPIO.LOW and self.prev[pin] == GPIO.HIGH:
+                if pin == PIN_MUTE:
+                    self.control.toggle_audio()
+                elif camera:
+                    camera = self.next_camera(camera)
+            self.prev[pin] = level
+        return camera
+
+    def next_camera(self, camera):
+        free = [c["dev"] for c in camera_registry.REGISTRY.cameras()
+                if c["dev"] == camera or c["dev"] not in ACTIVE_CAMERAS]
+        if not free or free == [camera]:
+            print("⚠️ No other camera free")
+            return camera
+        new = free[(free.index(camera) + 1) % len(free)] if camera in free else free[0]
+        if not self.control.switch_camera(new):
+            return camera
+        ACTIVE_CAMERAS.discard(camera)
+        ACTIVE_CAMERAS.add(new)
+        return new
+
+def stay_in_meeting(driver, name, camera, profile, slot=None):
+    """Keep one meeting window healthy until Exit is pressed, then close it."""
     print(f"🔴 Press Exit (GPIO 19) to leave meeting [{name}] …")
+    watchdog = meeting_profiles.ProfileWatchdog(driver, profile, name)
+    control = meet_control.get(driver)
+    buttons = ControlButtons(control) if control else None
+    stats = rtc_stats.StatsCollector(driver, name) if RTC_STATS else None
+    supervisor = session_supervisor.Supervisor(driver, name)
+    healthy = True
+    cam_gen = camera_watcher.generation()
+    next_drain = time.monotonic() + LOG_DRAIN_S
+    if camera:
+        ACTIVE_CAMERAS.add(camera)
     try:
         while GPIO.input(PIN_EXIT) == GPIO.HIGH:
+            supervisor.check()
+            watchdog.tick()
+            if stats:
+                stats.tick()
+            if buttons:
+                camera = buttons.poll(camera)
+            if BLOCK_REQUESTS and time.monotonic() >= next_drain:
+                request_blocking.drain(driver)
+                next_drain = time.monotonic() + LOG_DRAIN_S
+            if camera and camera_watcher.generation() != cam_gen:
+                # hotplug event: if our camera went away, move the call to a spare
+                cam_gen = camera_watcher.generation()
+                new = camera_watcher.follow_camera(driver, camera, ACTIVE_CAMERAS)
+                ACTIVE_CAMERAS.discard(camera)
+                ACTIVE_CAMERAS.add(new)
+                camera = new
             time.sleep(0.2)
+    except session_supervisor.SessionLost:
+        healthy = False
+        raise
     finally:
-        print(f"🛑 Closing meeting for {name} ({camera}) …")
-        driver.quit()
+        print(f"🛑 Leaving meeting for {name} ({camera}) …")
+        ACTIVE_CAMERAS.discard(camera)
+        watchdog.report()
+        if stats:
+            stats.close(healthy)
+        release_browser(driver, slot, name, healthy=healthy)
+
+def join_two_meetings_single_browser(sessions, profile=MEETING_PROFILE):
+    """Run every session as its own window inside ONE Chromium process — relaunched if it dies."""
+    session_supervisor.supervise("single browser",
+                                 lambda budget: run_single_browser(sessions, profile, budget), exit_pressed)
+
+def run_single_browser(sessions, profile=MEETING_PROFILE, budget=None):
+    profile = meeting_profiles.get_profile(profile)
+    budget = budget or session_supervisor.RestartBudget("single browser")
+    provider = providers.get(PROVIDER)
+    report = chromium_session.JoinReport("dual (single browser)", len(sessions))
+    browser_profiles.wait_warm()
+
+    def before_load(d, name):
+        # open_dual_session pins each window's camera itself
+        prepare_window(d, provider, None, name)
+
+    driver = STANDBY.take(SINGLE_BROWSER_SLOT) if PREWARM else None
+    driver = driver or launch_browser(SINGLE_BROWSER_SLOT, profile=profile["name"])
+    driver.cb_provider = provider.name
+    driver, handles = chromium_session.open_dual_session(
+        [(asset_proxy.proxied_url(provider.url(url, profile)), cam, name)
+         for url, cam, name in sessions],
+        lambda d, n: provider_join(provider, d, n),
+        report=report,
+        before_load=before_load,
+        driver=driver,
+    )
+    budget.recovered()
+    if BLOCK_REQUESTS:
+        request_blocking.report(driver, "single browser")
+    windows = [[h, name, cam] for h, (_, cam, name) in zip(handles, sessions)]
+    if getattr(driver, "browser_pid", None):
+        session_state.record(SINGLE_BROWSER_SLOT, kind="meeting", name="single browser", url=sessions[0][0],
+                             camera=None, profile=profile["name"], windows=windows, provider=provider.name)
+    stay_in_windows(driver, windows, profile, SINGLE_BROWSER_SLOT)
+
+def stay_in_windows(driver, windows, profile, slot=None):
+    """Keep several meeting windows of one Chromium healthy until Exit, then close it."""
+    handles = [h for h, _, _ in windows]
+    print("🔴 Press Exit (GPIO 19) to leave both meetings …")
+    watchdogs = [(h, meeting_profiles.ProfileWatchdog(driver, profile, name)) for h, name, _ in windows]
+    collectors = [rtc_stats.StatsCollector(driver, name, h) for h, name, _ in windows] if RTC_STATS else []
+    supervisor = session_supervisor.Supervisor(driver, "single browser")
+    healthy = True
+    cams = [cam for _, _, cam in windows]
+    cam_gen = camera_watcher.generation()
+    next_drain = time.monotonic() + LOG_DRAIN_S
+    try:
+        while GPIO.input(PIN_EXIT) == GPIO.HIGH:
+            supervisor.check()
+            for handle, dog in watchdogs:
+                if dog.due():
+                    driver.switch_to.window(handle)
+                    dog.tick()
+            for col in collectors:
+                col.tick()
+            if BLOCK_REQUESTS and time.monotonic() >= next_drain:
+                request_blocking.drain(driver)
+                next_drain = time.monotonic() + LOG_DRAIN_S
+            if camera_watcher.generation() != cam_gen:
+                # hotplug event: move any window whose camera went away to a spare
+                cam_gen = camera_watcher.generation()
+                for i, handle in enumerate(handles):
+                    driver.switch_to.window(handle)
+                    cams[i] = camera_watcher.follow_camera(driver, cams[i], cams)
+            time.sleep(0.2)
+    except session_supervisor.SessionLost:
+        healthy = False
+        raise
+    finally:
+        print("🛑 Leaving single-browser dual session …")
+        for _, dog in watchdogs:
+            dog.report()
+        for col in collectors:
+            col.close(healthy)
+        release_browser(driver, slot, "single browser", handles, healthy)
+
+def release_browser(driver, slot, label, handles=None, healthy=True):
+    """Hang up and keep the browser for the next call if it is healthy, else quit it."""
+    modal_guard.stop(driver)
+    if RECYCLE and PREWARM and slot and healthy:
+        provider = providers.get(getattr(driver, "cb_provider", PROVIDER))
+        driver = chromium_session.recycle(driver, handles, label, provider.leave)
+    else:
+        meet_control.detach_all(driver)
+        chromium_session.close_browser(driver)
+        driver = None
+    if driver is None:
+        if slot:
+            session_state.forget(slot)
+        return
+    if getattr(driver, "browser_pid", None):
+        session_state.record(slot, kind="standby", name=None, url=None, camera=None, windows=None)
+    STANDBY.give_back(slot, driver)
 
 def join_two_meetings():
     """Start two Jitsi sessions in parallel, one per camera."""
-    url1 = "https://meet.jit.si/FollowingWavesSupposeAcross"
-    url2 = "https://meet.jit.si/FollowingWavesSupposeAcross"
-    print("🎥 Starting dual Jitsi sessions …")
+    url1 = MEETING_URL
+    url2 = MEETING_URL
+    print(f"🎥 Starting dual Jitsi sessions ({DUAL_MODE}) …")
 
-    t1 = threading.Thread(
-        target=join_meeting_instance, args=(url1, "/dev/video0", "CareBridge Cam 1"), daemon=True
-    )
-    t2 = threading.Thread(
-        target=join_meeting_instance, args=(url2, "/dev/video2", "CareBridge Cam 2"), daemon=True
-    )
+    # probe before Chromium holds the devices: swap or skip a dead/covered camera
+    # the watcher keeps the device list current, so resolving is a cache lookup
+    wanted = [dev for dev in map(camera_watcher.REGISTRY.resolve, CAMERAS) if dev]
+    cams = camera_probe.choose_cameras(wanted)
+    if not cams:
+        # a failed probe must never cost the call: try the configured cameras as they are
+        cams = list(CAMERAS)
+        print(f"⚠️ No camera could be resolved or probed — joining with the configured ones: {', '.join(cams)}")
+    if len(cams) == 1:
+        print(f"⚠️ Only {cams[0]} is usable — joining with one camera.")
+        join_meeting_instance(url1, cams[0], "CareBridge Cam 1")
+        print("✅ Meeting ended, returning to main loop.\n")
+        return
+    cam1, cam2 = cams
 
-    t1.start()
-    t2.start()
+    # pick capture modes both cameras can stream at together on the shared USB bus
+    usb_planner.apply_plan([cam1, cam2])
 
-    print("✅ Both Jitsi instances launched.")
+    if DUAL_MODE == "composite":
+        if url1 == url2:
+            # one participant, one encoder: both cameras drawn into one canvas track
+            join_meeting_instance(
+                url1, None, "CareBridge Bedside",
+                scheduler=session_scheduler.LaunchScheduler("parallel", 1, "composite"),
+                before_load=lambda d: composite_camera.install(d, COMPOSITE_LAYOUT, (cam1, cam2)),
+            )
+            print("✅ Meeting ended, returning to main loop.\n")
+            return
+        print("⚠️ Composite mode needs both cameras in the same room — using two browsers.")
+
+    if DUAL_MODE == "single_browser":
+        join_two_meetings_single_browser([
+            (url1, cam1, "CareBridge Cam 1"),
+            (url2, cam2, "CareBridge Cam 2"),
+        ])
+        print("✅ Meetings ended, returning to main loop.\n")
+        return
+
+    scheduler = session_scheduler.LaunchScheduler(LAUNCH_POLICY, 2, "two browsers")
     print("🔴 Press Exit (GPIO 19) to close browsers.")
-    t1.join()
-    t2.join()
+    scheduler.run([
+        (join_meeting_instance, (url1, cam1, "CareBridge Cam 1")),
+        (join_meeting_instance, (url2, cam2, "CareBridge Cam 2")),
+    ])
+    print("✅ Meetings ended, returning to main loop.\n")
+
+# ----------------------------------------------------------------------
+# 🔥 PREWARMED BROWSERS
+# ----------------------------------------------------------------------
+def standby_slots():
+    if DUAL_MODE == "single_browser":
+        return [SINGLE_BROWSER_SLOT]
+    return ["1", "2"] + ([hedge_slot("1"), hedge_slot("2")] if HEDGED_JOIN else [])
+
+def slot_provider(slot):
+    """Provider whose Chromium flags a slot's browser is launched with."""
+    return HEDGE_PROVIDER if slot and slot.endswith(hedge_slot("")) else PROVIDER
+
+def launch_browser(slot, camera=None, profile=MEETING_PROFILE):
+    """
+    Chromium for a session slot — used for joins and for standby browsers
+    (which leave camera unset: it is pinned per window at join). With
+    REATTACH it runs detached on the slot's debugging port.
+    """
+    profile = meeting_profiles.get_profile(profile)
+    extra = list(chromium_session.MULTI_WINDOW_ARGS) if slot == SINGLE_BROWSER_SLOT else []
+    extra += providers.get(slot_provider(slot)).launch_args()
+    opts = chromium_session.build_options(camera=camera, extra_args=extra + profile["chrome_args"], slot=slot,
+                                          perf_log=BLOCK_REQUESTS, load_strategy=PAGE_LOAD_STRATEGY)
+    if REATTACH and slot:
+        port = session_state.port_for(slot)
+        driver = chromium_session.launch_detached(opts, port)
+        session_state.record(slot, kind="standby", port=port, pid=driver.browser_pid)
+    else:
+        driver = chromium_session.launch(opts, slot=slot)
+    GOVERNOR.track(driver, f"slot {slot}" if slot else "browser")
+    return driver
+
+STANDBY = prewarm.Standby(launch_browser, MEETING_URL)
+GOVERNOR = resource_governor.Governor()
+
+# ----------------------------------------------------------------------
+# 🔗 REATTACH AFTER A PANEL RESTART
+# ----------------------------------------------------------------------
+def resume_meeting(slot, info):
+    t0 = time.monotonic()
+    try:
+        driver = chromium_session.attach(info["port"], info["pid"], PAGE_LOAD_STRATEGY, BLOCK_REQUESTS)
+    except Exception as e:
+        print(f"⚠️ Could not reattach to slot {slot}: {e} — closing that browser")
+        chromium_session.kill_browser(info["pid"])
+        session_state.forget(slot)
+        return
+    print(f"🔗 Reattached to [{info['name']}] in {time.monotonic() - t0:.1f} s")
+    driver.cb_provider = info.get("provider", PROVIDER)
+    GOVERNOR.track(driver, f"slot {slot}")
+    profile = meeting_profiles.get_profile(info.get("profile", MEETING_PROFILE))
+    if MODAL_GUARD:
+        for handle, name, _ in info.get("windows") or [[driver.current_window_handle, info["name"], None]]:
+            driver.switch_to.window(handle)
+            modal_guard.start(driver, name)
+    try:
+        if info.get("windows"):
+            stay_in_windows(driver, info["windows"], profile, slot)
+        else:
+            stay_in_meeting(driver, info["name"], info.get("camera"), profile, slot)
+    except session_supervisor.SessionLost as e:
+        print(f"💥 Reattached session [{info['name']}] lost ({e}) — rejoining")
+        if info.get("windows"):
+            join_two_meetings_single_browser([(info["url"], cam, name) for _, name, cam in info["windows"]],
+                                             profile["name"])
+        else:
+            join_meeting_instance(info["url"], info.get("camera"), info["name"], profile["name"])
+
+def resume_meetings():
+    """Reattach to meetings whose Chromium survived the restart; leftover standbys are closed."""
+    live = session_state.live()
+    meetings = {s: e for s, e in live.items() if e.get("kind") == "meeting"}
+    for slot, info in live.items():
+        if slot not in meetings:
+            chromium_session.kill_browser(info["pid"])
+            session_state.forget(slot)
+    if not meetings:
+        return False
+    print(f"🔗 {len(meetings)} meeting(s) still running — reattaching …")
+    threads = [threading.Thread(target=resume_meeting, args=item) for item in meetings.items()]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
     print("✅ Meetings ended, returning to main loop.\n")
+    return True
 
 # ----------------------------------------------------------------------
 # 🕹️ MAIN LOOP
 # ----------------------------------------------------------------------
+GOVERNOR.start()   # before any browser is launched, so they inherit the policy
+camera_watcher.start()
+if ASSET_PROXY:
+    asset_proxy.start()
+if REATTACH:
+    resume_meetings()
+# fill the profiles' caches in the background so the first call starts hot
+browser_profiles.warm_up_async(standby_slots(), asset_proxy.proxied_url(browser_profiles.WARM_URL))
+if PREWARM:
+    STANDBY.trigger(standby_slots(), "idle-ready")
 print("🚀 Ready. Press:")
 print("  • GPIO 5 → Send SMS")
 print("  • GPIO 6 → Make Call")
@@ -250,12 +603,15 @@ try:
         elif GPIO.input(PIN_CONF) == GPIO.LOW:
             print("\n🎥 Button 13 pressed — join dual meetings")
             join_two_meetings()
+            if PREWARM:
+                STANDBY.trigger(standby_slots(), "meeting ended")
             time.sleep(1)
 
         time.sleep(0.1)
 except KeyboardInterrupt:
     print("\n🛑 Exiting program.")
 finally:
+    STANDBY.close()
     GPIO.cleanup()
     ser.close()
     print("✅ GPIO and serial closed cleanly.")
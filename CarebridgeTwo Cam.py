@@ -8,15 +8,12 @@
 # ============================================================
 
 import RPi.GPIO as GPIO
-import time, serial, os, threading
-from shutil import which
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
+import time, serial, threading
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
+import chromium_session, usb_planner, providers
 
 # ----------------------------------------------------------------------
 # ⚙️ GPIO & MODEM SETUP
@@ -26,6 +23,9 @@ PIN_CALL  = 6
 PIN_CONF  = 13
 PIN_EXIT  = 19
 
+DUAL_MODE = "two_browsers"   # "two_browsers" or "single_browser" (one Chromium, two windows)
+JITSI = providers.get("jitsi")   # its ready predicate tells when the pre-join screen is up
+
 GPIO.setmode(GPIO.BCM)
 for pin in [PIN_SMS, PIN_CALL, PIN_CONF, PIN_EXIT]:
     GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
@@ -92,52 +92,8 @@ def listen_for_calls():
 # ----------------------------------------------------------------------
 # 🎥 JITSI MEETING HANDLER
 # ----------------------------------------------------------------------
-def join_meeting_instance(meeting_url, camera, name):
-    """Launch Chromium, select specific camera via WebRTC, join Jitsi, wait for Exit."""
-    print(f"🌐 Launching {meeting_url} on {camera}")
-    os.environ["SELENIUM_MANAGER_DISABLE"]="1"
-
-    opts=Options()
-    opts.binary_location="/usr/bin/chromium-browser"
-    for a in [
-        "--start-fullscreen","--disable-infobars","--disable-extensions",
-        "--noerrdialogs","--autoplay-policy=no-user-gesture-required",
-        "--use-fake-ui-for-media-stream","--alsa-output-device=default",
-        "--enable-webrtc-pipewire-capturer","--no-sandbox"
-    ]: opts.add_argument(a)
-    opts.add_experimental_option("excludeSwitches",["enable-automation"])
-    opts.add_experimental_option("useAutomationExtension",False)
-
-    driver=webdriver.Chrome(service=Service(which("chromedriver") or "/usr/bin/chromedriver"),options=opts)
-    driver.get(meeting_url)
-    print("✅ Page loaded")
-
-    time.sleep(8)
-
-    # --- Force specific camera via WebRTC API and mute mic/cam ---
-    try:
-        js=f"""
-        async function pickCam() {{
-          const devs=await navigator.mediaDevices.enumerateDevices();
-          const cams=devs.filter(d=>d.kind==='videoinput');
-          console.log('🎥 Available cams:',cams.map(c=>c.label));
-          let target=cams.find(c=>c.label.includes('{camera}'))||cams[0];
-          if(target){{
-            const stream=await navigator.mediaDevices.getUserMedia({{video:{{deviceId:{{exact:target.deviceId}}}},audio:false}});
-            window._chosenCam=target.label;
-            // Mute mic/cam to avoid feedback
-            const tracks=stream.getVideoTracks();
-            tracks.forEach(t=>t.enabled=false);
-            console.log('✅ Using camera '+target.label);
-          }}else console.log('⚠️ No match for {camera}');
-        }}
-        pickCam();
-        """
-        driver.execute_script(js)
-        print(f"🎥 Camera selection script injected for {camera}")
-    except Exception as e:
-        print("⚠️ JS camera select failed:",e)
-
+def jitsi_prejoin(driver, name):
+    """Enter display name and click Join on the Jitsi pre-join screen."""
     # --- Enter name ---
     try:
         for sel in [
@@ -169,6 +125,25 @@ def join_meeting_instance(meeting_url, camera, name):
             break
         except Exception: pass
 
+def wait_prejoin(driver,name):
+    """Wait for Jitsi's pre-join screen instead of a fixed sleep."""
+    if not chromium_session.wait_ready(driver,JITSI.ready,JITSI.timeouts["ready"]):
+        print(f"⚠️ Pre-join screen not detected [{name}] — trying anyway")
+
+def join_meeting_instance(meeting_url, camera, name, report=None):
+    """Launch Chromium, pin the camera via camera_registry, join Jitsi, wait for Exit."""
+    print(f"🌐 Launching {meeting_url} on {camera}")
+
+    opts=chromium_session.build_options(extra_args=["--enable-webrtc-pipewire-capturer"])
+    driver=chromium_session.launch(opts)
+    chromium_session.pin_camera(driver,camera)   # exact deviceId, no extra capture stream
+    driver.get(meeting_url)
+    print("✅ Page loaded")
+
+    wait_prejoin(driver,name)
+    jitsi_prejoin(driver,name)
+    if report: report.mark_joined(name,driver)
+
     print(f"🔴 Press GPIO 19 to leave meeting [{name}] …")
     try:
         while GPIO.input(PIN_EXIT)==GPIO.HIGH: time.sleep(0.2)
@@ -176,14 +151,34 @@ def join_meeting_instance(meeting_url, camera, name):
         print(f"🛑 Closing meeting [{name}] ({camera})")
         driver.quit()
 
+def join_two_meetings_single_browser(sessions):
+    """Both sessions as windows of ONE Chromium, each pinned to its own camera."""
+    def prejoin_when_loaded(driver,name):
+        wait_prejoin(driver,name); jitsi_prejoin(driver,name)
+
+    report=chromium_session.JoinReport("dual (single browser)",len(sessions))
+    driver,_=chromium_session.open_dual_session(
+        sessions,prejoin_when_loaded,report=report,extra_args=["--enable-webrtc-pipewire-capturer"])
+    print("🔴 Press GPIO 19 to leave both meetings …")
+    try:
+        while GPIO.input(PIN_EXIT)==GPIO.HIGH: time.sleep(0.2)
+    finally:
+        print("🛑 Closing single-browser dual session"); driver.quit()
+
 def join_two_meetings():
     """Launch two Jitsi sessions in parallel (one per camera)."""
     url1="https://meet.jit.si/FollowingWavesSupposeAcross"
     url2="https://meet.jit.si/FollowingWavesSupposeAcross"
-    print("🎥 Starting dual Jitsi sessions …")
+    print(f"🎥 Starting dual Jitsi sessions ({DUAL_MODE}) …")
+    usb_planner.apply_plan(["/dev/video0","/dev/video2"])   # fit both cameras on the USB bus
+
+    if DUAL_MODE=="single_browser":
+        join_two_meetings_single_browser([(url1,"/dev/video0","CareBridge Cam 1"),(url2,"/dev/video2","CareBridge Cam 2")])
+        print("✅ Meetings ended.\n"); return
 
-    t1=threading.Thread(target=join_meeting_instance,args=(url1,"/dev/video0","CareBridge Cam 1"),daemon=True)
-    t2=threading.Thread(target=join_meeting_instance,args=(url2,"/dev/video2","CareBridge Cam 2"),daemon=True)
+    report=chromium_session.JoinReport("dual (two browsers)",2)
+    t1=threading.Thread(target=join_meeting_instance,args=(url1,"/dev/video0","CareBridge Cam 1"),kwargs={"report":report},daemon=True)
+    t2=threading.Thread(target=join_meeting_instance,args=(url2,"/dev/video2","CareBridge Cam 2"),kwargs={"report":report},daemon=True)
     t1.start(); t2.start()
     print("✅ Both Jitsi instances launched.")
     t1.join(); t2.join()
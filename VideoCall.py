@@ -3,11 +3,11 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
+import modal_guard
 
 # === CONFIG ===
 #url = "https://meet.jit.si/CareBridgeRoom"  # change meeting name as needed
@@ -24,6 +24,8 @@ chrome_options.add_argument("--disable-extensions")
 chrome_options.add_argument("--use-fake-ui-for-media-stream")  # auto-allow mic/camera
 
 driver = webdriver.Chrome(service=Service(), options=chrome_options)
+# recover-password / permission / "still there" / feedback dialogs are dismissed in-page all call long
+modal_guard.start(driver, "VideoCall")
 driver.get(url)
 
 def safe_find(by, selector, timeout=5):
@@ -33,109 +35,10 @@ def safe_find(by, selector, timeout=5):
     except TimeoutException:
         return None
 
-def dismiss_auth_or_recover_modal():
-    """
-    Detects typical 'Recover password' or auth modals and dismisses them.
-    Strategies:
-      - Click visible 'Cancel' or 'Close' button,
-      - Click close (aria-label close) icons,
-      - Press ESC as last resort.
-    Returns True if a modal was found and we attempted to dismiss it.
-    """
-    found = False
-    # Look for obvious text indicating recover-password modal
-    try:
-        # Search for any element containing the phrase 'Recover password' or 'Recover' or 'Reset your password'
-        modal_el = None
-        try:
-            modal_el = driver.find_element(By.XPATH, "//*[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'recover password')]")
-        except NoSuchElementException:
-            try:
-                modal_el = driver.find_element(By.XPATH, "//*[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'reset your password')]")
-            except NoSuchElementException:
-                modal_el = None
-
-        if modal_el:
-            found = True
-            print("⚠️ Detected a password-recover/auth modal — attempting to dismiss it...")
-
-            # Try to click 'Cancel' buttons inside modal
-            try:
-                cancel_btn = modal_el.find_element(By.XPATH, ".//button[translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz') = 'cancel' or contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'cancel')]")
-                driver.execute_script("arguments[0].scrollIntoView(true);", cancel_btn)
-                time.sleep(0.2)
-                cancel_btn.click()
-                print("✅ Clicked 'Cancel' inside modal.")
-                return True
-            except Exception:
-                pass
-
-            # Try global 'Cancel' button
-            try:
-                global_cancel = driver.find_element(By.XPATH, "//button[translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz') = 'cancel']")
-                driver.execute_script("arguments[0].click();", global_cancel)
-                print("✅ Clicked global 'Cancel' button.")
-                return True
-            except Exception:
-                pass
-
-            # Try Close icon buttons often with aria-label 'Close' or class containing 'close'
-            try:
-                close_btn = modal_el.find_element(By.XPATH, ".//button[contains(@aria-label, 'Close') or contains(@class, 'close') or contains(@aria-label, 'close')]")
-                driver.execute_script("arguments[0].click();", close_btn)
-                print("✅ Clicked modal close button.")
-                return True
-            except Exception:
-                pass
-
-            # Try any visible button with text 'Send' or 'Cancel' as a fallback
-            try:
-                send_btn = modal_el.find_element(By.XPATH, ".//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'send')]")
-                print("ℹ️ Modal shows 'Send' — clicking Cancel instead if present.")
-            except Exception:
-                pass
-
-            # Fallback: press ESC key to close
-            try:
-                body = driver.find_element(By.TAG_NAME, "body")
-                body.send_keys(Keys.ESCAPE)
-                print("✅ Pressed ESC to dismiss modal.")
-                return True
-            except Exception:
-                pass
-
-    except Exception as e:
-        print(f"⚠️ Error while trying to dismiss modal: {e}")
-
-    # Another defensive approach: try to click any visible overlay close btn
-    try:
-        overlay_close = safe_find(By.CSS_SELECTOR, "button[aria-label*='close'], button[class*='close'], button[title*='Close']", timeout=2)
-        if overlay_close:
-            try:
-                driver.execute_script("arguments[0].click();", overlay_close)
-                print("✅ Clicked overlay close button.")
-                return True
-            except Exception:
-                pass
-    except Exception:
-        pass
-
-    if not found:
-        # No modal text found — nothing to dismiss
-        return False
-
-    return False
-
 def join_meeting():
     print("🎥 Waiting for Jitsi pre-join screen...")
     time.sleep(WAIT_MED)  # let UI render
 
-    # If page shows some site-level auth flow, try to dismiss it
-    dismissed = dismiss_auth_or_recover_modal()
-    if dismissed:
-        # small pause after dismissing
-        time.sleep(1)
-
     # --- switch into iframe if exists ---
     try:
         iframes = driver.find_elements(By.TAG_NAME, "iframe")
@@ -145,14 +48,6 @@ def join_meeting():
     except Exception as e:
         print(f"⚠️ Error switching to iframe: {e}")
 
-    # Re-run modal dismissal inside iframe (some sites render modals inside)
-    try:
-        dismissed_iframe = dismiss_auth_or_recover_modal()
-        if dismissed_iframe:
-            time.sleep(1)
-    except Exception:
-        pass
-
     # --- enter display name ---
     try:
         name_box = None
@@ -269,4 +164,5 @@ try:
 
 except KeyboardInterrupt:
     print("🛑 Stopped by user.")
+    modal_guard.stop(driver)
     driver.quit()
@@ -4,10 +4,12 @@ from shutil import which
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import TimeoutException
+
+import request_blocking
+import chromium_session
+import providers
 
 # ----------------------------------------------------------------------
 # ⚙️ GPIO & MODEM SETUP
@@ -89,52 +91,24 @@ def join_webex(meeting_url="https://meet1492.webex.com/meet/pr23680413308"):
     chrome_options.add_argument("--ozone-platform=wayland")
     chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     chrome_options.add_experimental_option("useAutomationExtension", False)
+    request_blocking.enable_logging(chrome_options)
 
     chromedriver_path = which("chromedriver") or "/usr/bin/chromedriver"
     print(f"🧭 Using Chromedriver at: {chromedriver_path}")
 
     driver = webdriver.Chrome(service=Service(chromedriver_path), options=chrome_options)
-    driver.get(meeting_url)
+    webex = providers.get("webex")
+    request_blocking.apply(driver, webex.blocklist)
+    driver.get(webex.url(meeting_url))
     print("✅ Chromium opened — waiting for Webex pre-join screen…")
 
     try:
-        # Wait for name input or Join button to appear
-        WebDriverWait(driver, 20).until(
-            lambda d: d.find_elements(By.XPATH, "//input[contains(@placeholder,'name') or contains(@aria-label,'name')]") or
-                      d.find_elements(By.XPATH, "//button[contains(translate(.,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'join')]")
-        )
-
-        # Enter name if prompted
-        try:
-            name_box = driver.find_element(By.XPATH, "//input[contains(@placeholder,'name') or contains(@aria-label,'name')]")
-            name_box.clear()
-            name_box.send_keys("CareBridge")
-            print("✏️ Entered name: CareBridge")
-        except NoSuchElementException:
-            print("ℹ️ No name field found (maybe saved or skipped).")
-
-        time.sleep(2)
-
-        # Try to click the Join Meeting button
-        join_btn = None
-        selectors = [
-            "//button[normalize-space(text())='Join meeting']",
-            "//button[contains(translate(.,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'join')]",
-            "//button[contains(@class,'join')]",
-            "//button[contains(@data-dojo-attach-point,'joinButton')]"
-        ]
-        for sel in selectors:
-            try:
-                join_btn = driver.find_element(By.XPATH, sel)
-                break
-            except NoSuchElementException:
-                continue
-
-        if join_btn:
-            driver.execute_script("arguments[0].scrollIntoView(true);", join_btn)
-            time.sleep(0.3)
-            driver.execute_script("arguments[0].click();", join_btn)
-            print("🟢 Clicked Join Meeting — waiting to connect…")
+        if not chromium_session.wait_ready(driver, webex.ready, webex.timeouts["ready"]):
+            print("⚠️ Pre-join screen not detected — trying anyway")
+        # name field, "Join from your browser" and Join button: providers/webex.py
+        if webex.join(driver, "CareBridge"):
+            print("🟢 Joining — waiting to connect…")
+            request_blocking.report(driver, "webex")
         else:
             print("⚠️ Join Meeting button not found — may already be joined.")
 
@@ -156,15 +130,23 @@ def join_webex(meeting_url="https://meet1492.webex.com/meet/pr23680413308"):
             termios.tcsetattr(fd, termios.TCSADRAIN, old)
         return None
 
+    next_drain = time.time() + 30
     try:
         while True:
             if getch() == '\x1b':  # ESC
                 print("🛑 ESC pressed — closing browser.")
                 break
+            if time.time() >= next_drain:
+                request_blocking.drain(driver)   # keep chromedriver's performance log small
+                next_drain = time.time() + 30
             time.sleep(0.2)
     except KeyboardInterrupt:
         pass
     finally:
+        try:
+            webex.leave(driver)
+        except Exception:
+            pass
         driver.quit()
         print("✅ Browser closed\n")
 
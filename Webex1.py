@@ -1,9 +1,10 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
 import time
 
+import dom_snapshot
+
 WEBEX_URL = "https://meet1492.webex.com/meet/pr23680413308"
 
 chrome_options = Options()
@@ -20,56 +21,14 @@ chrome_options.add_argument("--start-maximized")
 service = Service("/usr/bin/chromedriver")
 driver = webdriver.Chrome(service=service, options=chrome_options)
 
-def list_elements_recursively(driver, depth=0):
-    """Recursively print buttons and inputs in all iframes."""
-    prefix = "  " * depth
-    try:
-        inputs = driver.find_elements(By.TAG_NAME, "input")
-        buttons = driver.find_elements(By.TAG_NAME, "button")
-        print(f"{prefix}🧭 Depth {depth}: Found {len(inputs)} input(s), {len(buttons)} button(s)")
-
-        for el in inputs:
-            try:
-                print(f"{prefix}  🟦 INPUT → id='{el.get_attribute('id')}', "
-                      f"name='{el.get_attribute('name')}', "
-                      f"placeholder='{el.get_attribute('placeholder')}', "
-                      f"aria-label='{el.get_attribute('aria-label')}'")
-            except Exception:
-                pass
-
-        for el in buttons:
-            try:
-                text = el.text.strip()
-                print(f"{prefix}  🟩 BUTTON → text='{text}', id='{el.get_attribute('id')}', "
-                      f"class='{el.get_attribute('class')}'")
-            except Exception:
-                pass
-
-        frames = driver.find_elements(By.TAG_NAME, "iframe")
-        print(f"{prefix}🔍 Found {len(frames)} iframe(s) at this level")
-        for idx, frame in enumerate(frames):
-            try:
-                driver.switch_to.frame(frame)
-                print(f"{prefix}➡️ Entering iframe {idx+1}/{len(frames)}")
-                list_elements_recursively(driver, depth + 1)
-                driver.switch_to.parent_frame()
-            except Exception as e:
-                print(f"{prefix}⚠️ Error switching to iframe {idx+1}: {e}")
-                try:
-                    driver.switch_to.parent_frame()
-                except Exception:
-                    pass
-                continue
-    except Exception as e:
-        print(f"{prefix}⚠️ Error at depth {depth}: {e}")
-
 print("🌐 Opening Webex meeting page...")
 driver.get(WEBEX_URL)
 time.sleep(10)  # wait for everything to load
 
 print("\n=== STARTING FIELD & BUTTON SCAN ===")
-driver.switch_to.default_content()
-list_elements_recursively(driver)
+# one in-page call per frame; the gzip'd JSON goes to ~/.cache/carebridge/snapshots
+snap, path = dom_snapshot.capture(driver, "webex")
+dom_snapshot.show(snap)
 
 print("\n✅ Scan complete. Browser will stay open for inspection.")
 time.sleep(600)
@@ -11,10 +11,10 @@ from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+import modal_guard
 
 # ----------------------------------------------------------------------
 # ⚙️ GPIO & MODEM SETUP
@@ -87,45 +87,6 @@ def safe_find(driver, by, selector, timeout=5):
     except TimeoutException:
         return None
 
-def dismiss_auth_or_recover_modal(driver):
-    """Dismisses 'Recover password' or similar modals if detected."""
-    found = False
-    try:
-        modal_el = None
-        try:
-            modal_el = driver.find_element(By.XPATH, "//*[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'recover password')]")
-        except NoSuchElementException:
-            try:
-                modal_el = driver.find_element(By.XPATH, "//*[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'reset your password')]")
-            except NoSuchElementException:
-                modal_el = None
-
-        if modal_el:
-            found = True
-            print("⚠️ Detected password recovery/auth modal — dismissing...")
-
-            for text in ["cancel", "close"]:
-                try:
-                    btn = modal_el.find_element(By.XPATH, f".//button[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), '{text}')]")
-                    driver.execute_script("arguments[0].click();", btn)
-                    print(f"✅ Clicked '{text}' in modal.")
-                    return True
-                except Exception:
-                    pass
-
-            # fallback: ESC
-            try:
-                driver.find_element(By.TAG_NAME, "body").send_keys(Keys.ESCAPE)
-                print("✅ Pressed ESC to dismiss modal.")
-                return True
-            except Exception:
-                pass
-
-    except Exception as e:
-        print(f"⚠️ Modal dismissal error: {e}")
-
-    return found
-
 def join_meeting(meeting_url="https://meet.jit.si/PremierFamiliesFundNevertheless"):
     print("🌐 Launching Jitsi Meet…")
     os.environ["SELENIUM_MANAGER_DISABLE"] = "1"
@@ -145,11 +106,12 @@ def join_meeting(meeting_url="https://meet.jit.si/PremierFamiliesFundNevertheles
     print(f"🧭 Using Chromedriver at: {chromedriver_path}")
 
     driver = webdriver.Chrome(service=Service(chromedriver_path), options=chrome_options)
+    # recover-password / permission / "still there" / feedback dialogs are dismissed in-page all call long
+    modal_guard.start(driver, "CareBridge")
     driver.get(meeting_url)
     print("✅ Chromium opened — waiting for pre-join UI…")
 
     time.sleep(6)
-    dismiss_auth_or_recover_modal(driver)
 
     try:
         iframes = driver.find_elements(By.TAG_NAME, "iframe")
@@ -159,8 +121,6 @@ def join_meeting(meeting_url="https://meet.jit.si/PremierFamiliesFundNevertheles
     except Exception as e:
         print(f"⚠️ Frame switch error: {e}")
 
-    dismiss_auth_or_recover_modal(driver)
-
     # --- enter display name ---
     try:
         name_box = safe_find(driver, By.XPATH, "//input[contains(@placeholder,'name') or @aria-label='Your name' or @name='userName']", timeout=5)
@@ -228,6 +188,7 @@ def join_meeting(meeting_url="https://meet.jit.si/PremierFamiliesFundNevertheles
     except KeyboardInterrupt:
         pass
     finally:
+        modal_guard.stop(driver)
         driver.quit()
         print("✅ Browser closed\n")
 
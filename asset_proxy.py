@@ -0,0 +1,404 @@
+# ============================================================
+# CareBridge — Local caching reverse proxy for meeting-app assets
+# Optional. Sessions load http://127.0.0.1:8088/<room> instead of
+# https://meet.jit.si/<room> (localhost is a secure context, so
+# camera/mic still work). The proxy:
+#   • serves versioned assets (…?v=1234 under /libs, /css, …) from
+#     disk without touching the uplink
+#   • revalidates the HTML entry point and unversioned assets with
+#     If-None-Match / If-Modified-Since (304 → cached copy), and
+#     serves the cached copy if the uplink is down
+#   • passes everything else (BOSH POSTs, websockets) straight through
+#   • evicts least-recently-used entries above CACHE_MAX_MB
+# Upstream keep-alive connections live in a small shared pool that
+# preconnect() can fill before a join (see prewarm.py).
+#
+#   python3 asset_proxy.py                         # run the proxy
+#   python3 asset_proxy.py --bench https://meet.jit.si/SomeRoom --runs 3
+# ============================================================
+
+import os, json, time, ssl, socket, select, hashlib, threading, http.client
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+UPSTREAM = "https://meet.jit.si"
+LISTEN = ("127.0.0.1", 8088)
+CACHE_DIR = os.path.expanduser("~/.cache/carebridge/assets")
+CACHE_MAX_MB = 150
+UPSTREAM_TIMEOUT = 15
+POOL_SIZE = 6              # idle upstream connections kept open
+
+# static trees of the Jitsi web app
+ASSET_PREFIXES = ("/libs/", "/static/", "/css/", "/images/", "/fonts/", "/sounds/", "/lang/")
+HOP_BY_HOP = {"connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+              "te", "trailers", "transfer-encoding", "upgrade", "host"}
+KEPT_HEADERS = ("content-type", "content-encoding", "etag", "last-modified", "cache-control", "vary")
+
+# ----------------------------------------------------------------------
+# 💾 DISK CACHE (LRU)
+# ----------------------------------------------------------------------
+class AssetCache:
+    """body + JSON meta per entry on disk; LRU order kept in memory."""
+
+    def __init__(self, path=CACHE_DIR, max_mb=CACHE_MAX_MB):
+        self.path = path
+        self.max_bytes = max_mb * 1048576
+        self.lock = threading.Lock()
+        self.lru = OrderedDict()   # key → size, oldest first
+        self.total = 0
+        os.makedirs(path, exist_ok=True)
+        entries = []
+        for f in os.listdir(path):
+            if f.endswith(".body"):
+                st = os.stat(os.path.join(path, f))
+                entries.append((st.st_atime, f[:-5], st.st_size))
+        for _, key, size in sorted(entries):
+            self.lru[key] = size
+            self.total += size
+
+    @staticmethod
+    def key(path):
+        return hashlib.sha1(path.encode()).hexdigest()
+
+    def _file(self, key, ext):
+        return os.path.join(self.path, f"{key}.{ext}")
+
+    def get(self, path):
+        """Return (meta, body) or None."""
+        k = self.key(path)
+        with self.lock:
+            if k not in self.lru:
+                return None
+            self.lru.move_to_end(k)
+        try:
+            with open(self._file(k, "json")) as f:
+                meta = json.load(f)
+            with open(self._file(k, "body"), "rb") as f:
+                body = f.read()
+        except (OSError, ValueError):
+            self.drop(k)
+            return None
+        return meta, body
+
+    def put(self, path, meta, body):
+        k = self.key(path)
+        tmp = self._file(k, "tmp")
+        with open(tmp, "wb") as f:
+            f.write(body)
+        with open(self._file(k, "json"), "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._file(k, "body"))
+        with self.lock:
+            self.total += len(body) - self.lru.get(k, 0)
+            self.lru[k] = len(body)
+            self.lru.move_to_end(k)
+            while self.total > self.max_bytes and len(self.lru) > 1:
+                old, size = self.lru.popitem(last=False)
+                self.total -= size
+                self._remove(old)
+
+    def drop(self, key):
+        with self.lock:
+            self.total -= self.lru.pop(key, 0)
+        self._remove(key)
+
+    def _remove(self, key):
+        for ext in ("body", "json"):
+            try:
+                os.unlink(self._file(key, ext))
+            except OSError:
+                pass
+
+    def size_mb(self):
+        with self.lock:
+            return self.total / 1048576
+
+# ----------------------------------------------------------------------
+# 🔁 PROXY
+# ----------------------------------------------------------------------
+STATS = {"hits": 0, "revalidated": 0, "misses": 0, "passthrough": 0, "stale": 0,
+         "upstream_bytes": 0, "served_bytes": 0}
+_stats_lock = threading.Lock()
+
+def _count(**kw):
+    with _stats_lock:
+        for k, v in kw.items():
+            STATS[k] += v
+
+def reset_stats():
+    with _stats_lock:
+        for k in STATS:
+            STATS[k] = 0
+
+def classify(path):
+    """"immutable" (versioned asset), "revalidate" (HTML / unversioned asset) or "pass"."""
+    parts = urlsplit(path)
+    if parts.path.startswith(ASSET_PREFIXES):
+        return "immutable" if "v" in parse_qs(parts.query) else "revalidate"
+    if "." not in parts.path.rsplit("/", 1)[-1] and not parts.path.startswith("/http-bind"):
+        return "revalidate"        # "/" or "/<room>" → the app's HTML entry point
+    return "pass"
+
+_pool = []
+_pool_lock = threading.Lock()
+
+def _new_conn():
+    u = ProxyHandler.upstream
+    return http.client.HTTPSConnection(u.hostname, u.port or 443, timeout=UPSTREAM_TIMEOUT)
+
+def _take_conn():
+    with _pool_lock:
+        if _pool:
+            return _pool.pop()
+    return _new_conn()
+
+def _give_conn(conn):
+    with _pool_lock:
+        if len(_pool) < POOL_SIZE:
+            _pool.append(conn)
+            return
+    conn.close()
+
+def preconnect(count=2):
+    """Open up to count upstream connections (DNS + TCP + TLS) ahead of a join."""
+    with _pool_lock:
+        missing = max(0, count - len(_pool))
+    opened = 0
+    for _ in range(missing):
+        conn = _new_conn()
+        try:
+            conn.connect()
+        except OSError as e:
+            print(f"⚠️ Asset proxy preconnect failed: {e}")
+            break
+        _give_conn(conn)
+        opened += 1
+    return opened
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    cache = None
+    upstream = urlsplit(UPSTREAM)
+
+    def log_message(self, *args):
+        pass
+
+    # -- upstream ---------------------------------------------------------
+    def _fetch(self, extra_headers=None, body=None):
+        headers = {k: v for k, v in self.headers.items() if k.lower() not in HOP_BY_HOP}
+        headers["Host"] = self.upstream.hostname
+        headers.update(extra_headers or {})
+        for attempt in (0, 1):
+            # a pooled connection may have been closed by the server: retry once on a fresh one
+            conn = _new_conn() if attempt else _take_conn()
+            try:
+                conn.request(self.command, self.path, body=body, headers=headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                if attempt:
+                    raise
+                continue
+            _count(upstream_bytes=len(data))
+            if resp.will_close:
+                conn.close()
+            else:
+                _give_conn(conn)
+            return resp, data
+
+    # -- downstream -------------------------------------------------------
+    def _send(self, status, headers, body):
+        self.send_response(status)
+        for k, v in headers:
+            if k.lower() in HOP_BY_HOP or k.lower() == "content-length":
+                continue
+            if k.lower() == "location":
+                v = v.replace(UPSTREAM, f"http://{LISTEN[0]}:{LISTEN[1]}")
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+        _count(served_bytes=len(body))
+
+    def _send_cached(self, meta, body):
+        self._send(meta["status"], meta["headers"], body)
+
+    def do_GET(self):
+        if self.headers.get("Upgrade", "").lower() == "websocket":
+            return self._tunnel()
+        kind = classify(self.path)
+        if kind == "pass" or self.cache is None:
+            return self._pass()
+
+        cached = self.cache.get(self.path)
+        if cached and kind == "immutable":
+            _count(hits=1)
+            return self._send_cached(*cached)
+
+        cond = {}
+        if cached:
+            h = dict((k.lower(), v) for k, v in cached[0]["headers"])
+            if "etag" in h:
+                cond["If-None-Match"] = h["etag"]
+            if "last-modified" in h:
+                cond["If-Modified-Since"] = h["last-modified"]
+        try:
+            resp, data = self._fetch(cond)
+        except (OSError, http.client.HTTPException):
+            if cached:
+                _count(stale=1)            # uplink down: the last good copy still works
+                return self._send_cached(*cached)
+            return self.send_error(502)
+
+        if resp.status == 304 and cached:
+            _count(revalidated=1)
+            return self._send_cached(*cached)
+        _count(misses=1)
+        headers = resp.getheaders()
+        if resp.status == 200:
+            meta = {"status": 200, "headers": [(k, v) for k, v in headers if k.lower() in KEPT_HEADERS],
+                    "stored": time.time()}
+            self.cache.put(self.path, meta, data)
+        self._send(resp.status, headers, data)
+
+    def _pass(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else None
+        try:
+            resp, data = self._fetch(body=body)
+        except (OSError, http.client.HTTPException):
+            return self.send_error(502)
+        _count(passthrough=1)
+        self._send(resp.status, resp.getheaders(), data)
+
+    do_HEAD = do_POST = do_PUT = do_DELETE = do_OPTIONS = _pass
+
+    def _tunnel(self):
+        """Websocket upgrade: replay the request upstream, then pipe bytes both ways."""
+        raw = socket.create_connection((self.upstream.hostname, self.upstream.port or 443), UPSTREAM_TIMEOUT)
+        up = ssl.create_default_context().wrap_socket(raw, server_hostname=self.upstream.hostname)
+        lines = [f"{self.command} {self.path} HTTP/1.1", f"Host: {self.upstream.hostname}"]
+        for k, v in self.headers.items():
+            if k.lower() == "host":
+                continue
+            if k.lower() == "origin":
+                v = UPSTREAM
+            lines.append(f"{k}: {v}")
+        up.sendall(("\r\n".join(lines) + "\r\n\r\n").encode())
+        down = self.connection
+        _count(passthrough=1)
+        try:
+            while True:
+                ready = select.select([down, up], [], [], 60)[0]
+                if not ready:
+                    continue
+                for src in ready:
+                    data = src.recv(65536)
+                    if not data:
+                        return
+                    (up if src is down else down).sendall(data)
+        except OSError:
+            pass
+        finally:
+            up.close()
+            self.close_connection = True
+
+# ----------------------------------------------------------------------
+# ▶️ START / URL REWRITE
+# ----------------------------------------------------------------------
+_SERVER = None
+
+def start(listen=LISTEN, cache_dir=CACHE_DIR, max_mb=CACHE_MAX_MB):
+    """Start the proxy once in a daemon thread."""
+    global _SERVER
+    if _SERVER is None:
+        ProxyHandler.cache = AssetCache(cache_dir, max_mb)
+        _SERVER = ThreadingHTTPServer(listen, ProxyHandler)
+        _SERVER.daemon_threads = True
+        threading.Thread(target=_SERVER.serve_forever, daemon=True, name="asset-proxy").start()
+        print(f"🗄️ Asset proxy on http://{listen[0]}:{listen[1]} → {UPSTREAM} "
+              f"(cache {ProxyHandler.cache.size_mb():.0f}/{max_mb} MB)")
+    return _SERVER
+
+def running():
+    return _SERVER is not None
+
+def proxied_url(url):
+    """Rewrite a meeting URL on the proxied host to go through the running proxy."""
+    if _SERVER is None or not url.startswith(UPSTREAM + "/"):
+        return url
+    host, port = _SERVER.server_address[:2]
+    return f"http://{host}:{port}" + url[len(UPSTREAM):]
+
+def report(label=""):
+    """Print and return the counters since the last reset_stats()."""
+    with _stats_lock:
+        s = dict(STATS)
+    print(f"🗄️ Asset proxy{' ' + label if label else ''}: {s['hits']} hits, "
+          f"{s['revalidated']} revalidated, {s['misses']} misses, {s['stale']} stale — "
+          f"uplink {s['upstream_bytes'] / 1048576:.1f} MB, served {s['served_bytes'] / 1048576:.1f} MB")
+    return s
+
+# ----------------------------------------------------------------------
+# 📊 BENCHMARK
+# ----------------------------------------------------------------------
+LOAD_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+const res = performance.getEntriesByType('resource');
+return {load_ms: nav ? nav.loadEventEnd : 0,
+        bytes: (nav ? nav.transferSize : 0) + res.reduce((a, r) => a + (r.transferSize || 0), 0)};
+"""
+
+def _timed_load(url):
+    import chromium_session
+    driver = chromium_session.launch(chromium_session.build_options(extra_args=["--headless=new"]))
+    try:
+        driver.get(url)
+        for _ in range(100):
+            if driver.execute_script("return document.readyState") == "complete":
+                break
+            time.sleep(0.1)
+        return driver.execute_script(LOAD_JS)
+    finally:
+        driver.quit()
+
+def bench(url, runs=3):
+    """
+    Cold-browser page loads, direct vs through the proxy (first proxied
+    run fills the cache). Point UPSTREAM at a stand-in server to
+    benchmark offline.
+    """
+    start()
+    rows = []
+    for mode in ("direct", "proxy"):
+        for i in range(runs):
+            reset_stats()
+            r = _timed_load(proxied_url(url) if mode == "proxy" else url)
+            uplink = STATS["upstream_bytes"] if mode == "proxy" else r["bytes"]
+            rows.append((mode, i + 1, r["load_ms"], uplink))
+            print(f"⏱️ {mode:<6} run {i + 1}: load {r['load_ms']:.0f} ms, uplink {uplink / 1048576:.2f} MB")
+    for mode in ("direct", "proxy"):
+        warm = [r for r in rows if r[0] == mode and (mode == "direct" or r[1] > 1)] or \
+               [r for r in rows if r[0] == mode]
+        print(f"📊 {mode:<6}: avg load {sum(r[2] for r in warm) / len(warm):.0f} ms, "
+              f"avg uplink {sum(r[3] for r in warm) / len(warm) / 1048576:.2f} MB per join")
+    return rows
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="CareBridge asset proxy")
+    ap.add_argument("--bench", metavar="URL")
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--upstream", default=UPSTREAM)
+    args = ap.parse_args()
+    UPSTREAM = args.upstream
+    ProxyHandler.upstream = urlsplit(UPSTREAM)
+    if args.bench:
+        bench(args.bench, args.runs)
+    else:
+        start()
+        while True:
+            time.sleep(3600)
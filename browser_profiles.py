@@ -0,0 +1,211 @@
+# ============================================================
+# CareBridge — Persistent Chromium profiles per session slot
+# An ephemeral profile makes every call download, parse and compile
+# Jitsi's multi-megabyte bundle again. Each session slot ("1", "2",
+# "dual", …) instead gets its own --user-data-dir that keeps:
+#   • the HTTP cache and V8 code cache
+#   • granted camera/microphone permissions
+# prepare() runs before every launch: clears stale Chromium locks,
+# quarantines a profile whose state files no longer parse, marks the
+# last exit as clean (no "restore pages?" bubble) and trims caches
+# above the size cap. warm_up() loads the meeting app twice after
+# boot — once to fill the HTTP cache, once so V8 stores code cache —
+# so the first real call starts hot.
+#
+#   python3 browser_profiles.py            # sizes of every slot
+#   python3 browser_profiles.py --warm 1 2 # warm slots 1 and 2 now
+# ============================================================
+
+import os, json, time, shutil, threading
+
+PROFILE_ROOT = os.path.expanduser("~/.cache/carebridge/chromium")
+MAX_PROFILE_MB = 300                  # per slot; caches are trimmed above this
+DISK_CACHE_BYTES = 200 * 1024 * 1024  # handed to --disk-cache-size
+WARM_URL = "https://meet.jit.si/"     # loads the same app bundle as a room, no camera
+MEDIA_ORIGINS = ["https://meet.jit.si:443", "http://127.0.0.1:8088"]   # direct and via asset_proxy
+
+# files Chromium cannot start without if they are truncated
+STATE_FILES = ["Local State", os.path.join("Default", "Preferences")]
+# removable caches, cheapest to rebuild first
+CACHE_DIRS = [
+    os.path.join("Default", "Cache"),
+    os.path.join("Default", "GPUCache"),
+    os.path.join("Default", "Code Cache"),
+    os.path.join("Default", "Service Worker", "CacheStorage"),
+]
+LOCK_FILES = ["SingletonLock", "SingletonSocket", "SingletonCookie"]
+
+# ----------------------------------------------------------------------
+# 📁 SLOT DIRECTORIES
+# ----------------------------------------------------------------------
+def profile_dir(slot):
+    return os.path.join(PROFILE_ROOT, f"slot-{slot}")
+
+def dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for f in files:
+            try:
+                total += os.lstat(os.path.join(root, f)).st_size
+            except OSError:
+                pass
+    return total
+
+def chrome_args(slot):
+    """Switches that attach a Chromium launch to the slot's profile."""
+    return [f"--user-data-dir={profile_dir(slot)}", f"--disk-cache-size={DISK_CACHE_BYTES}"]
+
+# ----------------------------------------------------------------------
+# 🩺 RECOVERY
+# ----------------------------------------------------------------------
+def lock_owner_alive(path):
+    """SingletonLock is a symlink to "<host>-<pid>"; True if that pid still runs."""
+    try:
+        target = os.readlink(os.path.join(path, "SingletonLock"))
+        pid = int(target.rsplit("-", 1)[1])
+    except (OSError, IndexError, ValueError):
+        return False
+    return os.path.exists(f"/proc/{pid}")
+
+def clear_stale_locks(path):
+    if lock_owner_alive(path):
+        return False
+    for name in LOCK_FILES:
+        try:
+            os.unlink(os.path.join(path, name))
+        except OSError:
+            pass
+    return True
+
+def _load_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def is_corrupt(path):
+    """A state file that exists but does not parse means Chromium died mid-write."""
+    for name in STATE_FILES:
+        p = os.path.join(path, name)
+        if not os.path.exists(p):
+            continue
+        try:
+            _load_json(p)
+        except (OSError, ValueError):
+            print(f"⚠️ Profile {path}: {name} is unreadable")
+            return True
+    return False
+
+def reset(slot):
+    """Move the slot aside (keeping only the latest copy for diagnosis) and start empty."""
+    path = profile_dir(slot)
+    quarantine = path + ".corrupt"
+    shutil.rmtree(quarantine, ignore_errors=True)
+    if os.path.exists(path):
+        os.rename(path, quarantine)
+    os.makedirs(path, exist_ok=True)
+    print(f"♻️ Profile slot {slot} reset (old copy in {quarantine})")
+
+def mark_clean_exit(path):
+    """After a kill Chromium offers to restore the last session; pretend it exited normally."""
+    p = os.path.join(path, "Default", "Preferences")
+    try:
+        prefs = _load_json(p)
+    except (OSError, ValueError):
+        return
+    prof = prefs.setdefault("profile", {})
+    if prof.get("exit_type") == "Normal" and prof.get("exited_cleanly", True):
+        return
+    prof["exit_type"] = "Normal"
+    prof["exited_cleanly"] = True
+    with open(p, "w", encoding="utf-8") as f:
+        json.dump(prefs, f)
+
+def seed_media_permissions(path, origins=MEDIA_ORIGINS):
+    """Pre-grant camera + microphone for the meeting origins on a brand-new profile."""
+    p = os.path.join(path, "Default", "Preferences")
+    if os.path.exists(p):
+        return                     # Chromium keeps its own grants from here on
+    allow = {f"{o},*": {"setting": 1} for o in origins}
+    prefs = {"profile": {"exit_type": "Normal", "exited_cleanly": True,
+                         "content_settings": {"exceptions": {
+                             "media_stream_camera": allow, "media_stream_mic": allow}}}}
+    os.makedirs(os.path.dirname(p), exist_ok=True)
+    with open(p, "w", encoding="utf-8") as f:
+        json.dump(prefs, f)
+
+def enforce_cap(path, max_mb=MAX_PROFILE_MB):
+    """Delete cache directories, cheapest first, until the profile fits under max_mb."""
+    size = dir_size(path)
+    for sub in CACHE_DIRS:
+        if size <= max_mb * 1048576:
+            break
+        d = os.path.join(path, sub)
+        if os.path.isdir(d):
+            shutil.rmtree(d, ignore_errors=True)
+            print(f"🧹 Trimmed {sub} from {os.path.basename(path)} ({size / 1048576:.0f} MB > {max_mb} MB)")
+            size = dir_size(path)
+    return size
+
+def prepare(slot):
+    """Make the slot's profile safe to launch; returns the extra Chromium args."""
+    path = profile_dir(slot)
+    os.makedirs(path, exist_ok=True)
+    if not clear_stale_locks(path):
+        print(f"⚠️ Profile slot {slot} is in use by a running Chromium")
+    if is_corrupt(path):
+        reset(slot)
+    seed_media_permissions(path)
+    mark_clean_exit(path)
+    enforce_cap(path)
+    return chrome_args(slot)
+
+# ----------------------------------------------------------------------
+# 🔥 WARM-UP
+# ----------------------------------------------------------------------
+_warm_done = threading.Event()
+_warm_done.set()
+
+def warm_up(slots, url=WARM_URL, settle_s=4):
+    """Load the meeting app twice per slot in a headless Chromium."""
+    import chromium_session        # here: chromium_session imports this module
+    _warm_done.clear()
+    try:
+        for slot in slots:
+            t0 = time.monotonic()
+            driver = None
+            try:
+                opts = chromium_session.build_options(extra_args=["--headless=new"], slot=slot)
+                driver = chromium_session.launch(opts, slot=slot)
+                for _ in range(2):                 # 1st: HTTP cache, 2nd: V8 code cache
+                    driver.get(url)
+                    time.sleep(settle_s)
+                print(f"🔥 Profile slot {slot} warmed in {time.monotonic() - t0:.1f} s "
+                      f"({dir_size(profile_dir(slot)) / 1048576:.0f} MB)")
+            except Exception as e:
+                print(f"⚠️ Warm-up of slot {slot} failed: {e}")
+            finally:
+                if driver:
+                    driver.quit()
+    finally:
+        _warm_done.set()
+
+def warm_up_async(slots, url=WARM_URL):
+    """Run warm_up in the background (after boot) without delaying the panel."""
+    _warm_done.clear()
+    threading.Thread(target=warm_up, args=(slots, url), daemon=True).start()
+
+def wait_warm(timeout=60):
+    """Block a launch until a running warm-up has released the profiles."""
+    if not _warm_done.is_set():
+        print("⏳ Waiting for profile warm-up to finish …")
+    return _warm_done.wait(timeout)
+
+if __name__ == "__main__":
+    import sys
+    if sys.argv[1:2] == ["--warm"]:
+        warm_up(sys.argv[2:] or ["1", "2"])
+    try:
+        slots = sorted(d for d in os.listdir(PROFILE_ROOT) if d.startswith("slot-"))
+    except OSError:
+        slots = []
+    for d in slots:
+        print(f"📁 {d:<12} {dir_size(os.path.join(PROFILE_ROOT, d)) / 1048576:6.1f} MB")
@@ -0,0 +1,150 @@
+# ============================================================
+# CareBridge — Pre-join camera health probe
+# Grabs a few small frames straight from the driver's mmap'd
+# buffers (no copies) and checks them with vectorised NumPy tests:
+#   missing / busy  → camera unplugged or held by another process
+#   black / flat    → lens covered, dark room or dead sensor
+#   frozen          → consecutive frames are bit-identical
+# The first frame gets its own, generous budget (UVC cameras can take
+# a second to start streaming) and the first WARMUP_FRAMES are not
+# judged while auto-exposure settles. A camera that is slow to answer
+# is "unknown", not bad: it is kept, never dropped. Runs in well
+# under a second per healthy camera, before Chromium grabs the devices.
+#
+#   python3 camera_probe.py /dev/video0 /dev/video2
+# ============================================================
+
+import errno, time
+import numpy as np
+
+import v4l2_ioctl
+from camera_registry import REGISTRY
+
+FIRST_FRAME_S  = 1.5       # open + STREAMON → first frame
+HEALTH_S       = 0.6       # first frame → last judged frame
+WARMUP_FRAMES  = 5         # frames skipped while auto-exposure settles
+PROBE_FRAMES   = 3         # frames judged
+PROBE_SIZE     = (320, 240)
+
+MIN_BRIGHTNESS = 12.0      # mean luma (0–255)
+MIN_CONTRAST   = 4.0       # luma standard deviation
+MIN_MOTION     = 0.05      # mean |Δluma| between frames; 0 = stuck buffer
+
+# ----------------------------------------------------------------------
+# 🔬 FRAME CHECKS
+# ----------------------------------------------------------------------
+def luma_view(buf, width, height, bytesperline):
+    """Zero-copy (height, width) luma view of a YUYV buffer, subsampled 2×2."""
+    raw = np.frombuffer(buf, dtype=np.uint8, count=bytesperline * height)
+    return raw.reshape(height, bytesperline)[::2, 0:width * 2:4]
+
+def probe(dev, first_frame_s=FIRST_FRAME_S, health_s=HEALTH_S):
+    """
+    Return dict(dev, status, ok, reason, brightness, contrast, motion, frames,
+    first_ms, ms). status is "ok", "bad" (missing, busy, black, flat,
+    frozen) or "unknown" (no verdict in time — keep the camera).
+    """
+    t0 = time.monotonic()
+    result = {"dev": dev, "status": "bad", "ok": False, "reason": "", "brightness": None,
+              "contrast": None, "motion": None, "frames": 0, "first_ms": None, "ms": 0.0}
+    try:
+        cap = v4l2_ioctl.MmapCapture(dev, *PROBE_SIZE)
+    except OSError as e:
+        result["reason"] = "busy" if e.errno == errno.EBUSY else "missing"
+        result["ms"] = (time.monotonic() - t0) * 1000
+        return result
+
+    prev = None
+    motion = []
+    judged = 0
+    try:
+        for _ in cap.frames(1, t0 + first_frame_s):
+            result["first_ms"] = (time.monotonic() - t0) * 1000
+            result["frames"] = 1
+        if result["first_ms"] is not None:
+            t1 = time.monotonic()
+            for i, buf in enumerate(cap.frames(WARMUP_FRAMES - 1 + PROBE_FRAMES, t1 + health_s)):
+                result["frames"] = i + 2
+                if i < WARMUP_FRAMES - 1:
+                    continue
+                judged += 1
+                if cap.pixfmt != "YUYV":
+                    # MJPEG-only camera: frames arriving at all is the best cheap signal
+                    continue
+                y = luma_view(buf, cap.width, cap.height, cap.bytesperline)
+                result["brightness"] = float(y.mean())
+                result["contrast"] = float(y.std())
+                cur = y.astype(np.int16)
+                del y                    # drop the view before the buffer is re-queued
+                if prev is not None:
+                    motion.append(float(np.abs(cur - prev).mean()))
+                prev = cur
+    finally:
+        cap.close()
+
+    result["motion"] = max(motion) if motion else None
+    result["ms"] = (time.monotonic() - t0) * 1000
+    if result["first_ms"] is None:
+        result["status"], result["reason"] = "unknown", "no_frames"
+        return result
+    if not judged:
+        result["status"], result["reason"] = "unknown", "slow_frames"
+        return result
+    if result["brightness"] is not None and result["brightness"] < MIN_BRIGHTNESS:
+        result["reason"] = "black"
+    elif result["contrast"] is not None and result["contrast"] < MIN_CONTRAST:
+        result["reason"] = "flat"
+    elif result["motion"] is not None and result["motion"] < MIN_MOTION:
+        result["reason"] = "frozen"
+    else:
+        result["status"], result["ok"] = "ok", True
+    return result
+
+def format_result(r):
+    first = f", first frame {r['first_ms']:.0f} ms" if r.get("first_ms") is not None else ""
+    if r["ok"]:
+        return (f"✅ {r['dev']}: healthy ({r['frames']} frames, brightness "
+                f"{r['brightness'] if r['brightness'] is not None else '-'}{first}, {r['ms']:.0f} ms)")
+    mark = "❔" if r["status"] == "unknown" else "❌"
+    return f"{mark} {r['dev']}: {r['reason']} ({r['frames']} frames{first}, {r['ms']:.0f} ms)"
+
+# ----------------------------------------------------------------------
+# 🔁 PRE-JOIN SELECTION
+# ----------------------------------------------------------------------
+def choose_cameras(wanted, spares=None):
+    """
+    Probe the wanted cameras; replace a bad one with a healthy spare
+    (any other capture node the registry knows about) or drop it. A
+    camera whose probe timed out ("unknown") is kept as is. If nothing
+    is left, the wanted cameras are returned unchanged.
+    """
+    if spares is None:
+        spares = [c["dev"] for c in REGISTRY.refresh() if c["dev"] not in wanted]
+    chosen = []
+    for dev in wanted:
+        r = probe(dev)
+        print(format_result(r))
+        if r["status"] != "bad":
+            if r["status"] == "unknown":
+                print(f"⚠️ Keeping {dev} — probe gave no verdict in time")
+            chosen.append(dev)
+            continue
+        while spares:
+            spare = spares.pop(0)
+            rs = probe(spare)
+            print(format_result(rs))
+            if rs["ok"]:
+                print(f"🔁 Using {spare} instead of {dev}")
+                chosen.append(spare)
+                break
+        else:
+            print(f"⚠️ Skipping {dev} — no healthy replacement")
+    if not chosen and wanted:
+        print(f"⚠️ Every camera probe failed — joining with the configured cameras anyway: {', '.join(wanted)}")
+        return list(wanted)
+    return chosen
+
+if __name__ == "__main__":
+    import sys
+    for d in sys.argv[1:] or [c["dev"] for c in REGISTRY.cameras()]:
+        print(format_result(probe(d)))
@@ -0,0 +1,275 @@
+# ============================================================
+# CareBridge — Camera registry: /dev/videoN → browser camera
+# Browser labels never contain device paths. On Linux Chromium
+# labels a V4L2 camera as "<card name> (<vid>:<pid>)", so the
+# registry reads the card name and USB ids from sysfs and builds
+# the label the browser will show. An init script then resolves
+# that label to a deviceId once (cached in the page) and rewrites
+# getUserMedia's video constraint to {deviceId: {exact: …}} — no
+# extra probing stream is ever opened.
+# ============================================================
+
+import os, re, json, time
+
+import v4l2_ioctl
+import init_scripts
+
+SYSFS_V4L = "/sys/class/video4linux"
+
+# ----------------------------------------------------------------------
+# 📂 SYSFS SCAN
+# ----------------------------------------------------------------------
+def read_sysfs(path, default=""):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return default
+
+def usb_device_dir(node_dir):
+    """Walk up from the V4L2 node to the USB device dir (the one with idVendor)."""
+    try:
+        d = os.path.realpath(os.path.join(node_dir, "device"))
+    except OSError:
+        return None
+    for _ in range(4):
+        if os.path.exists(os.path.join(d, "idVendor")):
+            return d
+        d = os.path.dirname(d)
+    return None
+
+def scan_cameras(sysfs=SYSFS_V4L):
+    """
+    Return capture nodes sorted by N, one dict each:
+      dev, num, name, vid, pid, serial, usb_path, label
+    UVC metadata nodes (sysfs index != 0) are skipped.
+    """
+    cams = []
+    try:
+        entries = os.listdir(sysfs)
+    except OSError:
+        return cams
+    for entry in entries:
+        m = re.match(r"video(\d+)$", entry)
+        if not m:
+            continue
+        node = os.path.join(sysfs, entry)
+        if read_sysfs(os.path.join(node, "index"), "0") != "0":
+            continue
+        name = read_sysfs(os.path.join(node, "name"))
+        usb = usb_device_dir(node)
+        vid = read_sysfs(os.path.join(usb, "idVendor")) if usb else ""
+        pid = read_sysfs(os.path.join(usb, "idProduct")) if usb else ""
+        cams.append({
+            "dev": f"/dev/{entry}",
+            "num": int(m.group(1)),
+            "name": name,
+            "vid": vid,
+            "pid": pid,
+            "serial": read_sysfs(os.path.join(usb, "serial")) if usb else "",
+            "usb_path": os.path.basename(usb) if usb else "",
+            # what Chromium shows in MediaDeviceInfo.label
+            "label": f"{name} ({vid}:{pid})" if vid else name,
+        })
+    cams.sort(key=lambda c: c["num"])
+    return cams
+
+# ----------------------------------------------------------------------
+# 🗂️ REGISTRY
+# ----------------------------------------------------------------------
+class CameraRegistry:
+    """
+    Cached sysfs view of the connected cameras. While camera_watcher is
+    running it pushes every change in, so lookups never touch sysfs or
+    the devices at join time.
+    """
+
+    def __init__(self, max_age=30.0):
+        self.max_age = max_age
+        self.live = False          # True while a watcher keeps the cache current
+        self._cams = []
+        self._modes = {}           # dev → [(fourcc, w, h, fps)]
+        self._scanned = 0.0
+        self._constraints = {}     # dev → extra getUserMedia video constraints
+
+    def set_cameras(self, cams, modes):
+        """Replace the cache (called by camera_watcher)."""
+        self._cams = cams
+        self._modes = modes
+        self._scanned = time.monotonic()
+        self.live = True
+
+    def modes(self, dev):
+        """Capture modes of dev — from the watcher cache, else queried now."""
+        if dev not in self._modes:
+            self._modes[dev] = v4l2_ioctl.list_modes(dev)
+        return self._modes[dev]
+
+    def resolve(self, camera):
+        """
+        Map a camera reference to its current /dev/videoN:
+          "/dev/videoN", "port:<usb path>" (e.g. port:1-1.2) or "serial:<serial>".
+        Port and serial survive replugging and renumbering. None if absent.
+        """
+        if isinstance(camera, int) or camera.startswith("/dev/"):
+            return camera
+        kind, _, value = camera.partition(":")
+        field = {"port": "usb_path", "serial": "serial"}.get(kind)
+        for c in self.cameras():
+            if field and c[field] == value:
+                return c["dev"]
+        return None
+
+    def set_constraints(self, dev, constraints):
+        """Extra video constraints (size / frame rate) for dev, e.g. from usb_planner."""
+        self._constraints[dev] = constraints
+
+    def refresh(self):
+        if self.live:
+            return self._cams
+        self._cams = scan_cameras()
+        self._scanned = time.monotonic()
+        return self._cams
+
+    def cameras(self):
+        if not self.live and (not self._scanned or time.monotonic() - self._scanned > self.max_age):
+            self.refresh()
+        return self._cams
+
+    def get(self, dev):
+        for c in self.cameras():
+            if c["dev"] == dev:
+                return c
+        return None
+
+    def match_spec(self, camera):
+        """
+        Build the in-page matcher for a camera given as "/dev/videoN" or
+        as a plain index into the browser's video inputs.
+        """
+        if isinstance(camera, int):
+            return {"index": camera}
+        extra = self._constraints.get(camera, {})
+        cams = self.cameras()
+        info = self.get(camera)
+        if not info:
+            print(f"⚠️ {camera} not found in sysfs — falling back to first camera")
+            return {"index": 0, "dev": camera, "constraints": extra}
+        same = [c for c in cams if c["label"] == info["label"]]
+        return {
+            "dev": camera,
+            "label": info["label"],
+            "name": info["name"],
+            "usb": f"{info['vid']}:{info['pid']}" if info["vid"] else "",
+            # identical cameras share a label — order them like /dev/videoN
+            "ordinal": same.index(info),
+            "index": cams.index(info),
+            "constraints": extra,
+        }
+
+REGISTRY = CameraRegistry()
+
+# ----------------------------------------------------------------------
+# 🧩 IN-PAGE RESOLUTION
+# ----------------------------------------------------------------------
+# Shared resolver: label → usb id → card name → plain index.
+RESOLVE_CAM_JS = """
+async function _cbResolveCam(md, spec) {
+  const key = JSON.stringify(spec);
+  window._cbCamCache = window._cbCamCache || {};
+  if (window._cbCamCache[key]) return window._cbCamCache[key];
+  const cams = (await md.enumerateDevices()).filter(d => d.kind === 'videoinput');
+  let hits = spec.label ? cams.filter(c => c.label === spec.label) : [];
+  if (!hits.length && spec.usb) hits = cams.filter(c => c.label.includes('(' + spec.usb + ')'));
+  if (!hits.length && spec.name) hits = cams.filter(c => c.label.startsWith(spec.name));
+  const cam = hits.length ? (hits[spec.ordinal || 0] || hits[0]) : (cams[spec.index] || cams[0]);
+  if (cam) window._cbCamCache[key] = cam;
+  return cam;
+}
+"""
+
+PIN_JS = RESOLVE_CAM_JS + """
+(function (spec) {
+  const md = navigator.mediaDevices;
+  if (!md || md._cbPinned) return;
+  md._cbPinned = true;
+  md._cbSpec = spec;
+  const orig = md._cbOrigGUM = md.getUserMedia.bind(md);
+  md.getUserMedia = async function (c) {
+    if (c && c.video) {
+      const spec = md._cbSpec;
+      const cam = await _cbResolveCam(md, spec);
+      if (cam) {
+        const v = typeof c.video === 'object' ? c.video : {};
+        const pinned = Object.assign({}, v, spec.constraints || {}, {deviceId: {exact: cam.deviceId}});
+        c = Object.assign({}, c, {video: pinned});
+        window._chosenCam = cam.label;
+      } else console.log('⚠️ No camera match for', spec);
+    }
+    return orig(c);
+  };
+})(%s);
+"""
+
+# Mid-meeting camera change: re-pin future getUserMedia calls and swap the
+# live video track on every sender (async script).
+SWITCH_JS = RESOLVE_CAM_JS + """
+const done = arguments[arguments.length - 1];
+(async function (spec) {
+  const md = navigator.mediaDevices;
+  window._cbCamCache = {};
+  const cam = await _cbResolveCam(md, spec);
+  if (!cam) return null;
+  md._cbSpec = spec;
+  const gum = md._cbOrigGUM || md.getUserMedia.bind(md);
+  const stream = await gum({video: Object.assign({}, spec.constraints || {}, {deviceId: {exact: cam.deviceId}})});
+  const track = stream.getVideoTracks()[0];
+  const old = new Set();
+  let swapped = 0, previews = 0;
+  for (const pc of (window._cbPCs || []))
+    for (const s of pc.getSenders())
+      if (s.track && s.track.kind === 'video' && s.track !== track) {
+        const prev = s.track;
+        await s.replaceTrack(track);
+        old.add(prev);
+        swapped++;
+      }
+  // the self view shows a swapped-out track: give it a stream of its own and
+  // leave the page's MediaStream (Jitsi's local track bookkeeping) untouched
+  for (const el of document.querySelectorAll('video')) {
+    const src = el.srcObject;
+    if (!(src instanceof MediaStream) || !src.getVideoTracks().some(t => old.has(t))) continue;
+    el.srcObject = new MediaStream([track]);
+    previews++;
+  }
+  // only now release the old camera(s); nothing to swap → don't hold the new one open
+  old.forEach(t => t.stop());
+  if (!swapped && !previews) track.stop();
+  window._chosenCam = cam.label;
+  return cam.label + ' on ' + swapped + ' sender(s), ' + previews + ' preview(s)';
+})(%s).then(done, () => done(null));
+"""
+
+def pin_script(camera, registry=None):
+    return PIN_JS % json.dumps((registry or REGISTRY).match_spec(camera))
+
+def pin_camera(driver, camera, registry=None):
+    """Pin this window's getUserMedia video to camera (call before driver.get)."""
+    init_scripts.add(driver, pin_script(camera, registry))
+
+def switch_camera(driver, camera, registry=None):
+    """Move the current window's live video to camera. Returns a description or None."""
+    import meet_control
+    control = meet_control.get(driver)
+    if control:
+        # IFrame API meeting: let Jitsi switch so its own track state stays right
+        return control.switch_camera(camera, registry)
+    try:
+        return driver.execute_async_script(SWITCH_JS % json.dumps((registry or REGISTRY).match_spec(camera)))
+    except Exception as e:
+        print(f"⚠️ Camera switch failed: {e}")
+        return None
+
+if __name__ == "__main__":
+    for c in scan_cameras():
+        print(f"🎥 {c['dev']:<12} {c['label']:<45} usb={c['usb_path'] or '-'} serial={c['serial'] or '-'}")
@@ -0,0 +1,161 @@
+# ============================================================
+# CareBridge — Camera hotplug watcher
+# Listens for kernel uevents (NETLINK_KOBJECT_UEVENT, stdlib
+# socket — no pyudev) and keeps camera_registry.REGISTRY current:
+# connected cameras plus their capture modes. Join-time code then
+# reads the cache instead of scanning sysfs or opening devices.
+# Every change bumps a generation counter, so a meeting loop can
+# notice an unplugged camera with one integer compare and switch
+# its video track to a spare.
+# Without netlink (some containers) it falls back to polling sysfs.
+#
+#   python3 camera_watcher.py      # print hotplug events
+# ============================================================
+
+import os, socket, select, threading, time
+
+import v4l2_ioctl
+import camera_registry
+from camera_registry import REGISTRY, SYSFS_V4L, scan_cameras
+
+NETLINK_KOBJECT_UEVENT = 15
+DEBOUNCE = 0.5             # s — udev creates /dev nodes shortly after the kernel event
+POLL_INTERVAL = 2.0        # s — sysfs fallback
+
+# ----------------------------------------------------------------------
+# 📡 UEVENTS
+# ----------------------------------------------------------------------
+def parse_uevent(data):
+    """Kernel uevent ("ACTION@DEVPATH\\0KEY=VALUE\\0…") → dict."""
+    event = {}
+    for field in data.split(b"\0")[1:]:
+        key, sep, value = field.partition(b"=")
+        if sep:
+            event[key.decode(errors="replace")] = value.decode(errors="replace")
+    return event
+
+def open_uevent_socket():
+    sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT)
+    sock.bind((0, 1))      # multicast group 1 = kernel uevents
+    return sock
+
+# ----------------------------------------------------------------------
+# 👀 WATCHER
+# ----------------------------------------------------------------------
+class CameraWatcher(threading.Thread):
+    """Background thread that keeps the registry cache in sync with hotplug."""
+
+    def __init__(self, registry=REGISTRY):
+        super().__init__(daemon=True, name="camera-watcher")
+        self.registry = registry
+        self.generation = 0
+        self.lock = threading.Lock()
+        self._modes = {}           # (usb_path, vid, pid, num) → modes
+        self._missing = set()      # devs whose /dev node wasn't ready yet
+
+    def rescan(self):
+        """Re-read sysfs, query modes of new cameras only, publish to the registry."""
+        cams = scan_cameras()
+        modes, keys = {}, {}
+        self._missing = set()
+        for c in cams:
+            key = (c["usb_path"], c["vid"], c["pid"], c["num"])
+            if key not in self._modes:
+                try:
+                    self._modes[key] = v4l2_ioctl.list_modes(c["dev"])
+                except OSError:
+                    self._missing.add(c["dev"])
+                    continue
+            modes[c["dev"]] = self._modes[key]
+            keys[key] = True
+        self._modes = {k: v for k, v in self._modes.items() if k in keys}
+
+        before = {c["dev"]: c["label"] for c in self.registry.cameras()} if self.registry.live else {}
+        with self.lock:
+            self.registry.set_cameras(cams, modes)
+            after = {c["dev"]: c["label"] for c in cams}
+            if after != before:
+                self.generation += 1
+        for dev in sorted(set(before) - set(after)):
+            print(f"🔌 Camera removed: {dev} ({before[dev]})")
+        for dev in sorted(set(after) - set(before)):
+            print(f"🔌 Camera connected: {dev} ({after[dev]}, {len(modes.get(dev, []))} modes)")
+
+    def run(self):
+        try:
+            sock = open_uevent_socket()
+        except OSError as e:
+            print(f"⚠️ No uevent socket ({e}) — polling {SYSFS_V4L} every {POLL_INTERVAL:g} s")
+            self._poll()
+            return
+        due = time.monotonic() + DEBOUNCE if self._missing else None
+        while True:
+            timeout = max(0.0, due - time.monotonic()) if due else None
+            if select.select([sock], [], [], timeout)[0]:
+                event = parse_uevent(sock.recv(65536))
+                if event.get("SUBSYSTEM") == "video4linux":
+                    due = time.monotonic() + DEBOUNCE
+                continue
+            if due and time.monotonic() >= due:
+                self.rescan()
+                due = time.monotonic() + DEBOUNCE if self._missing else None
+
+    def _poll(self):
+        seen = None
+        while True:
+            try:
+                now = sorted(os.listdir(SYSFS_V4L))
+            except OSError:
+                now = []
+            if now != seen or self._missing:
+                seen = now
+                self.rescan()
+            time.sleep(POLL_INTERVAL)
+
+    def spare_for(self, dev, in_use=()):
+        """First connected camera other than dev that no session is using."""
+        for c in self.registry.cameras():
+            if c["dev"] != dev and c["dev"] not in in_use:
+                return c["dev"]
+        return None
+
+_WATCHER = None
+
+def start(registry=REGISTRY):
+    """Start the process-wide watcher once; the initial scan runs synchronously."""
+    global _WATCHER
+    if _WATCHER is None:
+        _WATCHER = CameraWatcher(registry)
+        _WATCHER.rescan()
+        _WATCHER.start()
+    return _WATCHER
+
+def generation():
+    """Change counter — compare against a saved value to detect hotplug."""
+    return _WATCHER.generation if _WATCHER else 0
+
+def follow_camera(driver, camera, in_use=(), switch=None):
+    """
+    Called after the generation changed. If camera is gone, move the
+    current window's video to a spare (with switch(driver, dev), default
+    camera_registry.switch_camera) and return the new device; otherwise
+    return camera unchanged.
+    """
+    if _WATCHER is None or isinstance(camera, int) or REGISTRY.get(camera):
+        return camera
+    spare = _WATCHER.spare_for(camera, in_use)
+    if not spare:
+        print(f"⚠️ {camera} unplugged and no spare camera connected")
+        return camera
+    moved = (switch or camera_registry.switch_camera)(driver, spare)
+    if not moved:
+        return camera
+    print(f"🔁 {camera} unplugged — video moved to {spare}: {moved}")
+    return spare
+
+if __name__ == "__main__":
+    start()
+    for c in REGISTRY.cameras():
+        print(f"🎥 {c['dev']:<12} {c['label']:<45} {len(REGISTRY.modes(c['dev']))} modes")
+    while True:
+        time.sleep(3600)
@@ -18,6 +18,9 @@ from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+import camera_registry
+import meeting_profiles
+import modal_guard
 
 # ----------------------------------------------------------------------
 # ⚙️ GPIO & MODEM SETUP
@@ -28,6 +31,8 @@ PIN_CONF   = 13
 PIN_EXIT   = 19
 PIN_ANSWER = 26   # dedicated Answer Incoming Call button
 
+MEETING_PROFILE = "default"   # "default" or "low_power" (see meeting_profiles.py)
+
 GPIO.setmode(GPIO.BCM)
 for pin in [PIN_SMS, PIN_CALL, PIN_CONF, PIN_EXIT, PIN_ANSWER]:
     GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
@@ -204,9 +209,10 @@ def make_call():
 # ----------------------------------------------------------------------
 # 🎥 JITSI MEETING JOIN (WORKING VERSION)
 # ----------------------------------------------------------------------
-def join_meeting_instance(meeting_url, camera, name):
-    """Launch Chromium, select specific camera via WebRTC, join Jitsi, wait for Exit."""
-    print(f"🌐 Launching {meeting_url} on {camera}")
+def join_meeting_instance(meeting_url, camera, name, profile=MEETING_PROFILE):
+    """Launch Chromium, pin the camera via camera_registry, join Jitsi, wait for Exit."""
+    print(f"🌐 Launching {meeting_url} on {camera} (profile {profile})")
+    profile = meeting_profiles.get_profile(profile)
     os.environ["SELENIUM_MANAGER_DISABLE"] = "1"
 
     opts = Options()
@@ -220,36 +226,18 @@ def join_meeting_instance(meeting_url, camera, name):
         opts.add_argument(a)
     opts.add_experimental_option("excludeSwitches", ["enable-automation"])
     opts.add_experimental_option("useAutomationExtension", False)
+    meeting_profiles.apply_chrome_args(opts, profile)
 
     driver = webdriver.Chrome(service=Service(which("chromedriver") or "/usr/bin/chromedriver"), options=opts)
-    driver.get(meeting_url)
+    # Pin the camera with an exact deviceId (no extra capture stream)
+    camera_registry.pin_camera(driver, camera)
+    meeting_profiles.install_rtc_hook(driver)
+    modal_guard.start(driver, name)
+    driver.get(meeting_profiles.profile_url(meeting_url, profile))
     print("✅ Page loaded")
 
     time.sleep(8)
 
-    # --- Force specific camera via WebRTC API and mute mic/cam ---
-    try:
-        js = f"""
-        async function pickCam() {{
-          const devs=await navigator.mediaDevices.enumerateDevices();
-          const cams=devs.filter(d=>d.kind==='videoinput');
-          console.log('🎥 Available cams:',cams.map(c=>c.label));
-          let target=cams.find(c=>c.label.includes('{camera}'))||cams[0];
-          if(target){{
-            const stream=await navigator.mediaDevices.getUserMedia({{video:{{deviceId:{{exact:target.deviceId}}}},audio:false}});
-            window._chosenCam=target.label;
-            const tracks=stream.getVideoTracks();
-            tracks.forEach(t=>t.enabled=false);
-            console.log('✅ Using camera '+target.label);
-          }}else console.log('⚠️ No match for {camera}');
-        }}
-        pickCam();
-        """
-        driver.execute_script(js)
-        print(f"🎥 Camera selection script injected for {camera}")
-    except Exception as e:
-        print("⚠️ JS camera select failed:", e)
-
     # --- Enter name ---
     try:
         for sel in [
@@ -286,11 +274,15 @@ def join_meeting_instance(meeting_url, camera, name):
             pass
 
     print(f"🔴 Press GPIO 19 to leave meeting [{name}] …")
+    watchdog = meeting_profiles.ProfileWatchdog(driver, profile, name)
     try:
         while GPIO.input(PIN_EXIT) == GPIO.HIGH:
+            watchdog.tick()
             time.sleep(0.2)
     finally:
         print(f"🛑 Closing meeting [{name}] ({camera})")
+        watchdog.report()
+        modal_guard.stop(driver)
         driver.quit()
 
 def join_meeting():
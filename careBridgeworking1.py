@@ -18,6 +18,7 @@ from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+import camera_registry
 
 # ----------------------------------------------------------------------
 # ⚙️ GPIO & MODEM SETUP
@@ -211,7 +212,7 @@ def make_call():
 # 🎥 JITSI MEETING JOIN (WORKING VERSION)
 # ----------------------------------------------------------------------
 def join_meeting_instance(meeting_url, camera, name):
-    """Launch Chromium, select specific camera via WebRTC, join Jitsi, wait for Exit."""
+    """Launch Chromium, pin the camera via camera_registry, join Jitsi, wait for Exit."""
     print(f"🌐 Launching {meeting_url} on {camera}")
     os.environ["SELENIUM_MANAGER_DISABLE"] = "1"
 
@@ -228,34 +229,13 @@ def join_meeting_instance(meeting_url, camera, name):
     opts.add_experimental_option("useAutomationExtension", False)
 
     driver = webdriver.Chrome(service=Service(which("chromedriver") or "/usr/bin/chromedriver"), options=opts)
+    # Pin the camera with an exact deviceId (no extra capture stream)
+    camera_registry.pin_camera(driver, camera)
     driver.get(meeting_url)
     print("✅ Page loaded")
 
     time.sleep(8)
 
-    # --- Force specific camera via WebRTC API and mute mic/cam ---
-    try:
-        js = f"""
-        async function pickCam() {{
-          const devs=await navigator.mediaDevices.enumerateDevices();
-          const cams=devs.filter(d=>d.kind==='videoinput');
-          console.log('🎥 Available cams:',cams.map(c=>c.label));
-          let target=cams.find(c=>c.label.includes('{camera}'))||cams[0];
-          if(target){{
-            const stream=await navigator.mediaDevices.getUserMedia({{video:{{deviceId:{{exact:target.deviceId}}}},audio:false}});
-            window._chosenCam=target.label;
-            const tracks=stream.getVideoTracks();
-            tracks.forEach(t=>t.enabled=false);
-            console.log('✅ Using camera '+target.label);
-          }}else console.log('⚠️ No match for {camera}');
-        }}
-        pickCam();
-        """
-        driver.execute_script(js)
-        print(f"🎥 Camera selection script injected for {camera}")
-    except Exception as e:
-        print("⚠️ JS camera select failed:", e)
-
     # --- Enter name ---
     try:
         for sel in [
@@ -0,0 +1,376 @@
+# ============================================================
+# CareBridge — Direct DevTools control channel
+# Every Selenium command is Python → chromedriver HTTP → CDP → page.
+# CDPBackend opens ONE persistent websocket straight to the page
+# target (the debuggerAddress chromedriver already exposes) and
+# does the hot-path work there: evaluate, click, type, frame lookup,
+# wait-for-element (a single awaitPromise round trip) and event
+# subscription. Cross-site iframes run in their own renderer under
+# site isolation; attach_frames() auto-attaches them as flat sessions
+# on the same websocket so they can be scripted too. SeleniumBackend offers the same methods over the
+# WebDriver API, so callers can switch with one setting and
+# Selenium stays the fallback.
+#
+# Per-command latency, both backends, on this machine:
+#   python3 cdp_channel.py --runs 50
+# ============================================================
+
+import json, time, threading, statistics
+from urllib.request import urlopen
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+try:
+    import websocket           # websocket-client, installed with Selenium 4
+except ImportError:
+    websocket = None
+
+COMMAND_TIMEOUT = 10
+
+# CSS or XPath (anything starting with "/" or "(") → first matching element
+FIND_JS = """
+function _cbFind(sel) {
+  if (sel[0] === '/' || sel[0] === '(')
+    return document.evaluate(sel, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+  return document.querySelector(sel);
+}
+"""
+
+class CDPError(Exception):
+    pass
+
+# ----------------------------------------------------------------------
+# 🔌 WEBSOCKET CHANNEL
+# ----------------------------------------------------------------------
+class CDPChannel:
+    """Request/response + event dispatch over one DevTools websocket."""
+
+    def __init__(self, ws_url):
+        # Chromium rejects websocket clients that send an Origin it was not told about
+        self.ws = websocket.create_connection(ws_url, suppress_origin=True, enable_multithread=True)
+        self.next_id = 0
+        self.lock = threading.Lock()
+        self.pending = {}          # id → [Event, message]
+        self.handlers = {}         # method → [callback(params)]
+        self.closed = False
+        threading.Thread(target=self._reader, daemon=True, name="cdp-reader").start()
+
+    def _reader(self):
+        while not self.closed:
+            try:
+                msg = json.loads(self.ws.recv())
+            except Exception:
+                break
+            if "id" in msg:
+                with self.lock:
+                    slot = self.pending.get(msg["id"])
+                if slot:
+                    slot[1] = msg
+                    slot[0].set()
+            elif "sessionId" not in msg:       # events of attached frames are not dispatched
+                for cb in list(self.handlers.get(msg.get("method"), [])):
+                    try:
+                        cb(msg.get("params", {}))
+                    except Exception as e:
+                        print(f"⚠️ CDP handler for {msg.get('method')} failed: {e}")
+        self.closed = True
+        with self.lock:
+            for slot in self.pending.values():
+                slot[0].set()
+
+    def send(self, method, params=None, timeout=COMMAND_TIMEOUT, session=None):
+        """One command; session targets an attached frame (flat Target session)."""
+        if self.closed:
+            raise CDPError("channel closed")
+        with self.lock:
+            self.next_id += 1
+            cid = self.next_id
+            slot = self.pending[cid] = [threading.Event(), None]
+        try:
+            msg = {"id": cid, "method": method, "params": params or {}}
+            if session:
+                msg["sessionId"] = session
+            self.ws.send(json.dumps(msg))
+            if not slot[0].wait(timeout) or slot[1] is None:
+                raise CDPError(f"{method}: no reply within {timeout} s")
+        finally:
+            with self.lock:
+                self.pending.pop(cid, None)
+        if "error" in slot[1]:
+            raise CDPError(f"{method}: {slot[1]['error'].get('message')}")
+        return slot[1].get("result", {})
+
+    def on(self, method, callback):
+        """Subscribe to a CDP event; returns a function that unsubscribes."""
+        self.handlers.setdefault(method, []).append(callback)
+        return lambda: self.handlers[method].remove(callback)
+
+    def close(self):
+        self.closed = True
+        try:
+            self.ws.close()
+        except Exception:
+            pass
+
+# ----------------------------------------------------------------------
+# ⚡ CDP BACKEND
+# ----------------------------------------------------------------------
+def page_ws_url(driver):
+    """Websocket URL of the driver's current window, via chromedriver's debuggerAddress."""
+    addr = driver.capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+    if not addr:
+        raise CDPError("no debuggerAddress in capabilities")
+    with urlopen(f"http://{addr}/json/list", timeout=5) as r:
+        targets = [t for t in json.load(r) if t.get("type") == "page"]
+    handle = driver.current_window_handle
+    for t in targets:
+        if t["id"] == handle or handle.endswith(t["id"]):
+            return t["webSocketDebuggerUrl"]
+    url = driver.current_url
+    for t in targets:
+        if t.get("url") == url:
+            return t["webSocketDebuggerUrl"]
+    raise CDPError("current window not found among DevTools targets")
+
+class CDPBackend:
+    """Hot-path page automation over a persistent websocket (frames = CDP frame ids)."""
+
+    name = "cdp"
+
+    def __init__(self, driver):
+        self.channel = CDPChannel(page_ws_url(driver))
+        self.contexts = {}         # frameId → default execution context id
+        self.oopifs = {}           # targetId (= frameId) → {"session", "url"} of attached iframes
+        self.frame_scripts = []
+        self.channel.on("Runtime.executionContextCreated", self._ctx_created)
+        self.channel.on("Runtime.executionContextDestroyed", self._ctx_destroyed)
+        self.channel.on("Runtime.executionContextsCleared", lambda p: self.contexts.clear())
+        self.channel.send("Runtime.enable")   # replays existing contexts as events
+        self.channel.send("Page.enable")
+
+    def _ctx_created(self, p):
+        ctx = p["context"]
+        aux = ctx.get("auxData", {})
+        if aux.get("isDefault") and aux.get("frameId"):
+            self.contexts[aux["frameId"]] = ctx["id"]
+
+    def _ctx_destroyed(self, p):
+        for fid, cid in list(self.contexts.items()):
+            if cid == p["executionContextId"]:
+                del self.contexts[fid]
+
+    def on(self, event, callback):
+        return self.channel.on(event, callback)
+
+    def child_frames(self):
+        tree = self.channel.send("Page.getFrameTree")["frameTree"]
+        return [c["frame"]["id"] for c in tree.get("childFrames", [])]
+
+    def attach_frames(self, scripts=()):
+        """
+        Auto-attach the page's out-of-process iframes. Each one gets
+        scripts (as init scripts) before its first document runs, and
+        evaluate(frame=<its target id>) reaches its main world.
+        """
+        self.frame_scripts = list(scripts)
+        self.channel.on("Target.attachedToTarget", self._attached)
+        self.channel.on("Target.detachedFromTarget", self._detached)
+        self.channel.send("Target.setAutoAttach", {"autoAttach": True, "waitForDebuggerOnStart": True,
+                                                   "flatten": True})
+
+    def _attached(self, p):
+        # the reader thread delivers the replies, so prepare the target elsewhere
+        threading.Thread(target=self._prepare_target, args=(p["sessionId"], p["targetInfo"]),
+                         daemon=True, name="cdp-attach").start()
+
+    def _prepare_target(self, sid, info):
+        try:
+            if info.get("type") == "iframe":
+                self.channel.send("Page.enable", session=sid)
+                for src in self.frame_scripts:
+                    self.channel.send("Page.addScriptToEvaluateOnNewDocument", {"source": src}, session=sid)
+                self.oopifs[info["targetId"]] = {"session": sid, "url": info.get("url", "")}
+            self.channel.send("Runtime.runIfWaitingForDebugger", session=sid)
+            if info.get("type") != "iframe":
+                # workers were paused by waitForDebuggerOnStart too — let them go
+                self.channel.send("Target.detachFromTarget", {"sessionId": sid})
+        except CDPError as e:
+            print(f"⚠️ Could not prepare {info.get('type')} {info.get('url', '')[:60]}: {e}")
+
+    def _detached(self, p):
+        for tid, f in list(self.oopifs.items()):
+            if f["session"] == p.get("sessionId"):
+                del self.oopifs[tid]
+
+    def evaluate(self, expr, frame=None, await_promise=False, timeout=COMMAND_TIMEOUT):
+        params = {"expression": expr, "returnByValue": True, "awaitPromise": await_promise}
+        if frame in self.oopifs:
+            r = self.channel.send("Runtime.evaluate", params, timeout, session=self.oopifs[frame]["session"])
+            if "exceptionDetails" in r:
+                raise CDPError(r["exceptionDetails"].get("exception", {}).get("description", "evaluate failed"))
+            return r.get("result", {}).get("value")
+        if frame is not None:
+            if frame not in self.contexts:
+                raise CDPError(f"no execution context for frame {frame}")
+            params["contextId"] = self.contexts[frame]
+        r = self.channel.send("Runtime.evaluate", params, timeout)
+        if "exceptionDetails" in r:
+            raise CDPError(r["exceptionDetails"].get("exception", {}).get("description", "evaluate failed"))
+        return r.get("result", {}).get("value")
+
+    def wait_for(self, selector, timeout=10, frame=None):
+        """Resolve in-page as soon as selector matches (MutationObserver), one round trip."""
+        js = FIND_JS + """
+        new Promise(resolve => {
+          if (_cbFind(%s)) return resolve(true);
+          const obs = new MutationObserver(() => {
+            if (_cbFind(%s)) { obs.disconnect(); resolve(true); }
+          });
+          obs.observe(document, {childList: true, subtree: true, attributes: true});
+          setTimeout(() => { obs.disconnect(); resolve(false); }, %d);
+        })""" % (json.dumps(selector), json.dumps(selector), int(timeout * 1000))
+        return bool(self.evaluate(js, frame, await_promise=True, timeout=timeout + 2))
+
+    def click(self, selector, frame=None):
+        js = FIND_JS + """
+        (() => { const el = _cbFind(%s); if (!el) return false;
+                 el.scrollIntoView(true); el.click(); return true; })()""" % json.dumps(selector)
+        return bool(self.evaluate(js, frame))
+
+    def type_text(self, selector, text, frame=None):
+        """Focus + select the field, then insert text like a real keyboard (React sees it)."""
+        js = FIND_JS + """
+        (() => { const el = _cbFind(%s); if (!el) return false;
+                 el.focus(); if (el.select) el.select(); return true; })()""" % json.dumps(selector)
+        if not self.evaluate(js, frame):
+            return False
+        self.channel.send("Input.insertText", {"text": text})
+        return True
+
+    def close(self):
+        self.channel.close()
+
+# ----------------------------------------------------------------------
+# 🐢 SELENIUM BACKEND (compatibility)
+# ----------------------------------------------------------------------
+def _by(selector):
+    return By.XPATH if selector[:1] in ("/", "(") else By.CSS_SELECTOR
+
+class SeleniumBackend:
+    """Same methods over WebDriver (frames = iframe WebElements of the top document)."""
+
+    name = "selenium"
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def _enter(self, frame):
+        self.driver.switch_to.default_content()
+        if frame is not None:
+            self.driver.switch_to.frame(frame)
+
+    def on(self, event, callback):
+        raise CDPError("event subscription needs the CDP backend")
+
+    def child_frames(self):
+        self.driver.switch_to.default_content()
+        return self.driver.find_elements(By.TAG_NAME, "iframe")
+
+    def evaluate(self, expr, frame=None, await_promise=False, timeout=COMMAND_TIMEOUT):
+        """expr must be one expression: it is spliced into the script (no in-page eval, which CSP may block)."""
+        self._enter(frame)
+        if not await_promise:
+            return self.driver.execute_script(f"return ({expr}\n);")
+        value = self.driver.execute_async_script(
+            "const done = arguments[arguments.length - 1];\n"
+            f"Promise.resolve({expr}\n).then(done, e => done({{_cbError: String(e)}}));")
+        if isinstance(value, dict) and "_cbError" in value:
+            raise CDPError(value["_cbError"])
+        return value
+
+    def wait_for(self, selector, timeout=10, frame=None):
+        self._enter(frame)
+        try:
+            WebDriverWait(self.driver, timeout).until(lambda d: d.find_elements(_by(selector), selector))
+            return True
+        except Exception:
+            return False
+
+    def click(self, selector, frame=None):
+        self._enter(frame)
+        els = self.driver.find_elements(_by(selector), selector)
+        if not els:
+            return False
+        self.driver.execute_script("arguments[0].scrollIntoView(true); arguments[0].click();", els[0])
+        return True
+
+    def type_text(self, selector, text, frame=None):
+        self._enter(frame)
+        els = self.driver.find_elements(_by(selector), selector)
+        if not els:
+            return False
+        els[0].clear()
+        els[0].send_keys(text)
+        return True
+
+    def close(self):
+        pass
+
+def backend(driver, kind="cdp"):
+    """CDP backend when asked for and reachable, otherwise Selenium."""
+    if kind == "cdp":
+        if websocket is None:
+            print("⚠️ websocket-client not installed — using Selenium backend")
+        else:
+            try:
+                return CDPBackend(driver)
+            except Exception as e:
+                print(f"⚠️ CDP channel unavailable ({e}) — using Selenium backend")
+    return SeleniumBackend(driver)
+
+# ----------------------------------------------------------------------
+# 📊 LATENCY BENCHMARK
+# ----------------------------------------------------------------------
+BENCH_PAGE = ("data:text/html,<button id='b' onclick='this.dataset.n=(+this.dataset.n||0)+1'>x</button>"
+              "<input id='i'><iframe srcdoc='<button id=c>y</button>'></iframe>")
+
+def bench(driver, runs=50):
+    """Median / p95 ms per command for each backend on the current page."""
+    results = {}
+    for ctl in (SeleniumBackend(driver), backend(driver, "cdp")):
+        ops = {
+            "evaluate": lambda: ctl.evaluate("1 + 1"),
+            "click": lambda: ctl.click("#b"),
+            "type": lambda: ctl.type_text("#i", "CareBridge"),
+            "frame lookup": lambda: ctl.child_frames(),
+            "wait_for (present)": lambda: ctl.wait_for("#b", 1),
+        }
+        for op, fn in ops.items():
+            fn()                   # warm
+            samples = []
+            for _ in range(runs):
+                t0 = time.perf_counter()
+                fn()
+                samples.append((time.perf_counter() - t0) * 1000)
+            samples.sort()
+            results[(ctl.name, op)] = (statistics.median(samples), samples[int(len(samples) * 0.95) - 1])
+            print(f"⏱️ {ctl.name:<8} {op:<20} median {results[(ctl.name, op)][0]:6.2f} ms  "
+                  f"p95 {results[(ctl.name, op)][1]:6.2f} ms")
+        ctl.close()
+    return results
+
+if __name__ == "__main__":
+    import argparse
+    import chromium_session
+    ap = argparse.ArgumentParser(description="Selenium vs direct CDP command latency")
+    ap.add_argument("--runs", type=int, default=50)
+    ap.add_argument("--headless", action="store_true")
+    args = ap.parse_args()
+    drv = chromium_session.launch(chromium_session.build_options(
+        extra_args=["--headless=new"] if args.headless else []))
+    try:
+        drv.get(BENCH_PAGE)
+        bench(drv, args.runs)
+    finally:
+        drv.quit()
@@ -0,0 +1,374 @@
+# ============================================================
+# CareBridge — Chromium session factory
+#   build_options() / launch()  → one Chromium + chromedriver, optionally
+#                                 on a persistent profile slot
+#   launch_detached() / attach() → Chromium outside chromedriver on a
+#                                 fixed debugging port, so a restarted
+#                                 panel can reattach (session_state)
+#   open_dual_session()         → several meeting windows in ONE
+#                                 Chromium, each pinned to its camera
+#   navigate() / wait_ready()   → driver.get under the chosen page-load
+#                                 strategy, then an explicit readiness
+#                                 predicate; reports time-to-first-interaction
+#   leave() / recycle()         → hang up via the provider and keep the
+#                                 browser on about:blank for the next call
+#   JoinReport                  → time-to-all-joined + RSS, printed
+#                                 the same way for every launch mode
+# ============================================================
+
+import os, time, signal, tempfile, threading, subprocess
+from shutil import which
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+
+from proc_stats import process_tree, tree_usage, driver_root_pid
+import camera_registry
+import browser_profiles
+import request_blocking
+import cdp_channel
+import session_state
+import init_scripts
+
+CHROMIUM_BINARY = "/usr/bin/chromium-browser"
+
+BASE_ARGS = [
+    "--start-fullscreen", "--disable-infobars", "--disable-extensions",
+    "--noerrdialogs", "--autoplay-policy=no-user-gesture-required",
+    "--use-fake-ui-for-media-stream", "--alsa-output-device=default",
+    "--no-sandbox",
+]
+
+# "normal" waits for the load event, "eager" for DOMContentLoaded, "none" returns at once;
+# with eager/none automation relies on an explicit readiness predicate instead
+LOAD_STRATEGIES = ("normal", "eager", "none")
+
+# Windows that are not in front must keep capturing/encoding at full rate
+MULTI_WINDOW_ARGS = [
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+]
+
+# ----------------------------------------------------------------------
+# 🌐 LAUNCH
+# ----------------------------------------------------------------------
+def build_options(camera=None, extra_args=(), slot=None, perf_log=False, load_strategy="normal"):
+    """
+    Chromium options shared by every CareBridge meeting window.
+    slot → persistent profile (browser_profiles); None → throwaway profile.
+    perf_log → Network events in chromedriver's performance log (request_blocking stats).
+    load_strategy → when driver.get returns (see LOAD_STRATEGIES).
+    """
+    opts = Options()
+    opts.binary_location = CHROMIUM_BINARY
+    opts.page_load_strategy = load_strategy
+    for a in BASE_ARGS:
+        opts.add_argument(a)
+    if camera:
+        opts.add_argument(f"--video-input-device={camera}")
+    for a in extra_args:
+        opts.add_argument(a)
+    if slot is not None:
+        for a in browser_profiles.prepare(slot):
+            opts.add_argument(a)
+    if perf_log:
+        request_blocking.enable_logging(opts)
+    opts.add_experimental_option("excludeSwitches", ["enable-automation"])
+    opts.add_experimental_option("useAutomationExtension", False)
+    return opts
+
+def launch(options, slot=None):
+    """
+    Start chromedriver + Chromium with the given options. If a persistent
+    profile slot refuses to start, it is reset once and the launch retried.
+    """
+    os.environ["SELENIUM_MANAGER_DISABLE"] = "1"
+    chromedriver_path = which("chromedriver") or "/usr/bin/chromedriver"
+    try:
+        return webdriver.Chrome(service=Service(chromedriver_path), options=options)
+    except Exception as e:
+        if slot is None or browser_profiles.lock_owner_alive(browser_profiles.profile_dir(slot)):
+            raise
+        print(f"⚠️ Chromium failed on profile slot {slot} ({str(e).splitlines()[0]}) — resetting")
+        browser_profiles.reset(slot)
+        return webdriver.Chrome(service=Service(chromedriver_path), options=options)
+
+# ----------------------------------------------------------------------
+# 🔗 DETACHED BROWSERS (reattachable)
+# ----------------------------------------------------------------------
+# what chromedriver would normally add when it starts Chromium itself
+DETACHED_ARGS = ["--no-first-run", "--no-default-browser-check", "--password-store=basic"]
+
+def attach(port, browser_pid=None, load_strategy="normal", perf_log=False):
+    """Connect a new chromedriver session to the Chromium listening on port."""
+    opts = Options()
+    opts.debugger_address = f"127.0.0.1:{port}"
+    opts.page_load_strategy = load_strategy
+    if perf_log:
+        request_blocking.enable_logging(opts)
+    driver = launch(opts)
+    driver.browser_pid = browser_pid
+    return driver
+
+def launch_detached(options, port, timeout=20):
+    """
+    Start Chromium with options.arguments in its own process session (it
+    survives the panel) on a fixed remote-debugging port, then attach.
+    """
+    args = [CHROMIUM_BINARY] + list(options.arguments) + DETACHED_ARGS + [f"--remote-debugging-port={port}"]
+    if not any(a.startswith("--user-data-dir=") for a in args):
+        # remote debugging needs a non-default profile directory
+        args.append(f"--user-data-dir={tempfile.mkdtemp(prefix='carebridge-')}")
+    proc = subprocess.Popen(args + ["about:blank"], stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL, start_new_session=True)
+    session_state.adopt(proc)
+    deadline = time.monotonic() + timeout
+    while not session_state.devtools_alive(port):
+        if proc.poll() is not None or time.monotonic() > deadline:
+            kill_browser(proc.pid)
+            raise RuntimeError(f"Chromium did not open debugging port {port}")
+        time.sleep(0.1)
+    caps = options.to_capabilities()
+    try:
+        return attach(port, proc.pid, options.page_load_strategy, "goog:loggingPrefs" in caps)
+    except Exception:
+        kill_browser(proc.pid)
+        raise
+
+def kill_browser(pid, grace=3.0):
+    """Terminate a detached Chromium and its children (its own process group), and reap it."""
+    proc = session_state.child(pid)
+    try:
+        os.killpg(pid, signal.SIGTERM)
+    except OSError:
+        session_state.pid_alive(pid)   # reaps it if it was ours
+        return
+    if proc is not None:
+        try:
+            proc.wait(timeout=grace)
+        except subprocess.TimeoutExpired:
+            pass
+    else:
+        deadline = time.monotonic() + grace
+        while time.monotonic() < deadline and session_state.pid_alive(pid):
+            time.sleep(0.1)
+    if session_state.pid_alive(pid):
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except OSError:
+            pass
+        if proc is not None:
+            try:
+                proc.wait(timeout=1)
+            except subprocess.TimeoutExpired:
+                pass
+    session_state.pid_alive(pid)       # drops our Popen once it has been reaped
+
+def close_browser(driver):
+    """driver.quit(), plus the browser itself when it was launched detached."""
+    try:
+        driver.quit()
+    except Exception as e:
+        print(f"⚠️ driver.quit failed: {e}")
+    pid = getattr(driver, "browser_pid", None)
+    if pid:
+        kill_browser(pid)
+
+# ----------------------------------------------------------------------
+# ♻️ TEARDOWN & RECYCLING
+# ----------------------------------------------------------------------
+RECYCLE_RSS_MB = 700       # browser tree still bigger than this on about:blank → quit it
+RECYCLE_MAX_CALLS = 10     # and start fresh every N calls regardless (slow leaks)
+
+# After the provider's own hang-up: drop our peer connections and any
+# "leave this page?" prompt. Under an IFrame API control page the peer
+# connections live in the meeting frame, out of this script's reach;
+# removing the frame tears down its document and closes them with it.
+CLEANUP_JS = """
+window.onbeforeunload = null;
+for (const pc of window._cbPCs || []) { try { pc.close(); } catch (e) {} }
+for (const f of document.querySelectorAll('iframe')) f.remove();
+"""
+
+def leave(driver, handles=None, hangup=None):
+    """
+    Hang up in every meeting window (hangup(driver), e.g. a provider's
+    leave), remove their init scripts, close all but the first window and
+    park that one on about:blank.
+    """
+    handles = handles or [driver.current_window_handle]
+    for h in handles:
+        driver.switch_to.window(h)
+        try:
+            if hangup:
+                hangup(driver)
+            driver.execute_script(CLEANUP_JS)
+        except Exception as e:
+            print(f"⚠️ Hang-up failed: {str(e).splitlines()[0]}")
+        init_scripts.clear(driver)
+    for h in handles[1:]:
+        driver.switch_to.window(h)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    driver.get("about:blank")
+    request_blocking.drain(driver)     # the next call's stats start from zero
+
+def recycle(driver, handles=None, label="", hangup=None):
+    """
+    Fast teardown: leave() and hand the browser back for the next call.
+    Quits it instead on error, memory pressure, a resource_governor flag
+    or after RECYCLE_MAX_CALLS.
+    Returns the reusable driver, or None when it was closed.
+    """
+    t0 = time.monotonic()
+    driver.cb_calls = getattr(driver, "cb_calls", 0) + 1
+    reason = None
+    try:
+        leave(driver, handles, hangup)
+        _, rss = tree_usage(process_tree(driver_root_pid(driver)))
+        if getattr(driver, "cb_over_limit", None):
+            reason = driver.cb_over_limit
+        elif rss > RECYCLE_RSS_MB * 1048576:
+            reason = f"RSS {rss / 1048576:.0f} MB"
+        elif driver.cb_calls >= RECYCLE_MAX_CALLS:
+            reason = f"{driver.cb_calls} calls"
+    except Exception as e:
+        reason = f"teardown failed: {str(e).splitlines()[0]}"
+    if reason is None:
+        print(f"♻️ [{label}] left and ready for the next call in {time.monotonic() - t0:.1f} s")
+        return driver
+    close_browser(driver)
+    print(f"🧹 [{label}] browser closed ({reason}) in {time.monotonic() - t0:.1f} s")
+    return None
+
+# ----------------------------------------------------------------------
+# 🚦 NAVIGATION & READINESS
+# ----------------------------------------------------------------------
+def wait_ready(driver, ready, timeout=30, ctl=None):
+    """
+    Wait until ready holds: a CSS/XPath selector (checked in-page, one round
+    trip per attempt) or a callable(driver) → bool. Survives the document
+    being replaced mid-wait, which is normal with the "none" strategy.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        try:
+            if callable(ready):
+                if ready(driver):
+                    return True
+                time.sleep(0.1)
+            elif (ctl or cdp_channel.SeleniumBackend(driver)).wait_for(ready, min(remaining, 5)):
+                return True
+        except Exception:
+            time.sleep(0.1)        # context destroyed by a navigation → look again
+
+def navigate(driver, url, ready=None, timeout=30, ctl=None, label=""):
+    """
+    driver.get(url), then wait_ready. Returns seconds to first interaction
+    (None if the predicate never held) and prints both timings.
+    """
+    strategy = driver.capabilities.get("pageLoadStrategy", "normal")
+    t0 = time.monotonic()
+    driver.get(url)
+    t_get = time.monotonic() - t0
+    ok = wait_ready(driver, ready, timeout, ctl) if ready else True
+    ttfi = time.monotonic() - t0 if ok else None
+    print(f"⏱️ {label + ': ' if label else ''}driver.get returned after {t_get:.1f} s, "
+          f"first interaction {'after %.1f s' % ttfi if ok else 'never'} (page load strategy {strategy})")
+    return ttfi
+
+# ----------------------------------------------------------------------
+# 🎥 PER-WINDOW CAMERA PINNING
+# ----------------------------------------------------------------------
+# --video-input-device is process-wide and browser labels never contain
+# device paths, so each window rewrites its own getUserMedia video
+# constraint to the deviceId camera_registry resolves for it.
+def pin_camera(driver, camera):
+    """Pin the current window to camera ("/dev/videoN" or a video-input index)."""
+    camera_registry.pin_camera(driver, camera)
+
+# ----------------------------------------------------------------------
+# ⏱️ JOIN REPORT
+# ----------------------------------------------------------------------
+class JoinReport:
+    """Collects per-session join times and prints time-to-all-joined + RSS."""
+
+    def __init__(self, label, expected):
+        self.label = label
+        self.expected = expected
+        self.t0 = time.monotonic()
+        self.joined = {}           # name → (elapsed_s, chromedriver pid)
+        self.lock = threading.Lock()
+
+    def mark_joined(self, name, driver):
+        with self.lock:
+            self.joined[name] = (time.monotonic() - self.t0, driver_root_pid(driver))
+            print(f"⏱️ [{name}] joined after {self.joined[name][0]:.1f} s")
+            if len(self.joined) == self.expected:
+                self.report()
+
+    def report(self):
+        pids = {pid for _, pid in self.joined.values() if pid}
+        rss = sum(tree_usage(process_tree(pid))[1] for pid in pids) / 1048576
+        total = max(t for t, _ in self.joined.values())
+        print(f"📊 {self.label}: all {len(self.joined)} joined in {total:.1f} s — "
+              f"{len(pids)} browser(s), RSS {rss:.0f} MB")
+        return {"label": self.label, "joined_s": total, "browsers": len(pids), "rss_mb": rss}
+
+# ----------------------------------------------------------------------
+# 🪟 SEVERAL MEETINGS IN ONE CHROMIUM
+# ----------------------------------------------------------------------
+def open_dual_session(sessions, join_fn, report=None, extra_args=(), before_load=None, slot=None, driver=None,
+                      perf_log=False, load_strategy="normal"):
+    """
+    sessions: list of (url, camera, name), camera being "/dev/videoN" or
+    a video-input index. Opens one window per session in a single
+    Chromium, starts all page loads, then runs join_fn(driver, name) in
+    each window in turn.
+    before_load(driver, name) runs in each window before it navigates.
+    slot selects a persistent profile for the shared Chromium; driver
+    reuses an already running (prewarmed) one instead of launching.
+    Returns (driver, [window handles]).
+    """
+    if driver is None:
+        driver = launch(build_options(extra_args=list(MULTI_WINDOW_ARGS) + list(extra_args), slot=slot,
+                                      perf_log=perf_log, load_strategy=load_strategy), slot=slot)
+    handles = []
+    for i, (url, cam, name) in enumerate(sessions):
+        if i:
+            driver.switch_to.new_window("window")
+        pin_camera(driver, cam)
+        if before_load:
+            before_load(driver, name)
+        # navigate without waiting for load so every window loads in parallel
+        driver.execute_script("window.location.href = arguments[0];", url)
+        handles.append(driver.current_window_handle)
+        print(f"🪟 Window {i + 1} loading {url} (camera {cam}) [{name}]")
+
+    for handle, (url, cam, name) in zip(handles, sessions):
+        driver.switch_to.window(handle)
+        join_fn(driver, name)
+        if report:
+            report.mark_joined(name, driver)
+    return driver, handles
+
+if __name__ == "__main__":
+    # Time-to-first-interaction per page-load strategy (headless, throwaway profile):
+    #   python3 chromium_session.py https://meet.jit.si/SomeRoom "//input[contains(@placeholder,'name')]"
+    import sys
+    url, ready = sys.argv[1], sys.argv[2]
+    results = {}
+    for strategy in LOAD_STRATEGIES:
+        drv = launch(build_options(extra_args=["--headless=new"], load_strategy=strategy))
+        try:
+            ctl = cdp_channel.backend(drv)
+            results[strategy] = navigate(drv, url, ready, ctl=ctl, label=strategy)
+            ctl.close()
+        finally:
+            drv.quit()
+    for strategy, ttfi in results.items():
+        print(f"📊 {strategy:<7} first interaction {'%.1f s' % ttfi if ttfi else '—'}")
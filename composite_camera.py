@@ -0,0 +1,89 @@
+# ============================================================
+# CareBridge — Composited dual-camera track
+# Both bedside cameras are captured inside ONE page, drawn into a
+# canvas (side by side or picture-in-picture) and handed to the
+# meeting as a single camera — one participant, one encoder, one
+# uplink instead of two.
+# ============================================================
+
+import json
+import init_scripts
+
+from camera_registry import REGISTRY, RESOLVE_CAM_JS
+
+LAYOUTS = {
+    # canvas size for each layout; cameras are captured at cam_w x cam_h
+    "side_by_side": {"width": 1280, "height": 360, "cam_w": 640, "cam_h": 360},
+    "pip":          {"width": 960,  "height": 540, "cam_w": 960, "cam_h": 540},
+}
+
+# Replaces getUserMedia: video requests get a clone of the canvas track,
+# audio (if asked for) still comes from the real microphone.
+COMPOSITE_JS = RESOLVE_CAM_JS + """
+(function (cfg) {
+  const md = navigator.mediaDevices;
+  if (!md || md._cbComposite) return;
+  md._cbComposite = true;
+  const orig = md.getUserMedia.bind(md);
+  let pending = null;
+
+  async function build() {
+    const picks = (await Promise.all(cfg.cameras.map(s => _cbResolveCam(md, s)))).filter(Boolean);
+    const streams = await Promise.all(picks.map(c => orig({
+      audio: false,
+      video: {deviceId: {exact: c.deviceId}, width: {ideal: cfg.cam_w},
+              height: {ideal: cfg.cam_h}, frameRate: {ideal: cfg.fps}}
+    })));
+    const videos = streams.map(s => {
+      const v = document.createElement('video');
+      v.muted = true; v.playsInline = true; v.srcObject = s; v.play();
+      return v;
+    });
+    const canvas = document.createElement('canvas');
+    canvas.width = cfg.width; canvas.height = cfg.height;
+    const ctx = canvas.getContext('2d', {alpha: false});
+
+    function draw() {
+      if (cfg.layout === 'pip') {
+        ctx.drawImage(videos[0], 0, 0, cfg.width, cfg.height);
+        if (videos[1]) {
+          const w = Math.round(cfg.width / 3.5), h = Math.round(cfg.height / 3.5);
+          ctx.drawImage(videos[1], cfg.width - w - 12, cfg.height - h - 12, w, h);
+        }
+      } else {
+        const w = cfg.width / videos.length;
+        videos.forEach((v, i) => ctx.drawImage(v, i * w, 0, w, cfg.height));
+      }
+    }
+    // setInterval, not rAF — keeps drawing when the window is not in front
+    setInterval(draw, 1000 / cfg.fps);
+    const track = canvas.captureStream(cfg.fps).getVideoTracks()[0];
+    window._cbComposite = {layout: cfg.layout, cams: picks.map(c => c.label)};
+    console.log('🎥 Composite track from', window._cbComposite.cams);
+    return track;
+  }
+
+  md.getUserMedia = async function (c) {
+    if (!c || !c.video) return orig(c);
+    pending = pending || build();
+    // hand out clones so the page stopping its track never kills the canvas
+    const tracks = [(await pending).clone()];
+    if (c.audio) tracks.push(...(await orig({audio: c.audio})).getAudioTracks());
+    return new MediaStream(tracks);
+  };
+})(%s);
+"""
+
+def composite_config(layout="side_by_side", cameras=("/dev/video0", "/dev/video2"), fps=15):
+    """cameras: "/dev/videoN" paths or video-input indexes, resolved via camera_registry."""
+    if layout not in LAYOUTS:
+        print(f"⚠️ Unknown composite layout '{layout}' — using side_by_side")
+        layout = "side_by_side"
+    specs = [REGISTRY.match_spec(c) for c in cameras]
+    return dict(LAYOUTS[layout], layout=layout, cameras=specs, fps=fps)
+
+def install(driver, layout="side_by_side", cameras=("/dev/video0", "/dev/video2"), fps=15):
+    """Register the compositor for every new document (call before driver.get)."""
+    cfg = composite_config(layout, cameras, fps)
+    init_scripts.add(driver, COMPOSITE_JS % json.dumps(cfg))
+    print(f"🖼️ Composite camera installed: {layout} {cfg['width']}x{cfg['height']} @ {fps} fps, cameras {list(cameras)}")
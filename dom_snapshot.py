@@ -0,0 +1,223 @@
+# ============================================================
+# CareBridge — Single-snapshot DOM diagnostics across frames
+# Webex1.py's old element dump did several WebDriver calls per
+# element plus a frame switch per iframe: tens of seconds on a
+# Webex page, long enough to change the timing under diagnosis.
+# take() runs ONE in-page script per frame and records every
+# input, button, [role=button] and iframe with its attributes,
+# bounding box and visibility, plus the frame tree. The result is
+# written as gzip'd JSON for offline selector work:
+#   python3 dom_snapshot.py https://meet1492.webex.com/meet/pr23680413308 --wait 10
+#   python3 dom_snapshot.py --show ~/.cache/carebridge/snapshots/webex-….json.gz
+# ============================================================
+
+import os, json, gzip, time
+from urllib.parse import urlsplit
+
+import cdp_channel
+
+SNAPSHOT_DIR = os.path.expanduser("~/.cache/carebridge/snapshots")
+TEXT_MAX = 80
+
+# Evaluated once per frame. Returns plain JSON; with withFrames the
+# iframe elements themselves are appended (WebDriver turns them into
+# WebElements for the Selenium walk).
+SNAPSHOT_JS = """
+function _cbSnap(withFrames, withHtml) {
+  const vw = window.innerWidth, vh = window.innerHeight;
+  function path(el) {
+    const parts = [];
+    for (; el && el.nodeType === 1 && parts.length < 8; el = el.parentElement) {
+      if (el.id) { parts.unshift(el.tagName.toLowerCase() + '#' + CSS.escape(el.id)); break; }
+      let i = 1;
+      for (let s = el.previousElementSibling; s; s = s.previousElementSibling)
+        if (s.tagName === el.tagName) i++;
+      parts.unshift(el.tagName.toLowerCase() + ':nth-of-type(' + i + ')');
+    }
+    return parts.join(' > ');
+  }
+  function describe(el) {
+    const r = el.getBoundingClientRect();
+    const cs = getComputedStyle(el);
+    const visible = r.width > 0 && r.height > 0 && cs.visibility !== 'hidden' &&
+                    cs.display !== 'none' && parseFloat(cs.opacity) > 0;
+    const d = {
+      tag: el.tagName.toLowerCase(), css: path(el),
+      box: [Math.round(r.x), Math.round(r.y), Math.round(r.width), Math.round(r.height)],
+      visible: visible,
+      in_viewport: visible && r.right > 0 && r.bottom > 0 && r.left < vw && r.top < vh,
+    };
+    for (const a of ['id', 'name', 'type', 'placeholder', 'aria-label', 'role', 'class',
+                     'data-testid', 'data-test', 'title', 'src', 'href'])
+      if (el.hasAttribute(a)) d[a] = el.getAttribute(a).slice(0, 200);
+    if (el.disabled) d.disabled = true;
+    const text = (el.innerText || el.value || '').trim().replace(/\\s+/g, ' ');
+    if (text) d.text = text.slice(0, %d);
+    return d;
+  }
+  const els = Array.from(document.querySelectorAll("input, textarea, select, button, [role=button], a[href], iframe"));
+  const out = {
+    url: location.href, title: document.title, ready: document.readyState,
+    viewport: [vw, vh], elements: els.map(describe),
+  };
+  if (withHtml) out.html = document.documentElement.outerHTML;
+  if (withFrames) out.frames = Array.from(document.querySelectorAll('iframe'));
+  return out;
+}
+""" % TEXT_MAX
+
+def _counts(elements):
+    c = {}
+    for e in elements:
+        kind = "role_button" if e.get("role") == "button" and e["tag"] != "button" else e["tag"]
+        c[kind] = c.get(kind, 0) + 1
+    return c
+
+# ----------------------------------------------------------------------
+# 📸 CAPTURE
+# ----------------------------------------------------------------------
+def _frame_ids(node):
+    yield node["frame"]["id"]
+    for c in node.get("childFrames", []):
+        yield from _frame_ids(c)
+
+def _walk_cdp(ctl, tree, with_html):
+    """Every frame in the Page.getFrameTree result, one Runtime.evaluate each."""
+    frames = []
+    expr = SNAPSHOT_JS + f"_cbSnap(false, {json.dumps(with_html)})"
+
+    def visit(node, parent, depth):
+        fid = node["frame"]["id"]
+        entry = {"id": fid, "parent": parent, "depth": depth, "frame_url": node["frame"].get("url")}
+        try:
+            # the main frame is evaluated in the page's default context
+            entry.update(ctl.evaluate(expr, fid if parent else None))
+        except Exception as e:
+            entry["error"] = str(e).splitlines()[0]
+        frames.append(entry)
+        for child in node.get("childFrames", []):
+            visit(child, fid, depth + 1)
+
+    visit(tree, None, 0)
+    return frames
+
+def _walk_selenium(driver, with_html):
+    """Switch into each iframe once; one execute_script per frame (it also returns the child iframes)."""
+    frames = []
+
+    def visit(parent, path, depth):
+        snap = driver.execute_script(SNAPSHOT_JS + "return _cbSnap(true, arguments[0]);", with_html)
+        children = snap.pop("frames", [])
+        fid = "/".join(map(str, path)) or "main"
+        frames.append(dict(snap, id=fid, parent=parent, depth=depth))
+        for i, el in enumerate(children):
+            try:
+                driver.switch_to.frame(el)
+            except Exception as e:
+                frames.append({"id": f"{fid}/{i}", "parent": fid, "depth": depth + 1, "error": str(e).splitlines()[0]})
+                continue
+            try:
+                visit(fid, path + [i], depth + 1)
+            finally:
+                driver.switch_to.parent_frame()
+
+    driver.switch_to.default_content()
+    visit(None, [], 0)
+    return frames
+
+def take(driver, label="page", ctl=None, with_html=False):
+    """
+    Snapshot every frame of the current window. Uses the CDP backend when
+    all frames are reachable from the page target, else one Selenium
+    call per frame. Returns the snapshot dict.
+    """
+    t0 = time.perf_counter()
+    own = ctl is None
+    ctl = ctl or cdp_channel.backend(driver)
+    try:
+        tree = ctl.channel.send("Page.getFrameTree")["frameTree"] if ctl.name == "cdp" else None
+        # out-of-process (cross-site) iframes have no context on this target → Selenium walk
+        if tree and all(f in ctl.contexts for f in list(_frame_ids(tree))[1:]):
+            frames, via = _walk_cdp(ctl, tree, with_html), "cdp"
+        else:
+            frames, via = _walk_selenium(driver, with_html), "selenium"
+    finally:
+        if own:
+            ctl.close()
+    elements = [e for f in frames for e in f.get("elements", [])]
+    return {
+        "label": label, "taken_at": time.time(), "via": via,
+        "took_ms": round((time.perf_counter() - t0) * 1000, 1),
+        "url": frames[0].get("url") if frames else None,
+        "counts": _counts(elements), "frames": frames,
+    }
+
+# ----------------------------------------------------------------------
+# 💾 SAVE / LOAD / SHOW
+# ----------------------------------------------------------------------
+def save(snap, path=None):
+    if path is None:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(snap["taken_at"]))
+        path = os.path.join(SNAPSHOT_DIR, f"{snap['label']}-{stamp}.json.gz")
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(snap, f, separators=(",", ":"))
+    return path
+
+def load(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+def show(snap, only_visible=False):
+    """Print the snapshot the way the old recursive dump did, from the JSON."""
+    counts = ", ".join(f"{n} {k}" for k, n in sorted(snap["counts"].items()))
+    print(f"📸 {snap['label']}: {len(snap['frames'])} frame(s), {counts} — captured in {snap['took_ms']} ms via {snap['via']}")
+    for fr in snap["frames"]:
+        pad = "  " * fr["depth"]
+        host = urlsplit(fr.get("url") or fr.get("frame_url") or "").hostname or "-"
+        if "error" in fr:
+            print(f"{pad}⚠️ frame {fr['id']} ({host}): {fr['error']}")
+            continue
+        print(f"{pad}🧭 frame {fr['id']} ({host}) {len(fr['elements'])} element(s)")
+        for e in fr["elements"]:
+            if only_visible and not e["visible"]:
+                continue
+            attrs = " ".join(f"{k}='{e[k]}'" for k in ("id", "name", "placeholder", "aria-label", "data-testid", "text")
+                             if k in e)
+            eye = "👁️" if e["in_viewport"] else ("·" if e["visible"] else "🙈")
+            print(f"{pad}  {eye} {e['tag']:<8} {attrs} box={e['box']}")
+
+def capture(driver, label="page", ctl=None, with_html=False):
+    """take() + save() + one summary line."""
+    snap = take(driver, label, ctl, with_html)
+    path = save(snap)
+    print(f"📸 [{label}] {sum(snap['counts'].values())} elements in {len(snap['frames'])} frame(s), "
+          f"{snap['took_ms']} ms via {snap['via']} → {path}")
+    return snap, path
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="One-call-per-frame DOM snapshot of a meeting page")
+    ap.add_argument("url", nargs="?")
+    ap.add_argument("--label", default=None)
+    ap.add_argument("--wait", type=float, default=10, help="seconds to let the page settle")
+    ap.add_argument("--html", action="store_true", help="also store each frame's HTML")
+    ap.add_argument("--headless", action="store_true")
+    ap.add_argument("--show", metavar="FILE", help="print a saved snapshot instead of taking one")
+    ap.add_argument("--visible", action="store_true", help="with --show: visible elements only")
+    args = ap.parse_args()
+    if args.show:
+        show(load(args.show), args.visible)
+    elif args.url:
+        import chromium_session
+        drv = chromium_session.launch(chromium_session.build_options(
+            extra_args=["--headless=new"] if args.headless else [], load_strategy="eager"))
+        try:
+            drv.get(args.url)
+            time.sleep(args.wait)
+            snap, _ = capture(drv, args.label or (urlsplit(args.url).hostname or "page").split(".")[-2], with_html=args.html)
+            show(snap, True)
+        finally:
+            drv.quit()
+    else:
+        ap.error("give a URL or --show FILE")
@@ -0,0 +1,143 @@
+# ============================================================
+# CareBridge — Hedged multi-provider join
+# On a bad day one provider takes 40 s to let us in, or never does.
+# race() starts the primary join (Jitsi); if it has not reached
+# "joined" within the budget — or fails outright — the secondary
+# (Webex) starts in a second warm browser. The first leg in the
+# meeting wins and the other browser is killed mid-join.
+# Every race is appended to STATS_FILE, and summary() prints how
+# often the hedge was needed and won, and roughly how much time it
+# saved compared with the primary's usual join time.
+# ============================================================
+
+import os, json, time, queue, threading, statistics
+
+BUDGET_S = 15
+STATS_FILE = os.path.expanduser("~/.cache/carebridge/hedge_stats.json")
+STATS_KEEP = 200
+
+class HedgeCancelled(Exception):
+    pass
+
+# ----------------------------------------------------------------------
+# 🏁 RACE
+# ----------------------------------------------------------------------
+class Leg:
+    """
+    One provider's join attempt. join_fn(leg) launches, joins and returns
+    the driver; it calls leg.attach(driver) as soon as the browser exists
+    so a losing leg can be killed wherever it is. close_fn(driver) tears
+    a browser down.
+    """
+
+    def __init__(self, provider, join_fn, close_fn):
+        self.provider = provider
+        self.join_fn = join_fn
+        self.close_fn = close_fn
+        self.cancel = threading.Event()
+        self.lock = threading.Lock()
+        self.driver = None
+        self.result = None
+        self.error = None
+        self.took = None
+
+    def attach(self, driver):
+        with self.lock:
+            cancelled = self.cancel.is_set()
+            if not cancelled:
+                self.driver = driver
+        if cancelled:
+            self.close_fn(driver)
+            raise HedgeCancelled(self.provider)
+        return driver
+
+    def abort(self):
+        with self.lock:
+            self.cancel.set()
+            driver, self.driver = self.driver, None
+        if driver:
+            self.close_fn(driver)
+
+    def run(self, t0, done):
+        try:
+            self.result = self.join_fn(self)
+        except Exception as e:
+            self.error = e
+        self.took = time.monotonic() - t0
+        done.put(self)
+
+def race(primary, secondary, budget_s=BUDGET_S):
+    """Returns the winning Leg (.result is its driver), or None if both failed."""
+    done = queue.Queue()
+    t0 = time.monotonic()
+    threading.Thread(target=primary.run, args=(t0, done), daemon=True, name=f"join-{primary.provider}").start()
+    legs = [primary]
+    try:
+        first = done.get(timeout=budget_s)
+    except queue.Empty:
+        first = None
+    winner = first if first is not None and first.error is None else None
+    if winner is None:
+        why = f"failed ({str(first.error).splitlines()[0]})" if first else f"not joined after {budget_s} s"
+        print(f"🪁 {primary.provider} {why} — starting {secondary.provider} too")
+        threading.Thread(target=secondary.run, args=(t0, done), daemon=True,
+                         name=f"join-{secondary.provider}").start()
+        legs.append(secondary)
+    pending = len(legs) - (first is not None)
+    while winner is None and pending:
+        leg = done.get()
+        pending -= 1
+        if leg.error is None:
+            winner = leg
+        else:
+            print(f"⚠️ {leg.provider} join failed: {str(leg.error).splitlines()[0]}")
+    primary_failed = primary.error is not None
+    for leg in legs:
+        if leg is not winner:
+            leg.abort()
+    if winner:
+        print(f"🏁 {winner.provider} joined first after {winner.took:.1f} s"
+              + ("".join(f", {leg.provider} torn down" for leg in legs if leg is not winner)))
+    record(primary.provider, winner, len(legs) > 1, primary_failed)
+    return winner
+
+# ----------------------------------------------------------------------
+# 📊 WIN RATE & TIME SAVED
+# ----------------------------------------------------------------------
+def _load():
+    try:
+        with open(STATS_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+def record(primary, winner, hedged, primary_failed):
+    history = _load()
+    entry = {"t": round(time.time()), "primary": primary, "hedged": hedged,
+             "winner": winner.provider if winner else None,
+             "join_s": round(winner.took, 1) if winner else None,
+             "primary_failed": primary_failed, "saved_s": None}
+    if winner and winner.provider != primary and not primary_failed:
+        # the primary was cancelled, so compare with its usual join time
+        usual = [e["join_s"] for e in history if e.get("winner") == primary]
+        if usual:
+            entry["saved_s"] = round(max(0.0, statistics.median(usual) - winner.took), 1)
+    history = (history + [entry])[-STATS_KEEP:]
+    os.makedirs(os.path.dirname(STATS_FILE), exist_ok=True)
+    tmp = STATS_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(history, f)
+    os.replace(tmp, STATS_FILE)
+    summary(history)
+
+def summary(history=None):
+    history = _load() if history is None else history
+    hedged = [e for e in history if e["hedged"]]
+    won = [e for e in hedged if e["winner"] and e["winner"] != e["primary"]]
+    rescued = sum(1 for e in won if e["primary_failed"])
+    saved = sum(e["saved_s"] or 0 for e in won)
+    print(f"📊 Hedged joins: {len(hedged)} of {len(history)} needed the hedge, secondary won "
+          f"{len(won)} ({100 * len(won) / len(hedged) if hedged else 0:.0f}%), "
+          f"~{saved:.0f} s saved, {rescued} call(s) rescued from a failed primary")
+    return {"joins": len(history), "hedged": len(hedged), "secondary_wins": len(won),
+            "saved_s": saved, "rescued": rescued}
@@ -0,0 +1,29 @@
+# ============================================================
+# CareBridge — Tracked per-window init scripts
+# Page.addScriptToEvaluateOnNewDocument scripts stay on a window
+# for its whole life. A browser that is recycled for the next call
+# would otherwise replay the previous call's camera pin, RTC hook
+# and compositor on top of the new ones, so every registration is
+# recorded per window and clear() removes them again. sources()
+# hands the same scripts to frames that run in their own renderer.
+# ============================================================
+
+def add(driver, source):
+    """Register source for every new document in the current window."""
+    ident = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})["identifier"]
+    scripts = driver.__dict__.setdefault("cb_init_scripts", {})
+    scripts.setdefault(driver.current_window_handle, []).append((ident, source))
+    return ident
+
+def sources(driver):
+    """The scripts add() registered in the current window, in order."""
+    return [src for _, src in driver.__dict__.get("cb_init_scripts", {}).get(driver.current_window_handle, [])]
+
+def clear(driver):
+    """Remove every script add() registered in the current window."""
+    scripts = driver.__dict__.get("cb_init_scripts", {})
+    for ident, _ in scripts.pop(driver.current_window_handle, []):
+        try:
+            driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": ident})
+        except Exception:
+            pass
@@ -0,0 +1,284 @@
+# ============================================================
+# CareBridge — Jitsi IFrame API control plane
+# Driving Jitsi by clicking its DOM costs a WebDriver round trip per
+# step and breaks whenever Jitsi renames a CSS class. In this mode
+# the panel serves a tiny local page (CONTROL_HTML) that embeds the
+# meeting with Jitsi's own IFrame API (external_api.js). Join, leave,
+# mute, camera switch and stats are executeCommand / API calls on
+# that page, and the API's events come back to Python through a CDP
+# binding. Both directions share ONE persistent DevTools websocket
+# per window, so a GPIO press reaches the meeting in milliseconds.
+# Site isolation stays on: the meeting iframe is a separate renderer
+# that the channel auto-attaches, handing it the window's init
+# scripts (RTC hook, camera pin, stats) before Jitsi starts.
+#
+#   provider "jitsi_iframe" (providers/jitsi_iframe.py) uses this;
+#   meet_control.get(driver) gives the current window's channel.
+# ============================================================
+
+import json, time, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlencode, urlsplit
+
+import cdp_channel
+import camera_registry
+import init_scripts
+
+LISTEN = ("127.0.0.1", 8089)
+DOMAIN = "meet.jit.si"
+BINDING = "_cbMeetEvent"
+COMMAND_TIMEOUT = 5
+
+# API events forwarded to Python (join and mute state is also kept in the page's _cb)
+EVENTS = ["videoConferenceJoined", "videoConferenceLeft", "readyToClose", "audioMuteStatusChanged",
+          "videoMuteStatusChanged", "participantJoined", "participantLeft", "cameraError", "micError",
+          "errorOccurred"]
+
+CONTROL_HTML = """<!doctype html>
+<html><head><meta charset="utf-8"><title>CareBridge</title>
+<style>html, body, #meet { margin: 0; width: 100%%; height: 100%%; overflow: hidden; background: #000; }</style>
+</head><body><div id="meet"></div>
+<script>
+const q = new URLSearchParams(location.search);
+const domain = q.get('domain');
+const EVENTS = %s;
+window._cb = {
+  api: null, joined: false, state: {audioMuted: null, videoMuted: null},
+  emit(type, data) {
+    try { if (typeof window.%s === 'function') window.%s(JSON.stringify({type: type, data: data || null})); } catch (e) {}
+  },
+  join(name) {
+    if (this.api) return true;
+    const config = Object.assign({prejoinConfig: {enabled: false}, prejoinPageEnabled: false,
+                                  disableDeepLinking: true}, JSON.parse(q.get('config') || '{}'));
+    this.api = new JitsiMeetExternalAPI(domain, {
+      roomName: q.get('room'), parentNode: document.getElementById('meet'), width: '100%%', height: '100%%',
+      userInfo: {displayName: name}, configOverwrite: config,
+    });
+    for (const ev of EVENTS) this.api.addListener(ev, data => {
+      if (ev === 'videoConferenceJoined') this.joined = true;
+      if (ev === 'videoConferenceLeft' || ev === 'readyToClose') this.joined = false;
+      if (ev === 'audioMuteStatusChanged') this.state.audioMuted = data.muted;
+      if (ev === 'videoMuteStatusChanged') this.state.videoMuted = data.muted;
+      this.emit(ev, data);
+    });
+    return true;
+  },
+  cmd(name, args) {
+    if (!this.api) return false;
+    this.api.executeCommand(name, ...(args || []));
+    return true;
+  },
+  async hangup(ms) {
+    const api = this.api;
+    if (!api) return true;
+    if (this.joined) {
+      const left = new Promise(r => api.addListener('videoConferenceLeft', r));
+      api.executeCommand('hangup');
+      await Promise.race([left, new Promise(r => setTimeout(r, ms))]);
+    }
+    api.dispose();
+    this.api = null;
+    this.joined = false;
+    return true;
+  },
+  async switchCamera(spec) {
+    // same order as camera_registry's resolver, on the meeting frame's own device list
+    const cams = ((await this.api.getAvailableDevices()).videoInput || []);
+    let hits = spec.label ? cams.filter(c => c.label === spec.label) : [];
+    if (!hits.length && spec.usb) hits = cams.filter(c => c.label.includes('(' + spec.usb + ')'));
+    if (!hits.length && spec.name) hits = cams.filter(c => c.label.startsWith(spec.name));
+    const cam = hits.length ? (hits[spec.ordinal || 0] || hits[0]) : cams[spec.index || 0];
+    if (!cam) return null;
+    this.api.setVideoInputDevice(cam.label, cam.deviceId);
+    return cam.label;
+  },
+  async stats() {
+    if (!this.api) return {joined: false};
+    return {joined: this.joined, participants: this.api.getNumberOfParticipants(),
+            audioMuted: await this.api.isAudioMuted(), videoMuted: await this.api.isVideoMuted(),
+            devices: await this.api.getCurrentDevices()};
+  },
+};
+const s = document.createElement('script');
+s.src = 'https://' + domain + '/external_api.js';
+s.onload = () => { document.body.dataset.cbState = 'ready'; };
+s.onerror = () => { document.body.dataset.cbState = 'error'; };
+document.head.appendChild(s);
+</script></body></html>
+""" % (json.dumps(EVENTS), BINDING, BINDING)
+
+# ----------------------------------------------------------------------
+# 🌐 LOCAL CONTROL PAGE
+# ----------------------------------------------------------------------
+class ControlPageHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if urlsplit(self.path).path != "/":
+            return self.send_error(404)
+        body = CONTROL_HTML.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+_SERVER = None
+
+def serve(listen=LISTEN):
+    """Start the control page server once in a daemon thread."""
+    global _SERVER
+    if _SERVER is None:
+        _SERVER = ThreadingHTTPServer(listen, ControlPageHandler)
+        _SERVER.daemon_threads = True
+        threading.Thread(target=_SERVER.serve_forever, daemon=True, name="meet-control").start()
+        print(f"🎛️ Meeting control page on http://{listen[0]}:{listen[1]}/")
+    return _SERVER
+
+def config_overwrite(profile):
+    """A profile's "config.a.b" URL overrides as the nested configOverwrite object."""
+    out = {}
+    for key, value in (profile or {}).get("url_config", {}).items():
+        parts = key.split(".")[1:] if key.startswith("config.") else key.split(".")
+        node = out
+        for p in parts[:-1]:
+            node = node.setdefault(p, {})
+        node[parts[-1]] = value
+    return out
+
+def page_url(meeting_url, profile=None):
+    """Control page URL that embeds meeting_url ("https://meet.jit.si/Room" or a room name)."""
+    host, port = serve().server_address[:2]
+    parts = urlsplit(meeting_url if "://" in meeting_url else f"https://{DOMAIN}/{meeting_url}")
+    query = {"domain": parts.hostname, "room": parts.path.strip("/"),
+             "config": json.dumps(config_overwrite(profile), separators=(",", ":"))}
+    return f"http://{host}:{port}/?" + urlencode(query)
+
+# ----------------------------------------------------------------------
+# 🎛️ CONTROL CHANNEL
+# ----------------------------------------------------------------------
+class MeetControl:
+    """One window's control page over a persistent CDP channel (Selenium calls when there is none)."""
+
+    def __init__(self, driver, label="", on_event=None):
+        self.driver = driver
+        self.label = label
+        self.on_event = on_event
+        self.ctl = cdp_channel.backend(driver)
+        self.live = self.ctl.name == "cdp"
+        self.joined = threading.Event()
+        self.state = {}
+        if self.live:
+            self.ctl.on("Runtime.bindingCalled", self._called)
+            self.ctl.channel.send("Runtime.addBinding", {"name": BINDING})
+            self.ctl.attach_frames(init_scripts.sources(driver))
+
+    def _called(self, p):
+        if p.get("name") != BINDING:
+            return
+        ev = json.loads(p["payload"])
+        kind, data = ev["type"], ev["data"] or {}
+        if kind == "videoConferenceJoined":
+            self.joined.set()
+            print(f"🟢 [{self.label}] In the meeting (IFrame API)")
+        elif kind in ("videoConferenceLeft", "readyToClose"):
+            self.joined.clear()
+        elif kind in ("audioMuteStatusChanged", "videoMuteStatusChanged"):
+            self.state["audio_muted" if kind.startswith("audio") else "video_muted"] = data.get("muted")
+        elif kind in ("cameraError", "micError", "errorOccurred"):
+            print(f"⚠️ [{self.label}] {kind}: {data.get('message') or data.get('name') or data}")
+        if self.on_event:
+            try:
+                self.on_event(kind, data)
+            except Exception as e:
+                print(f"⚠️ on_event failed: {e}")
+
+    def call(self, expr, timeout=COMMAND_TIMEOUT):
+        """Evaluate expr on the control page (promises awaited); returns (value, ms)."""
+        t0 = time.perf_counter()
+        value = self.ctl.evaluate(expr, await_promise=True, timeout=timeout)
+        return value, (time.perf_counter() - t0) * 1000
+
+    def in_meeting(self, expr, await_promise=False, timeout=COMMAND_TIMEOUT):
+        """
+        Evaluate expr inside the embedded meeting frame, where Jitsi's own
+        window (APP, _cbPCs from the init scripts) lives. The control page
+        itself has no peer connections. Needs the DevTools channel: only
+        it puts the init scripts into the frame.
+        """
+        if not self.live:
+            raise cdp_channel.CDPError("the meeting frame is only reachable over the DevTools channel")
+        # the newest attached iframe is the current meeting (a rejoin makes a new one)
+        frames = list(self.ctl.oopifs) or self.ctl.child_frames()
+        if not frames:
+            raise cdp_channel.CDPError("no meeting frame on the control page")
+        return self.ctl.evaluate(expr, frames[-1], await_promise, timeout)
+
+    def command(self, name, *args):
+        ok, ms = self.call(f"_cb.cmd({json.dumps(name)}, {json.dumps(list(args))})")
+        print(f"🎛️ [{self.label}] {name} in {ms:.0f} ms" + ("" if ok else " (not in a meeting)"))
+        return ok
+
+    def join(self, name):
+        ok, _ = self.call(f"_cb.join({json.dumps(name)})")
+        return bool(ok)
+
+    def is_joined(self):
+        if self.live:
+            return self.joined.is_set()
+        return bool(self.call("_cb.joined")[0])
+
+    def toggle_audio(self):
+        return self.command("toggleAudio")
+
+    def toggle_video(self):
+        return self.command("toggleVideo")
+
+    def hangup(self, timeout=1.5):
+        _, ms = self.call(f"_cb.hangup({int(timeout * 1000)})", timeout + 2)
+        print(f"🎛️ [{self.label}] hangup in {ms:.0f} ms")
+
+    def switch_camera(self, camera, registry=None):
+        """Move the meeting's video to camera ("/dev/videoN" or index); returns its label or None."""
+        spec = (registry or camera_registry.REGISTRY).match_spec(camera)
+        label, ms = self.call(f"_cb.switchCamera({json.dumps(spec)})")
+        print(f"🎛️ [{self.label}] camera → {label or 'no match'} in {ms:.0f} ms")
+        return label
+
+    def stats(self):
+        stats, ms = self.call("_cb.stats()")
+        return dict(stats or {}, ms=round(ms, 1))
+
+    def close(self):
+        self.ctl.close()
+
+# ----------------------------------------------------------------------
+# 🪟 PER-WINDOW REGISTRY
+# ----------------------------------------------------------------------
+def attach(driver, label="", on_event=None):
+    """Open the control channel for the current window (once the control page has loaded)."""
+    controls = driver.__dict__.setdefault("cb_controls", {})
+    old = controls.pop(driver.current_window_handle, None)
+    if old:
+        old.close()
+    control = controls[driver.current_window_handle] = MeetControl(driver, label, on_event)
+    return control
+
+def get(driver):
+    """The current window's MeetControl, or None when it is not in IFrame API mode."""
+    try:
+        return driver.__dict__.get("cb_controls", {}).get(driver.current_window_handle)
+    except Exception:
+        return None
+
+def detach(driver):
+    control = driver.__dict__.get("cb_controls", {}).pop(driver.current_window_handle, None)
+    if control:
+        control.close()
+
+def detach_all(driver):
+    for control in driver.__dict__.pop("cb_controls", {}).values():
+        control.close()
@@ -0,0 +1,346 @@
+# ============================================================
+# CareBridge — Meeting profiles for join_meeting_instance
+#   default   → Jitsi as shipped (all tiles, full resolution)
+#   low_power → audio-first: only the active speaker's video at
+#               low resolution, no filmstrip / background effects,
+#               automatic audio-only fallback under loss or CPU load
+#
+# Compare the profiles on the Pi:
+#   python3 meeting_profiles.py https://meet.jit.si/SomeRoom --seconds 60
+# ============================================================
+
+import os, json, time
+from urllib.parse import quote
+
+from proc_stats import TreeSampler, driver_root_pid, format_summary
+import init_scripts
+
+# ----------------------------------------------------------------------
+# ⚙️ PROFILES
+# ----------------------------------------------------------------------
+# url_config → Jitsi "#config.x=y" overrides appended to the meeting URL
+# chrome_args → extra Chromium switches
+# receive_height → cap on incoming video height, set once in the call (None = Jitsi's own)
+# fallback   → audio-only trigger (None = never fall back)
+PROFILES = {
+    "default": {
+        "url_config": {},
+        "chrome_args": [],
+        "receive_height": None,
+        "fallback": None,
+    },
+    "low_power": {
+        "url_config": {
+            "config.channelLastN": 1,                      # receive only the active speaker
+            "config.disableTileView": True,
+            "config.filmstrip.disabled": True,
+            "config.disableSelfView": True,
+            "config.disableVirtualBackground": True,
+            "config.disableAudioLevels": True,
+            "config.enableNoisyMicDetection": False,
+            "config.resolution": 180,
+            "config.constraints.video.height.ideal": 180,
+            "config.constraints.video.height.max": 180,
+            "config.constraints.video.frameRate.max": 15,
+        },
+        "chrome_args": [
+            "--disable-features=MediaRouter",          # no Cast device discovery
+            "--disable-background-networking",
+        ],
+        # the constraints above only shape what we send; this limits what the bridge sends us
+        "receive_height": 180,
+        "fallback": {
+            "loss_pct": 8.0,     # inbound packet loss over one interval
+            "cpu_pct": 85.0,     # Chromium tree CPU, % of ALL cores (a 4-core Pi = 400 % summed)
+            "hold_s": 20,        # condition must persist this long
+        },
+    },
+}
+
+CHECK_INTERVAL = 2.0
+
+def get_profile(name):
+    """Return the profile dict, falling back to default for unknown names."""
+    if name not in PROFILES:
+        print(f"⚠️ Unknown meeting profile '{name}' — using default")
+        name = "default"
+    return dict(PROFILES[name], name=name)
+
+def profile_url(meeting_url, profile, extra=None):
+    """Append the profile's Jitsi config overrides to the URL fragment."""
+    overrides = dict(profile["url_config"], **(extra or {}))
+    if not overrides:
+        return meeting_url
+    frag = "&".join(f"{k}={quote(json.dumps(v))}" for k, v in overrides.items())
+    sep = "&" if "#" in meeting_url else "#"
+    return meeting_url + sep + frag
+
+def apply_chrome_args(chrome_options, profile):
+    for a in profile["chrome_args"]:
+        chrome_options.add_argument(a)
+
+# ----------------------------------------------------------------------
+# 🧩 IN-PAGE HELPERS
+# ----------------------------------------------------------------------
+# Installed before the page loads so every RTCPeerConnection Jitsi opens
+# is kept in window._cbPCs for stats collection.
+RTC_HOOK_JS = """
+(function () {
+  if (window._cbPCs) return;
+  window._cbPCs = [];
+  const Orig = window.RTCPeerConnection;
+  if (!Orig) return;
+  function Hooked(...args) {
+    const pc = new Orig(...args);
+    window._cbPCs.push(pc);
+    pc.addEventListener('connectionstatechange', () => {
+      if (pc.connectionState === 'closed')
+        window._cbPCs = window._cbPCs.filter(p => p !== pc);
+    });
+    return pc;
+  }
+  Hooked.prototype = Orig.prototype;
+  Object.setPrototypeOf(Hooked, Orig);
+  window.RTCPeerConnection = Hooked;
+})();
+"""
+
+# The helpers below are expressions, so they run the same way in the top
+# document (wrapped by async_script) and inside the IFrame API meeting
+# frame (meet_control.MeetControl.in_meeting), where Jitsi's own window lives.
+
+# Inbound packet-loss % since the previous call.
+LOSS_JS = """
+Promise.all((window._cbPCs || []).map(pc => pc.getStats())).then(reports => {
+  let lost = 0, recv = 0;
+  reports.forEach(r => r.forEach(s => {
+    if (s.type === 'inbound-rtp') { lost += s.packetsLost || 0; recv += s.packetsReceived || 0; }
+  }));
+  const prev = window._cbLossPrev || {lost: 0, recv: 0};
+  window._cbLossPrev = {lost: lost, recv: recv};
+  const dl = lost - prev.lost, dr = recv - prev.recv;
+  return dl + dr > 0 ? 100 * dl / (dl + dr) : 0;
+}).catch(() => null)
+"""
+
+# Cumulative uplink bytes and video encoder work across all connections.
+OUTBOUND_JS = """
+Promise.all((window._cbPCs || []).map(pc => pc.getStats())).then(reports => {
+  let bytes = 0, frames = 0, encodeTime = 0;
+  reports.forEach(r => r.forEach(s => {
+    if (s.type !== 'outbound-rtp') return;
+    bytes += s.bytesSent || 0;
+    if (s.kind === 'video') { frames += s.framesEncoded || 0; encodeTime += s.totalEncodeTime || 0; }
+  }));
+  return {bytes: bytes, frames: frames, encodeTime: encodeTime};
+}).catch(() => null)
+"""
+
+AUDIO_ONLY_JS = """
+(() => {
+  if (!(window.APP && APP.store)) return false;
+  APP.store.dispatch({type: 'SET_AUDIO_ONLY', audioOnly: true});
+  return true;
+})()
+"""
+
+# Preferred receive quality, as Jitsi's own video-quality slider sets it
+# (the bridge then sends no stream above this height).
+RECEIVE_JS = """
+((height) => {
+  if (!(window.APP && APP.store)) return false;
+  APP.store.dispatch({type: 'SET_PREFERRED_VIDEO_QUALITY', preferredVideoQuality: height});
+  return true;
+})(%d)
+"""
+
+def async_script(expr):
+    """One of the expressions above as a WebDriver async script (spliced in, no in-page eval)."""
+    return ("const done = arguments[arguments.length - 1];\n"
+            f"Promise.resolve({expr}\n).then(done, () => done(null));")
+
+def install_rtc_hook(driver):
+    """Register RTC_HOOK_JS for every new document (call before driver.get)."""
+    try:
+        init_scripts.add(driver, RTC_HOOK_JS)
+    except Exception as e:
+        print(f"⚠️ RTC hook not installed: {e}")
+
+# ----------------------------------------------------------------------
+# 🐕 WATCHDOG — measurement + audio-only fallback
+# ----------------------------------------------------------------------
+class ProfileWatchdog:
+    """Call tick() from the meeting loop; report() when leaving."""
+
+    def __init__(self, driver, profile, name):
+        self.driver = driver
+        self.profile = profile
+        self.name = name
+        self.sampler = TreeSampler(driver_root_pid(driver))
+        self.audio_only = False
+        self.receive_limited = not profile.get("receive_height")
+        self.cores = os.cpu_count() or 1
+        self._frame_warned = False
+        self._start = time.monotonic()
+        self._next = self._start
+        self._bad_since = None
+
+    def due(self):
+        return time.monotonic() >= self._next
+
+    def tick(self):
+        now = time.monotonic()
+        if now < self._next:
+            return
+        self._next = now + CHECK_INTERVAL
+        usage = self.sampler.sample()
+        if not self.receive_limited:
+            self._limit_receive()
+        fb = self.profile["fallback"]
+        if not fb or self.audio_only or usage is None:
+            return
+
+        loss = self._page(LOSS_JS)
+        cpu = usage[0] / self.cores
+        if cpu >= fb["cpu_pct"] or (loss is not None and loss >= fb["loss_pct"]):
+            self._bad_since = self._bad_since or now
+            if now - self._bad_since >= fb["hold_s"]:
+                self._fall_back(cpu, loss)
+        else:
+            self._bad_since = None
+
+    def _limit_receive(self):
+        """Cap incoming video once Jitsi is up (retried every check until it is)."""
+        height = self.profile["receive_height"]
+        control = self._control()
+        if control:
+            if not control.is_joined():
+                return
+            self.receive_limited = bool(control.command("setVideoQuality", height))
+        else:
+            self.receive_limited = bool(self._page(RECEIVE_JS % height))
+        if self.receive_limited:
+            print(f"📺 [{self.name}] Receiving video at ≤ {height}p")
+
+    def _fall_back(self, cpu, loss):
+        print(f"📉 [{self.name}] CPU {cpu:.0f}% of {self.cores} cores / loss {loss if loss is not None else '?'}% — switching to audio-only")
+        control = self._control()
+        try:
+            self.audio_only = bool(self._page(AUDIO_ONLY_JS, strict=True))
+        except Exception as e:
+            print(f"⚠️ Audio-only switch failed: {str(e).splitlines()[0]}")
+        if not self.audio_only and control:
+            # the meeting frame is out of reach: cut our video through the IFrame API instead
+            try:
+                control.command("setVideoQuality", 180)
+                if not control.state.get("video_muted"):
+                    control.toggle_video()
+                self.audio_only = True
+            except Exception as e:
+                print(f"⚠️ IFrame API video fallback failed: {str(e).splitlines()[0]}")
+        if not self.audio_only:
+            # don't retry every interval if the page doesn't expose APP
+            self.profile = dict(self.profile, fallback=None)
+
+    def _control(self):
+        """The window's IFrame API control, when the meeting is embedded in meet_control's page."""
+        import meet_control
+        return meet_control.get(self.driver)
+
+    def _page(self, expr, strict=False):
+        """
+        Evaluate one of the in-page expressions where Jitsi runs: the top
+        document, or the meeting frame under an IFrame API control page.
+        Errors give None (raised with strict).
+        """
+        control = self._control()
+        try:
+            if control:
+                return control.in_meeting(expr, await_promise=True)
+            return self.driver.execute_async_script(async_script(expr))
+        except Exception as e:
+            if strict:
+                raise
+            if control and not self._frame_warned:
+                self._frame_warned = True
+                print(f"🚨 [{self.name}] Cannot reach the meeting frame behind the control page "
+                      f"({str(e).splitlines()[0]}) — loss checks and uplink stats are off for this call")
+            return None
+
+    def report(self):
+        s = self.sampler.summary()
+        label = f"[{self.name}] profile={self.profile['name']}" + (" (fell back to audio-only)" if self.audio_only else "")
+        print(format_summary(label, s))
+        s.update(self.uplink())
+        if "uplink_kbps" in s:
+            print(f"📡 [{self.name}] uplink avg {s['uplink_kbps']:.0f} kbps, video encode "
+                  f"{s['encode_ms']:.1f} ms/frame ({s['encode_load']:.0f}% of one core)")
+        return s
+
+    def uplink(self):
+        """Average uplink kbps and video encoder cost since the watchdog started."""
+        out = self._page(OUTBOUND_JS)
+        elapsed = time.monotonic() - self._start
+        if not out or elapsed <= 0:
+            return {}
+        return {
+            "uplink_kbps": out["bytes"] * 8 / 1000 / elapsed,
+            "encode_ms": 1000 * out["encodeTime"] / out["frames"] if out["frames"] else 0.0,
+            "encode_load": 100 * out["encodeTime"] / elapsed,
+        }
+
+# ----------------------------------------------------------------------
+# 🧪 PROFILE COMPARISON
+# ----------------------------------------------------------------------
+def compare(meeting_url, names, seconds, camera=None):
+    """Join meeting_url once per profile and print CPU % / RSS for each."""
+    import os
+    from shutil import which
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+
+    os.environ["SELENIUM_MANAGER_DISABLE"] = "1"
+    results = {}
+    for pname in names:
+        profile = get_profile(pname)
+        opts = Options()
+        opts.binary_location = "/usr/bin/chromium-browser"
+        for a in ["--start-fullscreen", "--noerrdialogs", "--autoplay-policy=no-user-gesture-required",
+                  "--use-fake-ui-for-media-stream", "--no-sandbox"]:
+            opts.add_argument(a)
+        if camera:
+            opts.add_argument(f"--video-input-device={camera}")
+        apply_chrome_args(opts, profile)
+        driver = webdriver.Chrome(service=Service(which("chromedriver") or "/usr/bin/chromedriver"), options=opts)
+        try:
+            install_rtc_hook(driver)
+            # skip the pre-join screen so the measurement covers an actual call
+            driver.get(profile_url(meeting_url, profile, {
+                "config.prejoinConfig.enabled": False,
+                "userInfo.displayName": f"CareBridge {pname}",
+            }))
+            dog = ProfileWatchdog(driver, profile, "bench")
+            end = time.monotonic() + seconds
+            while time.monotonic() < end:
+                dog.tick()
+                time.sleep(0.2)
+            results[pname] = dog.report()
+        finally:
+            driver.quit()
+        time.sleep(3)
+
+    print("\n=== PROFILE COMPARISON ===")
+    for pname, s in results.items():
+        print(f"  {pname:<10} CPU avg {s['cpu_avg']:6.1f}%   RSS avg {s['rss_avg']:6.0f} MB   RSS peak {s['rss_peak']:6.0f} MB")
+    return results
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Compare CPU/RSS of meeting profiles")
+    ap.add_argument("url")
+    ap.add_argument("--profiles", default="default,low_power")
+    ap.add_argument("--seconds", type=int, default=60)
+    ap.add_argument("--camera", default=None)
+    args = ap.parse_args()
+    compare(args.url, args.profiles.split(","), args.seconds, args.camera)
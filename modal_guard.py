@@ -0,0 +1,169 @@
+# ============================================================
+# CareBridge — In-page blocking-dialog dismisser
+# dismiss_auth_or_recover_modal() looked for a "Recover password"
+# box twice, right after page load, with two XPath scans each time.
+# Anything that popped up later — a permission prompt, "are you
+# still there?", the end-of-call feedback form — sat on top of the
+# meeting until someone walked over to the panel.
+#
+# start() registers GUARD_JS for every new document in the window.
+# A MutationObserver inside the page checks each dialog that is
+# added (or opened) against RULES and clicks its dismiss button at
+# once. Each dismissal is pushed to Python through a CDP binding
+# (Runtime.bindingCalled on a persistent DevTools websocket), so
+# Python never polls. Without the websocket the page still dismisses,
+# and stop() reads the page's log once at teardown.
+# ============================================================
+
+import json
+from collections import Counter
+
+import cdp_channel
+import init_scripts
+
+BINDING = "_cbModalReport"
+LOG_KEEP = 50
+
+# Containers the observer inspects; only their text is matched.
+DIALOG_SELECTOR = "[role=dialog], [role=alertdialog], [aria-modal=true], dialog[open], [class*='modal' i]"
+
+# (name, text regex, dismiss-button label regex), case-insensitive, first match wins
+RULES = [
+    ("recover password",
+     r"recover password|reset your password|forgot (your )?password",
+     r"^(cancel|close|not now)$"),
+    ("permission prompt",
+     r"\b(allow|grant|enable|blocked)\b.{0,60}\b(camera|microphone|mic)\b|permissions? (needed|required|denied)",
+     r"^(ok|okay|got it|allow|continue|close|dismiss|not now)$"),
+    ("still there",
+     r"are you still (there|here|in the meeting)|still with us\?",
+     r"^(yes|i'?m (still )?here|stay|stay in (the )?meeting|continue|keep me in)"),
+    ("feedback",
+     r"how was (your|the|this) (call|meeting|audio|video)|rate (your|the|this) (call|meeting|experience)"
+     r"|(share|give|send) (us )?(your )?feedback",
+     r"^(skip|close|cancel|not now|no,? thanks|dismiss|maybe later)$"),
+]
+
+GUARD_JS = """
+(() => {
+  if (window._cbModalGuard) return;
+  window._cbModalGuard = true;
+  const RULES = %s.map(r => ({name: r[0], text: new RegExp(r[1], 'i'), button: new RegExp(r[2], 'i')}));
+  const DIALOGS = %s;
+  const BUTTONS = "button, [role=button], a[href], input[type=button], input[type=submit]";
+  const done = new WeakSet();
+  const log = window._cbModalLog = window._cbModalLog || [];
+  const shown = el => el.isConnected && el.getClientRects().length > 0;
+  const label = el => (el.innerText || el.value || el.getAttribute('aria-label') || el.title || '')
+                        .trim().replace(/\\s+/g, ' ');
+  function report(entry) {
+    log.push(entry);
+    if (log.length > %d) log.shift();
+    try { if (typeof window.%s === 'function') window.%s(JSON.stringify(entry)); } catch (e) {}
+  }
+  function dismiss(dlg) {
+    if (done.has(dlg) || !shown(dlg)) return;
+    const text = (dlg.innerText || '').slice(0, 2000);
+    const rule = RULES.find(r => r.text.test(text));
+    if (!rule) return;
+    done.add(dlg);
+    const btns = Array.from(dlg.querySelectorAll(BUTTONS)).filter(shown);
+    const btn = btns.find(b => rule.button.test(label(b))) ||
+                btns.find(b => /close|dismiss/i.test((b.getAttribute('aria-label') || '') + ' ' + (b.getAttribute('class') || '')));
+    let how = 'Escape';
+    if (btn) {
+      btn.click();
+      how = 'clicked ' + (label(btn) || 'close').slice(0, 40);
+    } else {
+      (document.activeElement || document.body || document).dispatchEvent(
+        new KeyboardEvent('keydown', {key: 'Escape', code: 'Escape', keyCode: 27, bubbles: true}));
+    }
+    report({rule: rule.name, how: how, text: text.trim().replace(/\\s+/g, ' ').slice(0, 120),
+            url: location.href, t: Date.now()});
+  }
+  function collect(node, found) {
+    if (!node || node.nodeType !== 1) return;
+    const d = node.closest(DIALOGS);
+    if (d) found.add(d);
+    for (const el of node.querySelectorAll(DIALOGS)) found.add(el);
+  }
+  new MutationObserver(muts => {
+    const found = new Set();
+    for (const m of muts) {
+      if (m.type === 'attributes') collect(m.target, found);
+      else for (const n of m.addedNodes) collect(n.nodeType === 1 ? n : n.parentElement, found);
+    }
+    found.forEach(dismiss);
+  }).observe(document, {childList: true, subtree: true, attributes: true,
+                        attributeFilter: ['open', 'aria-hidden', 'aria-modal', 'role']});
+  const first = () => { const found = new Set(); collect(document.documentElement, found); found.forEach(dismiss); };
+  if (document.readyState === 'loading') document.addEventListener('DOMContentLoaded', first);
+  else first();
+})();
+""" % (json.dumps(RULES), json.dumps(DIALOG_SELECTOR), LOG_KEEP, BINDING, BINDING)
+
+# ----------------------------------------------------------------------
+# 🛡️ GUARD
+# ----------------------------------------------------------------------
+class ModalGuard:
+    """The dismisser for one window; on_dismiss(entry) is called for every dialog it closes."""
+
+    def __init__(self, driver, label="", on_dismiss=None):
+        self.driver = driver
+        self.label = label
+        self.on_dismiss = on_dismiss
+        self.handle = driver.current_window_handle
+        self.dismissed = []
+        self.ctl = None
+        init_scripts.add(driver, GUARD_JS)
+        ctl = cdp_channel.backend(driver)
+        if ctl.name == "cdp":
+            ctl.on("Runtime.bindingCalled", self._called)
+            ctl.channel.send("Runtime.addBinding", {"name": BINDING})
+            self.ctl = ctl
+        try:
+            # a page that is already loaded (e.g. after a reattach) is guarded from now on
+            driver.execute_script(GUARD_JS)
+        except Exception:
+            pass
+
+    def _called(self, p):
+        if p.get("name") == BINDING:
+            self._note(json.loads(p["payload"]))
+
+    def _note(self, entry):
+        self.dismissed.append(entry)
+        print(f"🛡️ [{self.label}] Dismissed '{entry['rule']}' dialog ({entry['how']})")
+        if self.on_dismiss:
+            try:
+                self.on_dismiss(entry)
+            except Exception as e:
+                print(f"⚠️ on_dismiss failed: {e}")
+
+    def close(self):
+        if self.ctl:
+            self.ctl.close()
+            self.ctl = None
+        else:
+            # no live channel: pick up what the page handled on its own, once
+            try:
+                self.driver.switch_to.window(self.handle)
+                for entry in self.driver.execute_script("return window._cbModalLog || [];"):
+                    self._note(entry)
+            except Exception:
+                pass
+        if self.dismissed:
+            counts = Counter(e["rule"] for e in self.dismissed)
+            print(f"🛡️ [{self.label}] {len(self.dismissed)} blocking dialog(s) dismissed: "
+                  + ", ".join(f"{n}× {rule}" for rule, n in counts.items()))
+
+def start(driver, label="", on_dismiss=None):
+    """Guard the current window for the rest of the session (call before the meeting page loads)."""
+    guard = ModalGuard(driver, label, on_dismiss)
+    driver.__dict__.setdefault("cb_modal_guards", []).append(guard)
+    return guard
+
+def stop(driver):
+    """Close every guard start() put on this driver and print what each dismissed."""
+    for guard in driver.__dict__.pop("cb_modal_guards", []):
+        guard.close()
@@ -0,0 +1,227 @@
+# ============================================================
+# CareBridge — Connection prewarming before a likely join
+# The first driver.get(meeting_url) used to pay Chromium launch,
+# DNS, TCP and TLS from cold. When a join becomes likely —
+#   • the panel is idle-ready (boot, or a meeting just ended)
+#   • a scheduled meeting is PREWARM_LEAD_S away
+#   • the first RING of an incoming call
+# — the Standby pool launches the slot's Chromium and parks it on a
+# tiny page of the meeting's own site (HINT_PATH, through asset_proxy
+# when it runs). Chromium partitions sockets by top-level site, so
+# hints inserted on about:blank (an opaque origin) would never be
+# reused; from a same-site page the dns-prefetch / preconnect hints
+# land in the partition the meeting navigation uses. For HINT_WINDOW_S
+# after a trigger a timer thread re-inserts them every HINT_REFRESH_S;
+# after that the sockets are left to expire, so an idle panel does not
+# keep handshaking with the meeting servers over a metered uplink.
+# A browser that left a call cleanly comes back via give_back().
+# Python-side it resolves the hosts and, if asset_proxy runs, fills
+# its upstream connection pool.
+# ============================================================
+
+import time, socket, threading
+from urllib.parse import urlsplit
+
+import asset_proxy
+import browser_profiles
+import chromium_session
+
+PREWARM_LEAD_S = 120       # how early before a scheduled meeting
+HINT_REFRESH_S = 8         # Chromium drops unused preconnected sockets after ~10 s
+HINT_WINDOW_S = 120        # keep them hot this long after a trigger, then let them go
+HINT_PATH = "/robots.txt"  # small static page on the meeting host to park standbys on
+TAKE_WAIT_S = 20           # a launch already in progress is worth waiting for
+
+# hosts each meeting page talks to besides its own origin
+EXTRA_HOSTS = {
+    "meet.jit.si": ["web-cdn.jitsi.net"],
+    "web.webex.com": ["binaries.webex.com"],
+}
+
+# ----------------------------------------------------------------------
+# 🌐 HOSTS & HINTS
+# ----------------------------------------------------------------------
+def hosts_for(url):
+    host = urlsplit(url).hostname
+    return [host] + EXTRA_HOSTS.get(host, []) if host else []
+
+def resolve(hosts):
+    """Resolve hosts now so a caching resolver (if any) answers the browser instantly."""
+    for h in hosts:
+        try:
+            socket.getaddrinfo(h, 443, proto=socket.IPPROTO_TCP)
+        except OSError as e:
+            print(f"⚠️ DNS prewarm for {h} failed: {e}")
+
+# (Re)insert the hints; a fresh <link> makes Chromium preconnect again.
+PRECONNECT_JS = """
+document.querySelectorAll('link[data-cb-hint]').forEach(l => l.remove());
+for (const h of arguments[0]) {
+  for (const [rel, cors] of [['dns-prefetch', false], ['preconnect', false], ['preconnect', true]]) {
+    const l = document.createElement('link');
+    l.rel = rel; l.href = 'https://' + h; l.dataset.cbHint = '1';
+    if (cors) l.crossOrigin = 'anonymous';
+    document.head.appendChild(l);
+  }
+}
+"""
+
+def hint_page(url):
+    """Same-site page to insert the hints from (via the asset proxy if it is running)."""
+    parts = urlsplit(url)
+    return asset_proxy.proxied_url(f"{parts.scheme}://{parts.netloc}{HINT_PATH}")
+
+def preconnect(driver, hosts, page=None):
+    """Insert the hints, first moving the window to page if it is elsewhere."""
+    if page and driver.current_url != page:
+        driver.get(page)
+    driver.execute_script(PRECONNECT_JS, hosts)
+
+# ----------------------------------------------------------------------
+# 🔥 STANDBY BROWSERS
+# ----------------------------------------------------------------------
+class Standby:
+    """
+    One prewarmed Chromium per profile slot.
+    launch_fn(slot) → driver builds and starts it (same options a join uses,
+    minus the camera, which is pinned per window at join time anyway).
+    """
+
+    def __init__(self, launch_fn, url):
+        self.launch_fn = launch_fn
+        self.url = url
+        self.hosts = hosts_for(url)
+        self.lock = threading.Lock()
+        self.drivers = {}          # slot → idle driver on the hint page
+        self.launching = {}        # slot → threading.Event
+        self.refreshed = {}        # slot → monotonic time of the last hint insert
+        self.hot_until = {}        # slot → monotonic time the refresh window closes
+        self.timers = []
+        self.stopped = threading.Event()
+        threading.Thread(target=self._refresh_loop, daemon=True, name="prewarm-hints").start()
+
+    def trigger(self, slots, reason):
+        """Make sure every slot has a warm browser with fresh hints."""
+        print(f"🔥 Prewarming {', '.join(slots)} ({reason})")
+        threading.Thread(target=self._warm_network, daemon=True).start()
+        for slot in slots:
+            with self.lock:
+                self.hot_until[slot] = time.monotonic() + HINT_WINDOW_S
+                driver = self.drivers.get(slot)
+                busy = slot in self.launching
+                if not driver and not busy:
+                    self.launching[slot] = threading.Event()
+            if driver:
+                self._hint_pooled(slot)
+            elif not busy:
+                threading.Thread(target=self._launch, args=(slot,), daemon=True).start()
+
+    def _warm_network(self):
+        resolve(self.hosts)
+        if asset_proxy.running():
+            asset_proxy.preconnect()
+
+    def schedule(self, when, slots):
+        """Prewarm PREWARM_LEAD_S before a meeting starting at time.time() == when."""
+        delay = max(0.0, when - time.time() - PREWARM_LEAD_S)
+        t = threading.Timer(delay, self.trigger, args=(slots, "scheduled meeting"))
+        t.daemon = True
+        t.start()
+        self.timers.append(t)
+
+    def _launch(self, slot):
+        driver = None
+        try:
+            browser_profiles.wait_warm()   # the warm-up holds the same profile
+            t0 = time.monotonic()
+            driver = self.launch_fn(slot)
+            if not self._hint(slot, driver):
+                raise RuntimeError("could not load the hint page")
+            print(f"♨️ Standby browser for slot {slot} ready in {time.monotonic() - t0:.1f} s")
+        except Exception as e:
+            print(f"⚠️ Standby browser for slot {slot} failed: {e}")
+            if driver:
+                chromium_session.close_browser(driver)
+            driver = None
+        finally:
+            with self.lock:
+                if driver:
+                    self.drivers[slot] = driver
+                self.launching.pop(slot).set()
+
+    def _hint(self, slot, driver):
+        try:
+            preconnect(driver, self.hosts, hint_page(self.url))
+            self.refreshed[slot] = time.monotonic()
+            return True
+        except Exception as e:
+            print(f"⚠️ Preconnect hints for slot {slot} failed: {str(e).splitlines()[0]}")
+            return False
+
+    def _hint_pooled(self, slot):
+        """Refresh a pooled browser's hints; a browser that no longer answers leaves the pool."""
+        with self.lock:
+            # under the lock, so take() cannot hand the browser out mid-refresh
+            driver = self.drivers.get(slot)
+            if driver is None or self._hint(slot, driver):
+                return
+            self.drivers.pop(slot, None)
+        print(f"⚠️ Standby browser for slot {slot} died — closing it")
+        chromium_session.close_browser(driver)
+
+    def _refresh_loop(self):
+        """Keep idle browsers' preconnected sockets from expiring while a join is likely."""
+        while not self.stopped.wait(1.0):
+            now = time.monotonic()
+            with self.lock:
+                for slot in [s for s, t in self.hot_until.items() if now >= t]:
+                    del self.hot_until[slot]
+                    if slot in self.drivers:
+                        print(f"💤 No join on slot {slot} — letting its preconnected sockets expire")
+                stale = [s for s in self.drivers if s in self.hot_until
+                         and now - self.refreshed.get(s, 0) >= HINT_REFRESH_S]
+            for slot in stale:
+                self._hint_pooled(slot)
+
+    def take(self, slot):
+        """Hand over the slot's warm browser (None → caller launches one)."""
+        with self.lock:
+            pending = self.launching.get(slot)
+        if pending:
+            pending.wait(TAKE_WAIT_S)
+        with self.lock:
+            driver = self.drivers.pop(slot, None)
+            self.hot_until.pop(slot, None)
+        if driver is None:
+            return None
+        if getattr(driver, "cb_over_limit", None):
+            print(f"🐘 Standby browser for slot {slot} is over its limits — launching fresh")
+            chromium_session.close_browser(driver)
+            return None
+        try:
+            if time.monotonic() - self.refreshed.get(slot, 0) > HINT_REFRESH_S:
+                preconnect(driver, self.hosts, hint_page(self.url))
+        except Exception:
+            print(f"⚠️ Standby browser for slot {slot} died — launching fresh")
+            chromium_session.close_browser(driver)
+            return None
+        print(f"♨️ Using prewarmed browser for slot {slot}")
+        return driver
+
+    def give_back(self, slot, driver):
+        """Return a recycled browser (on about:blank) to the pool; it moves to the hint page."""
+        with self.lock:
+            old = self.drivers.get(slot)
+            self.drivers[slot] = driver
+        if old:
+            chromium_session.close_browser(old)
+        self._hint_pooled(slot)
+
+    def close(self):
+        self.stopped.set()
+        for t in self.timers:
+            t.cancel()
+        with self.lock:
+            drivers, self.drivers = list(self.drivers.values()), {}
+        for d in drivers:
+            chromium_session.close_browser(d)
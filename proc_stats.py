@@ -0,0 +1,114 @@
+# ============================================================
+# CareBridge — Process-tree CPU / RSS sampling via /proc
+# Used to measure what each Chromium session costs on the Pi
+# (no psutil needed — plain /proc reads).
+# ============================================================
+
+import os, time
+
+CLK_TCK   = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+# ----------------------------------------------------------------------
+# 📂 /proc READERS
+# ----------------------------------------------------------------------
+def read_stat(pid):
+    """Return (ppid, cpu_ticks, rss_bytes) for one process."""
+    with open(f"/proc/{pid}/stat") as f:
+        data = f.read()
+    # comm may contain spaces/brackets — fields start after the last ')'
+    rest = data[data.rindex(")") + 2:].split()
+    ppid = int(rest[1])
+    ticks = int(rest[11]) + int(rest[12])      # utime + stime
+    rss = int(rest[21]) * PAGE_SIZE
+    return ppid, ticks, rss
+
+def children_map():
+    """Map ppid → [child pids] for every live process."""
+    kids = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            ppid = read_stat(int(entry))[0]
+        except (OSError, ValueError, IndexError):
+            continue
+        kids.setdefault(ppid, []).append(int(entry))
+    return kids
+
+def process_tree(root_pid):
+    """Return root_pid plus all of its descendants."""
+    kids = children_map()
+    tree = [root_pid]
+    i = 0
+    while i < len(tree):
+        tree.extend(kids.get(tree[i], []))
+        i += 1
+    return tree
+
+def tree_usage(pids):
+    """Sum (cpu_ticks, rss_bytes) over pids, skipping ones that exited."""
+    ticks = rss = 0
+    for pid in pids:
+        try:
+            _, t, r = read_stat(pid)
+        except (OSError, ValueError, IndexError):
+            continue
+        ticks += t
+        rss += r
+    return ticks, rss
+
+def driver_root_pid(driver):
+    """
+    PID of the chromedriver process — Chromium runs underneath it — or of
+    Chromium itself when it was launched detached (chromium_session.launch_detached).
+    """
+    if getattr(driver, "browser_pid", None):
+        return driver.browser_pid
+    try:
+        return driver.service.process.pid
+    except Exception:
+        return None
+
+# ----------------------------------------------------------------------
+# 📊 SAMPLER
+# ----------------------------------------------------------------------
+class TreeSampler:
+    """Samples CPU % (summed over cores) and RSS of a process tree."""
+
+    def __init__(self, root_pid):
+        self.root_pid = root_pid
+        self.samples = []          # (cpu_percent, rss_mb)
+        self._last = None
+
+    def sample(self):
+        """Take one sample; returns (cpu_percent, rss_mb) or None on the first call."""
+        ticks, rss = tree_usage(process_tree(self.root_pid))
+        now = time.monotonic()
+        result = None
+        if self._last:
+            dt = now - self._last[0]
+            if dt > 0:
+                cpu = (ticks - self._last[1]) / CLK_TCK / dt * 100.0
+                result = (cpu, rss / 1048576)
+                self.samples.append(result)
+        self._last = (now, ticks)
+        return result
+
+    def summary(self):
+        """Return dict with avg/peak CPU % and avg/peak RSS MB."""
+        if not self.samples:
+            return {"samples": 0, "cpu_avg": 0.0, "cpu_peak": 0.0, "rss_avg": 0.0, "rss_peak": 0.0}
+        cpus = [s[0] for s in self.samples]
+        rsss = [s[1] for s in self.samples]
+        return {
+            "samples": len(self.samples),
+            "cpu_avg": sum(cpus) / len(cpus),
+            "cpu_peak": max(cpus),
+            "rss_avg": sum(rsss) / len(rsss),
+            "rss_peak": max(rsss),
+        }
+
+def format_summary(label, s):
+    return (f"📊 {label}: CPU avg {s['cpu_avg']:.0f}% (peak {s['cpu_peak']:.0f}%), "
+            f"RSS avg {s['rss_avg']:.0f} MB (peak {s['rss_peak']:.0f} MB), {s['samples']} samples")
@@ -0,0 +1,34 @@
+# ============================================================
+# CareBridge — Meeting provider registry
+# Providers are registered by module path and imported on first
+# get(), so a panel that only joins Jitsi never loads the Webex
+# code (and vice versa):
+#   provider = providers.get("jitsi")
+#   provider.url(room, profile) / .ready / .join() / .leave() / .health()
+# See providers/base.py for the interface and providers/bench.py for
+# the shared benchmark.
+# ============================================================
+
+import importlib
+
+_MODULES = {
+    "jitsi": "providers.jitsi",
+    "jitsi_iframe": "providers.jitsi_iframe",     # Jitsi via the IFrame API (meet_control.py)
+    "webex": "providers.webex",
+}
+_loaded = {}
+
+def register(name, module):
+    """Make a provider available; module must define PROVIDER."""
+    _MODULES[name] = module
+    _loaded.pop(name, None)
+
+def names():
+    return sorted(_MODULES)
+
+def get(name):
+    if name not in _loaded:
+        if name not in _MODULES:
+            raise KeyError(f"unknown meeting provider '{name}' (have {', '.join(names())})")
+        _loaded[name] = importlib.import_module(_MODULES[name]).PROVIDER
+    return _loaded[name]
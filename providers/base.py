@@ -0,0 +1,123 @@
+# ============================================================
+# CareBridge — Meeting provider interface
+# Everything that differs between meeting services lives in one
+# Provider subclass instead of being copied into every script:
+#   launch_args()   extra Chromium flags
+#   url()           room / link → meeting URL (default: base_url + room)
+#   ready           pre-join readiness predicate (chromium_session.wait_ready)
+#   join()          pre-join routine: name, Join click (default: the first
+#                   name_selectors / join_selectors hit in prejoin_frame())
+#   joined()        "in the meeting" check; wait_joined() polls it
+#   leave()         hang up through the service's own API
+#   health()        cheap in-call probe (peer connections, joined)
+#   timeouts        tuned per service, in seconds
+# ============================================================
+
+import time
+
+import cdp_channel
+import chromium_session
+
+# Peer connections come from meeting_profiles.RTC_HOOK_JS (window._cbPCs)
+HEALTH_JS = """
+const pcs = window._cbPCs || [];
+return {pcs: pcs.length,
+        connected: pcs.filter(p => p.connectionState === 'connected').length,
+        failed: pcs.filter(p => p.connectionState === 'failed').length};
+"""
+
+class Provider:
+    name = None
+    blocklist = None           # request_blocking.BLOCKLISTS key
+    chrome_args = []
+    base_url = None            # room names are appended to this
+    ready = None               # CSS / XPath selector or callable(driver) → bool
+    name_selectors = []        # display-name field, first match wins
+    join_selectors = []        # Join button, first match wins
+    joined_js = "return false;"
+    hangup_js = None           # async script; arguments[0] = wait budget in ms
+    timeouts = {
+        "ready": 30,           # navigation → pre-join screen
+        "field": 10,           # wait for the name field
+        "join": 60,            # Join clicked → in the meeting
+        "leave": 1.5,          # hang-up acknowledgement
+    }
+
+    def launch_args(self):
+        return list(self.chrome_args)
+
+    def url(self, room, profile=None):
+        """Full link as is, otherwise a room name under base_url."""
+        if "://" in room:
+            return room
+        if not self.base_url:
+            raise ValueError(f"{self.name}: '{room}' is not a link and the provider has no base_url")
+        return self.base_url + room
+
+    def prejoin_frame(self, ctl):
+        """Frame holding the pre-join form (None = top document)."""
+        return None
+
+    def join(self, driver, name, ctl=None):
+        """Pre-join routine: wait for ready, type the name, click Join. True once Join was clicked."""
+        ctl, own = self._ctl(driver, ctl)
+        try:
+            if self.ready and not chromium_session.wait_ready(driver, self.ready, self.timeouts["ready"], ctl):
+                print("⚠️ Pre-join screen not detected — trying anyway")
+            frame = self.prejoin_frame(ctl)
+            try:
+                for selector in self.name_selectors:
+                    if ctl.wait_for(selector, self.timeouts["field"], frame) and ctl.type_text(selector, name, frame):
+                        print(f"✏️ Entered display name: {name}")
+                        break
+            except Exception as e:
+                print(f"⚠️ Name entry error: {e}")
+            for sel in self.join_selectors:
+                try:
+                    if ctl.click(sel, frame):
+                        print(f"🟢 Clicked Join using selector: {sel} ({ctl.name})")
+                        return True
+                except Exception:
+                    continue
+            print("⚠️ Join button not found — meeting may auto-join or require manual click.")
+            return False
+        finally:
+            if own:
+                ctl.close()
+
+    def _ctl(self, driver, ctl):
+        """(backend, owned) — a CDP backend is opened when the caller did not pass one."""
+        return (ctl, False) if ctl is not None else (cdp_channel.backend(driver), True)
+
+    def joined(self, driver):
+        try:
+            return bool(driver.execute_script(self.joined_js))
+        except Exception:
+            return False
+
+    def wait_joined(self, driver, timeout=None, cancel=None):
+        """Poll joined() until true (→ True), timeout or cancel (→ False)."""
+        deadline = time.monotonic() + (timeout or self.timeouts["join"])
+        while time.monotonic() < deadline:
+            if cancel is not None and cancel.is_set():
+                return False
+            if self.joined(driver):
+                return True
+            time.sleep(0.5)
+        return False
+
+    def leave(self, driver):
+        """Hang up in the current window, waiting at most timeouts["leave"] for the service."""
+        if not self.hangup_js:
+            return
+        driver.set_script_timeout(self.timeouts["leave"] + 2)
+        driver.execute_async_script(self.hangup_js, int(self.timeouts["leave"] * 1000))
+
+    def health(self, driver):
+        try:
+            h = driver.execute_script(HEALTH_JS)
+        except Exception as e:
+            return {"ok": False, "error": str(e).splitlines()[0]}
+        h["joined"] = self.joined(driver)
+        h["ok"] = h["joined"] and not h["failed"]
+        return h
@@ -0,0 +1,86 @@
+# ============================================================
+# CareBridge — Shared provider benchmark
+# Runs every provider through exactly the same steps on a fresh
+# throwaway-profile Chromium, with its own blocklist and timeouts:
+#   launch → pre-join ready → Join clicked → in meeting → hung up
+# and prints the median of each phase per provider.
+#
+#   python3 -m providers.bench jitsi=SomeRoom webex=https://meet1492.webex.com/meet/pr23680413308 --runs 3
+# ============================================================
+
+import time, statistics
+
+import providers
+import chromium_session
+import request_blocking
+import meeting_profiles
+import cdp_channel
+
+PHASES = ("launch", "ready", "join", "in_meeting", "leave")
+
+def run_once(provider, room, headless=True, name="CareBridge Bench"):
+    """One pass; returns {phase: seconds or None} plus the health probe."""
+    extra = provider.launch_args() + (["--headless=new"] if headless else [])
+    t = {}
+    t0 = time.monotonic()
+    driver = chromium_session.launch(chromium_session.build_options(extra_args=extra, load_strategy="eager"))
+    t["launch"] = time.monotonic() - t0
+    ctl = None
+    try:
+        meeting_profiles.install_rtc_hook(driver)
+        if provider.blocklist:
+            request_blocking.apply(driver, provider.blocklist)
+        ctl = cdp_channel.backend(driver)
+        t["ready"] = chromium_session.navigate(driver, provider.url(room), provider.ready,
+                                               provider.timeouts["ready"], ctl=ctl, label=provider.name)
+        t1 = time.monotonic()
+        clicked = provider.join(driver, name, ctl)
+        t["join"] = time.monotonic() - t1 if clicked else None
+        t1 = time.monotonic()
+        t["in_meeting"] = time.monotonic() - t1 if clicked and provider.wait_joined(driver) else None
+        t["health"] = provider.health(driver)
+        t1 = time.monotonic()
+        try:
+            provider.leave(driver)
+            t["leave"] = time.monotonic() - t1
+        except Exception:
+            t["leave"] = None
+    finally:
+        if ctl:
+            ctl.close()
+        driver.quit()
+    return t
+
+def bench(targets, runs=3, headless=True):
+    """targets: {provider name: room or URL}. Returns {name: [run dicts]}."""
+    results = {}
+    for pname, room in targets.items():
+        provider = providers.get(pname)
+        results[pname] = []
+        for i in range(runs):
+            try:
+                r = run_once(provider, room, headless)
+            except Exception as e:
+                print(f"⚠️ {pname} run {i + 1} failed: {e}")
+                r = {}
+            results[pname].append(r)
+            print(f"⏱️ {pname} run {i + 1}: " + ", ".join(
+                f"{p} {r[p]:.1f} s" if r.get(p) is not None else f"{p} —" for p in PHASES))
+    print(f"📊 {'provider':<8} " + " ".join(f"{p:>11}" for p in PHASES) + "   ok")
+    for pname, runs_ in results.items():
+        cells = []
+        for p in PHASES:
+            vals = [r[p] for r in runs_ if r.get(p) is not None]
+            cells.append(f"{statistics.median(vals):10.1f}s" if vals else f"{'—':>11}")
+        ok = sum(1 for r in runs_ if r.get("health", {}).get("ok"))
+        print(f"📊 {pname:<8} " + " ".join(cells) + f"   {ok}/{len(runs_)}")
+    return results
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Same join/leave benchmark for every meeting provider")
+    ap.add_argument("targets", nargs="+", help="provider=room-or-URL, e.g. jitsi=SomeRoom")
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--headed", action="store_true")
+    args = ap.parse_args()
+    bench(dict(t.split("=", 1) for t in args.targets), args.runs, not args.headed)
@@ -0,0 +1,53 @@
+# ============================================================
+# CareBridge — Jitsi Meet provider
+# ============================================================
+
+import meeting_profiles
+from providers.base import Provider
+
+class Jitsi(Provider):
+    name = "jitsi"
+    blocklist = "jitsi"
+    base_url = "https://meet.jit.si/"
+    ready = "//input[contains(@placeholder,'name')] | //*[@data-testid='prejoin.joinMeeting']"
+    joined_js = "return !!(window.APP && APP.conference && APP.conference.isJoined && APP.conference.isJoined());"
+    hangup_js = """
+const done = arguments[arguments.length - 1];
+let left = Promise.resolve();
+try {
+  if (window.APP && APP.conference) left = Promise.resolve(APP.conference.hangup(false));
+} catch (e) {}
+Promise.race([left.catch(() => {}), new Promise(r => setTimeout(r, arguments[0]))]).then(() => done(true));
+"""
+    timeouts = {"ready": 30, "field": 10, "join": 45, "leave": 1.5}
+
+    name_selectors = [
+        "//input[contains(@placeholder,'name')]",
+        "//input[@aria-label='Your name']",
+        "//input[@name='userName']",
+    ]
+    join_selectors = [
+        "//button[normalize-space()='Join']",
+        "//button[contains(translate(.,'ABCDEFGHIJKLMNOPQRSTUVWXYZ','abcdefghijklmnopqrstuvwxyz'),'join meeting')]",
+        "button[data-testid='prejoin.joinMeeting']",
+        "//button[contains(.,'Join')]",
+        "//div[@role='button' and contains(.,'Join')]",
+    ]
+
+    def url(self, room, profile=None):
+        """Room name or full link; the profile's config overrides go in the fragment."""
+        url = super().url(room)
+        return meeting_profiles.profile_url(url, profile) if profile else url
+
+    def prejoin_frame(self, ctl):
+        """Use the first iframe if there is one."""
+        try:
+            frames = ctl.child_frames()
+            if frames:
+                print(f"🧭 Using iframe (found {len(frames)})")
+                return frames[0]
+        except Exception as e:
+            print(f"⚠️ Frame lookup error: {e}")
+        return None
+
+PROVIDER = Jitsi()
@@ -0,0 +1,76 @@
+# ============================================================
+# CareBridge — Jitsi Meet through the IFrame API
+# Same meetings as providers/jitsi.py, but the window shows the
+# local control page from meet_control.py: no pre-join scraping,
+# and join / leave / mute / camera go through executeCommand.
+# ============================================================
+
+import time
+
+import meet_control
+from providers.jitsi import Jitsi
+
+class JitsiIframe(Jitsi):
+    name = "jitsi_iframe"
+    ready = "body[data-cb-state='ready']"
+    joined_js = "return !!(window._cb && _cb.joined);"
+    hangup_js = """
+const done = arguments[arguments.length - 1];
+(window._cb ? _cb.hangup(arguments[0]) : Promise.resolve()).then(() => done(true), () => done(false));
+"""
+    timeouts = {"ready": 20, "field": 10, "join": 45, "leave": 1.5}
+    name_selectors = []
+    join_selectors = []
+
+    def url(self, room, profile=None):
+        return meet_control.page_url(super().url(room), profile)
+
+    def join(self, driver, name, ctl=None):
+        """Create the IFrame API meeting with the display name set; there is no pre-join screen."""
+        control = meet_control.attach(driver, name)
+        joined = control.join(name)
+        print(f"🟢 Joining via IFrame API ({'CDP events' if control.live else 'Selenium'})")
+        return joined
+
+    def joined(self, driver):
+        control = meet_control.get(driver)
+        if control is None:
+            return super().joined(driver)
+        try:
+            return control.is_joined()
+        except Exception:
+            return False
+
+    def wait_joined(self, driver, timeout=None, cancel=None):
+        control = meet_control.get(driver)
+        if control is None or not control.live:
+            return super().wait_joined(driver, timeout, cancel)
+        deadline = time.monotonic() + (timeout or self.timeouts["join"])
+        while time.monotonic() < deadline:
+            if cancel is not None and cancel.is_set():
+                return False
+            if control.joined.wait(min(0.5, max(0.0, deadline - time.monotonic()))):
+                return True
+        return False
+
+    def leave(self, driver):
+        control = meet_control.get(driver)
+        if control is None:
+            return super().leave(driver)
+        try:
+            control.hangup(self.timeouts["leave"])
+        finally:
+            meet_control.detach(driver)
+
+    def health(self, driver):
+        control = meet_control.get(driver)
+        if control is None:
+            return super().health(driver)
+        try:
+            h = control.stats()
+        except Exception as e:
+            return {"ok": False, "error": str(e).splitlines()[0]}
+        h["ok"] = bool(h.get("joined"))
+        return h
+
+PROVIDER = JitsiIframe()
@@ -0,0 +1,167 @@
+# ============================================================
+# CareBridge — Block non-essential meeting-page requests
+# Analytics, welcome-page imagery, web fonts and third-party
+# scripts cost a Pi bandwidth, parse time and memory without
+# helping the call. A per-provider URL blocklist is applied with
+# CDP Network.setBlockedURLs before the page loads. Chromedriver's
+# performance log carries the Network events, so every join can
+# report how many requests were blocked and what was loaded.
+#
+# Compare against an unblocked baseline (headless, cold profile):
+#   python3 request_blocking.py https://meet.jit.si/SomeRoom --provider jitsi --runs 2
+# ============================================================
+
+import json, time
+from urllib.parse import urlsplit
+
+# Network.setBlockedURLs patterns ("*" wildcard)
+BLOCKLISTS = {
+    "jitsi": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*amplitude.com*",
+        "*callstats.io*", "*sentry.io*", "*matomo*", "*rtcstats*",
+        "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+        "*/images/welcome-background*", "*/images/watermark*",
+        "*/libs/analytics-ga.min.js*",
+    ],
+    "webex": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*amplitude.com*",
+        "*newrelic.com*", "*nr-data.net*", "*qualtrics.com*", "*sentry.io*",
+        "*doubleclick.net*", "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+    ],
+}
+
+# first element that means "automation can start" (for the time-to-interactive figure)
+READY_SELECTORS = {
+    "jitsi": "input[placeholder], [data-testid='prejoin.joinMeeting'], .prejoin-input-area",
+    "webex": "input[placeholder*='name' i], button[class*='join' i]",
+}
+
+# ----------------------------------------------------------------------
+# 🚫 APPLY
+# ----------------------------------------------------------------------
+def enable_logging(options):
+    """Ask chromedriver for Network events in the performance log (call on Options)."""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+def apply(driver, provider):
+    """Block the provider's non-essential URLs in the current window (before driver.get)."""
+    patterns = BLOCKLISTS.get(provider, [])
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    return patterns
+
+# ----------------------------------------------------------------------
+# 📊 STATISTICS
+# ----------------------------------------------------------------------
+def drain(driver):
+    """Read (and so clear) chromedriver's performance log; [] if logging is off."""
+    try:
+        return driver.get_log("performance")
+    except Exception:
+        return []
+
+def network_stats(entries):
+    """
+    Summarise performance-log entries:
+    requests, blocked, blocked_hosts, bytes, js_bytes, failed.
+    """
+    types, sizes, hosts = {}, {}, {}
+    stats = {"requests": 0, "blocked": 0, "blocked_hosts": {}, "bytes": 0, "js_bytes": 0, "failed": 0}
+    for e in entries:
+        try:
+            msg = json.loads(e["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        method, p = msg.get("method"), msg.get("params", {})
+        if method == "Network.requestWillBeSent":
+            stats["requests"] += 1
+            hosts[p["requestId"]] = urlsplit(p["request"]["url"]).hostname or "?"
+        elif method == "Network.responseReceived":
+            types[p["requestId"]] = p.get("type")
+        elif method == "Network.loadingFinished":
+            sizes[p["requestId"]] = p.get("encodedDataLength", 0)
+        elif method == "Network.loadingFailed":
+            if p.get("blockedReason") == "inspector":
+                stats["blocked"] += 1
+                h = hosts.get(p["requestId"], "?")
+                stats["blocked_hosts"][h] = stats["blocked_hosts"].get(h, 0) + 1
+            else:
+                stats["failed"] += 1
+    for rid, size in sizes.items():
+        stats["bytes"] += size
+        if types.get(rid) == "Script":
+            stats["js_bytes"] += size
+    return stats
+
+def report(driver, label):
+    """Print and return network_stats for everything logged since the last drain."""
+    s = network_stats(drain(driver))
+    top = ", ".join(f"{h}×{n}" for h, n in sorted(s["blocked_hosts"].items(), key=lambda x: -x[1])[:4])
+    print(f"🚫 [{label}] {s['blocked']} of {s['requests']} requests blocked{' (' + top + ')' if top else ''} — "
+          f"loaded {s['bytes'] / 1048576:.1f} MB, JS {s['js_bytes'] / 1048576:.1f} MB")
+    return s
+
+# ----------------------------------------------------------------------
+# ⏱️ BASELINE COMPARISON
+# ----------------------------------------------------------------------
+def time_to_interactive(driver, provider, timeout=60):
+    """Seconds until the provider's ready selector exists (searching same-origin iframes too)."""
+    js = """
+    const sel = arguments[0];
+    const docs = [document];
+    for (const f of document.querySelectorAll('iframe')) {
+      try { if (f.contentDocument) docs.push(f.contentDocument); } catch (e) {}
+    }
+    return docs.some(d => d.querySelector(sel));
+    """
+    t0 = time.monotonic()
+    while time.monotonic() - t0 < timeout:
+        try:
+            if driver.execute_script(js, READY_SELECTORS[provider]):
+                return time.monotonic() - t0
+        except Exception:
+            pass
+        time.sleep(0.1)
+    return None
+
+def compare(url, provider, runs=2):
+    import chromium_session
+    rows = []
+    for blocked in (False, True):
+        for i in range(runs):
+            opts = chromium_session.build_options(extra_args=["--headless=new"])
+            enable_logging(opts)
+            driver = chromium_session.launch(opts)
+            try:
+                if blocked:
+                    apply(driver, provider)
+                else:
+                    driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_script("window.location.href = arguments[0];", url)
+                tti = time_to_interactive(driver, provider)
+                time.sleep(3)          # let late scripts arrive before counting
+                s = network_stats(drain(driver))
+            finally:
+                driver.quit()
+            label = "blocked " if blocked else "baseline"
+            rows.append((label, tti, s))
+            print(f"⏱️ {label} run {i + 1}: interactive {tti if tti is None else round(tti, 1)} s, "
+                  f"{s['requests']} requests ({s['blocked']} blocked), "
+                  f"{s['bytes'] / 1048576:.1f} MB, JS {s['js_bytes'] / 1048576:.1f} MB")
+    for label in ("baseline", "blocked "):
+        r = [x for x in rows if x[0] == label]
+        ttis = [x[1] for x in r if x[1] is not None]
+        print(f"📊 {label}: interactive {sum(ttis) / len(ttis) if ttis else float('nan'):.1f} s, "
+              f"{sum(x[2]['bytes'] for x in r) / len(r) / 1048576:.1f} MB, "
+              f"JS {sum(x[2]['js_bytes'] for x in r) / len(r) / 1048576:.1f} MB per load")
+    return rows
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Blocked vs unblocked meeting-page load")
+    ap.add_argument("url")
+    ap.add_argument("--provider", choices=sorted(BLOCKLISTS), default="jitsi")
+    ap.add_argument("--runs", type=int, default=2)
+    args = ap.parse_args()
+    compare(args.url, args.provider, args.runs)
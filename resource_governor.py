@@ -0,0 +1,195 @@
+# ============================================================
+# CareBridge — Chromium resource governor
+# Long calls slowly grow Chromium, and with two sessions on a 2 GB
+# Pi the kernel's OOM killer used to pick the panel itself. The
+# governor
+#   • samples RSS and CPU of every browser tree the panel launched
+#   • makes the browsers the preferred OOM victims (oom_score_adj)
+#     and, where a delegated cgroup v2 subtree is available, puts
+#     them in their own cgroup with memory.high / memory.max so the
+#     panel is never reclaimed for them
+#   • flags a tree that stays over its limits; the flagged browser
+#     is quit instead of reused at the end of the call (recycle()),
+#     or before the next call if it was idle in the standby pool.
+# Nothing is killed mid-call.
+# ============================================================
+
+import os, time, threading
+
+from proc_stats import TreeSampler, process_tree, driver_root_pid
+from session_state import pid_alive
+
+SAMPLE_S = 5
+RSS_LIMIT_MB = 900         # one browser tree, during a call
+TOTAL_RSS_LIMIT_MB = 1400  # all browser trees together (2 GB Pi)
+CPU_LIMIT_PCT = 300        # summed over cores …
+CPU_HOLD_S = 60            # … sustained this long
+
+PANEL_OOM_ADJ = -500       # lowering needs CAP_SYS_RESOURCE (root / systemd OOMScoreAdjust=)
+BROWSER_OOM_ADJ = 500
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+BROWSER_CGROUP_HIGH_MB = 1300   # reclaim / throttle above this
+BROWSER_CGROUP_MAX_MB = 1500    # OOM kills stay inside the browser cgroup
+
+# ----------------------------------------------------------------------
+# 🛡️ OOM & CGROUP POLICY
+# ----------------------------------------------------------------------
+def set_oom_adj(pid, value):
+    try:
+        with open(f"/proc/{pid}/oom_score_adj", "w") as f:
+            f.write(str(value))
+        return True
+    except OSError:
+        return False
+
+def get_oom_adj(pid):
+    try:
+        with open(f"/proc/{pid}/oom_score_adj") as f:
+            return int(f.read())
+    except (OSError, ValueError):
+        return None
+
+def protect_panel():
+    """Make this process the last OOM candidate (or at least no worse than default)."""
+    if set_oom_adj(os.getpid(), PANEL_OOM_ADJ):
+        print(f"🛡️ Panel oom_score_adj set to {PANEL_OOM_ADJ}")
+        return True
+    print("⚠️ Cannot lower the panel's oom_score_adj (needs root or OOMScoreAdjust=) — "
+          "browsers will be raised instead")
+    return False
+
+def _own_cgroup():
+    try:
+        with open("/proc/self/cgroup") as f:
+            for line in f:
+                if line.startswith("0::"):
+                    return os.path.join(CGROUP_ROOT, line.strip()[3:].lstrip("/"))
+    except OSError:
+        pass
+    return None
+
+def _write(path, value):
+    with open(path, "w") as f:
+        f.write(str(value))
+
+def setup_cgroup():
+    """
+    In a writable cgroup v2 subtree (e.g. a systemd unit with Delegate=yes)
+    move the panel into a "panel" leaf and create a memory-limited
+    "browsers" leaf next to it. Returns the browsers path, or None.
+    """
+    base = _own_cgroup()
+    if not base or not os.access(os.path.join(base, "cgroup.procs"), os.W_OK):
+        print("ℹ️ No delegated cgroup — relying on oom_score_adj only")
+        return None
+    try:
+        panel, browsers = os.path.join(base, "panel"), os.path.join(base, "browsers")
+        os.makedirs(panel, exist_ok=True)
+        os.makedirs(browsers, exist_ok=True)
+        # v2 "no internal processes": everything leaves base before controllers are enabled
+        with open(os.path.join(base, "cgroup.procs")) as f:
+            for pid in f.read().split():
+                try:
+                    _write(os.path.join(panel, "cgroup.procs"), pid)
+                except OSError:
+                    pass
+        _write(os.path.join(base, "cgroup.subtree_control"), "+memory")
+        _write(os.path.join(browsers, "memory.high"), BROWSER_CGROUP_HIGH_MB * 1048576)
+        _write(os.path.join(browsers, "memory.max"), BROWSER_CGROUP_MAX_MB * 1048576)
+    except OSError as e:
+        print(f"⚠️ cgroup setup failed ({e}) — relying on oom_score_adj only")
+        return None
+    print(f"🛡️ Browsers capped at {BROWSER_CGROUP_MAX_MB} MB in {browsers}")
+    return browsers
+
+# ----------------------------------------------------------------------
+# 📏 GOVERNOR
+# ----------------------------------------------------------------------
+class Governor(threading.Thread):
+    """
+    track(driver, label) every browser the panel launches. A tree that
+    breaks a limit gets driver.cb_over_limit = "<reason>"; recycle() and
+    Standby.take() quit such a browser instead of reusing it.
+    """
+
+    def __init__(self):
+        super().__init__(daemon=True, name="resource-governor")
+        self.lock = threading.Lock()
+        self.trees = {}            # root pid → [driver, label, TreeSampler, hot_since]
+        self.cgroup = None
+
+    def start(self):
+        protect_panel()
+        self.cgroup = setup_cgroup()
+        super().start()
+
+    def track(self, driver, label):
+        pid = driver_root_pid(driver)
+        if not pid:
+            return
+        with self.lock:
+            self.trees[pid] = [driver, label, TreeSampler(pid), None]
+        self._apply_policy(pid)
+
+    def _apply_policy(self, root):
+        """Browser tree → browsers cgroup and raised oom_score_adj (new children inherit both)."""
+        for pid in process_tree(root):
+            if self.cgroup:
+                try:
+                    _write(os.path.join(self.cgroup, "cgroup.procs"), pid)
+                except OSError:
+                    pass
+            cur = get_oom_adj(pid)
+            # Chromium raises its renderers itself; only ever raise
+            if cur is not None and cur < BROWSER_OOM_ADJ:
+                set_oom_adj(pid, BROWSER_OOM_ADJ)
+
+    def _flag(self, entry, reason):
+        driver, label = entry[0], entry[1]
+        if getattr(driver, "cb_over_limit", None):
+            return
+        driver.cb_over_limit = reason
+        print(f"🐘 [{label}] {reason} — browser will be replaced after this call")
+
+    def sample(self):
+        """One pass over every tracked tree; returns {label: (cpu %, rss MB)}."""
+        with self.lock:
+            entries = dict(self.trees)
+        now = time.monotonic()
+        usage, total = {}, 0.0
+        for root, entry in entries.items():
+            if not pid_alive(root):      # a zombie browser is gone too
+                with self.lock:
+                    self.trees.pop(root, None)
+                continue
+            self._apply_policy(root)   # renderers started since the last pass
+            s = entry[2].sample()
+            if s is None:
+                continue
+            cpu, rss = s
+            usage[entry[1]] = s
+            total += rss
+            if rss > RSS_LIMIT_MB:
+                self._flag(entry, f"RSS {rss:.0f} MB over {RSS_LIMIT_MB} MB")
+            if cpu > CPU_LIMIT_PCT:
+                entry[3] = entry[3] or now
+                if now - entry[3] >= CPU_HOLD_S:
+                    self._flag(entry, f"CPU {cpu:.0f}% for {now - entry[3]:.0f} s")
+            else:
+                entry[3] = None
+        if total > TOTAL_RSS_LIMIT_MB and usage:
+            biggest = max(usage, key=lambda k: usage[k][1])
+            for entry in entries.values():
+                if entry[1] == biggest:
+                    self._flag(entry, f"browsers total {total:.0f} MB over {TOTAL_RSS_LIMIT_MB} MB")
+        return usage
+
+    def run(self):
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"⚠️ Resource governor pass failed: {e}")
+            time.sleep(SAMPLE_S)
+
@@ -0,0 +1,183 @@
+# ============================================================
+# CareBridge — Batched WebRTC stats with a ring buffer
+# A collector script samples getStats() on every RTCPeerConnection
+# in window._cbPCs (meeting_profiles.RTC_HOOK_JS) every SAMPLE_S and
+# reduces each sample in the page to one row of numbers (FIELDS).
+# Python pulls the whole batch with ONE call every PULL_S into a
+# fixed-size ring (one flat array('d'), no per-sample objects), so a
+# call costs one WebDriver round trip per PULL_S. The last FLUSH_S
+# are written to STATS_DIR as gzip'd CSV when the call ends, when
+# the session is lost, or when it goes bad (loss / RTT over the
+# limits for BAD_ROWS samples in a row).
+# Meeting frames that are not the top document (IFrame API mode)
+# post their rows to the top page, so one pull still gets them.
+# ============================================================
+
+import os, csv, gzip, time, statistics
+from array import array
+
+import init_scripts
+
+SAMPLE_S = 2
+PULL_S = 10
+RING_ROWS = 450            # 15 min at SAMPLE_S
+PAGE_MAX_ROWS = 300        # in-page batch cap if nobody pulls
+FLUSH_S = 300
+STATS_DIR = os.path.expanduser("~/.cache/carebridge/rtc_stats")
+BAD_LOSS_PCT = 10.0
+BAD_RTT_MS = 1000.0
+BAD_ROWS = 3
+BAD_COOLDOWN_S = 300       # at most one "bad" flush this often
+
+FIELDS = ("t", "out_kbps", "in_kbps", "out_fps", "in_fps", "jitter_ms", "loss_pct", "rtt_ms", "pcs")
+
+COLLECTOR_JS = """
+(function (sampleMs, maxRows) {
+  if (window._cbStats) return;
+  const batch = window._cbStats = [];
+  const top = window === window.top;
+  const push = row => { batch.push(row); if (batch.length > maxRows) batch.splice(0, batch.length - maxRows); };
+  if (top) window.addEventListener('message', e => { if (e.data && e.data.cbStats) push(e.data.cbStats); });
+  let prev = null;
+  async function sample() {
+    const pcs = window._cbPCs || [];
+    if (!pcs.length) { prev = null; return; }
+    const reports = await Promise.all(pcs.map(pc => pc.getStats().catch(() => null)));
+    const now = Date.now();
+    let outB = 0, inB = 0, outFps = 0, inFps = 0, jitter = 0, lost = 0, recv = 0, rtt = 0;
+    for (const r of reports) if (r) r.forEach(s => {
+      if (s.type === 'outbound-rtp') {
+        outB += s.bytesSent || 0;
+        if (s.kind === 'video') outFps += s.framesPerSecond || 0;
+      } else if (s.type === 'inbound-rtp') {
+        inB += s.bytesReceived || 0; lost += s.packetsLost || 0; recv += s.packetsReceived || 0;
+        if (s.kind === 'video') inFps += s.framesPerSecond || 0;
+        jitter = Math.max(jitter, (s.jitter || 0) * 1000);
+      } else if (s.type === 'candidate-pair' && s.nominated && s.state === 'succeeded') {
+        rtt = Math.max(rtt, (s.currentRoundTripTime || 0) * 1000);
+      }
+    });
+    const p = prev;
+    prev = {t: now, outB: outB, inB: inB, lost: lost, recv: recv};
+    if (!p) return;                                  // the first sample only primes the counters
+    const dt = (now - p.t) / 1000, d = (a, b) => Math.max(0, a - b);
+    const dl = d(lost, p.lost), dr = d(recv, p.recv);
+    const row = [now / 1000, d(outB, p.outB) * 8 / 1000 / dt, d(inB, p.inB) * 8 / 1000 / dt, outFps, inFps,
+                 jitter, dl + dr > 0 ? 100 * dl / (dl + dr) : 0, rtt, pcs.length];
+    if (top) push(row); else window.top.postMessage({cbStats: row}, '*');
+  }
+  setInterval(sample, sampleMs);
+})(%d, %d);
+""" % (SAMPLE_S * 1000, PAGE_MAX_ROWS)
+
+PULL_JS = "const b = window._cbStats || []; return b.splice(0, b.length);"
+
+def install(driver):
+    """Register the collector for every new document in the current window (before driver.get)."""
+    try:
+        init_scripts.add(driver, COLLECTOR_JS)
+    except Exception as e:
+        print(f"⚠️ RTC stats collector not installed: {e}")
+
+# ----------------------------------------------------------------------
+# 🔁 RING BUFFER
+# ----------------------------------------------------------------------
+class StatsRing:
+    """The last `capacity` rows of len(FIELDS) floats, in one preallocated array."""
+
+    def __init__(self, capacity=RING_ROWS, width=len(FIELDS)):
+        self.capacity = capacity
+        self.width = width
+        self.data = array("d", bytes(8 * capacity * width))
+        self.next = 0
+        self.count = 0
+
+    def append(self, row):
+        base = self.next * self.width
+        for j in range(self.width):
+            self.data[base + j] = row[j] if j < len(row) and row[j] is not None else 0.0
+        self.next = (self.next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def rows(self, since=None):
+        """Oldest → newest as tuples; only rows with t >= since when given."""
+        start = (self.next - self.count) % self.capacity
+        for k in range(self.count):
+            base = ((start + k) % self.capacity) * self.width
+            if since is None or self.data[base] >= since:
+                yield tuple(self.data[base:base + self.width])
+
+    def __len__(self):
+        return self.count
+
+# ----------------------------------------------------------------------
+# 📈 COLLECTOR
+# ----------------------------------------------------------------------
+class StatsCollector:
+    """
+    Call tick() from the meeting loop and close() when the call ends or is
+    lost. With handle set, pulls switch to that window first.
+    """
+
+    def __init__(self, driver, label, handle=None):
+        self.driver = driver
+        self.label = label
+        self.handle = handle
+        self.ring = StatsRing()
+        self._next = time.monotonic() + PULL_S
+        self._bad = 0
+        self._last_bad_flush = 0.0
+
+    def due(self):
+        return time.monotonic() >= self._next
+
+    def tick(self):
+        if not self.due():
+            return
+        self._next = time.monotonic() + PULL_S
+        self.pull()
+
+    def pull(self):
+        """One round trip: move the page's batch into the ring. Returns the number of rows."""
+        try:
+            if self.handle:
+                self.driver.switch_to.window(self.handle)
+            rows = self.driver.execute_script(PULL_JS) or []
+        except Exception:
+            return 0
+        for row in rows:
+            self.ring.append(row)
+            bad = row[FIELDS.index("loss_pct")] >= BAD_LOSS_PCT or row[FIELDS.index("rtt_ms")] >= BAD_RTT_MS
+            self._bad = self._bad + 1 if bad else 0
+        if self._bad >= BAD_ROWS and time.monotonic() - self._last_bad_flush >= BAD_COOLDOWN_S:
+            self._last_bad_flush = time.monotonic()
+            self.flush("bad")
+        return len(rows)
+
+    def flush(self, reason="end", seconds=FLUSH_S):
+        """Write the last `seconds` of samples to STATS_DIR; returns the path (None if empty)."""
+        rows = list(self.ring.rows(time.time() - seconds))
+        if not rows:
+            return None
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(STATS_DIR, f"{self.label.replace(' ', '_')}-{stamp}-{reason}.csv.gz")
+        try:
+            os.makedirs(STATS_DIR, exist_ok=True)
+            with gzip.open(path, "wt", newline="") as f:
+                w = csv.writer(f)
+                w.writerow(FIELDS)
+                w.writerows(tuple(round(v, 2) for v in r) for r in rows)
+        except OSError as e:
+            print(f"⚠️ [{self.label}] RTC stats not saved: {e}")
+            return None
+        col = lambda name: [r[FIELDS.index(name)] for r in rows]
+        print(f"📈 [{self.label}] {len(rows)} samples ({reason}): out {statistics.median(col('out_kbps')):.0f} kbps, "
+              f"in {statistics.median(col('in_kbps')):.0f} kbps, loss max {max(col('loss_pct')):.1f}%, "
+              f"rtt median {statistics.median(col('rtt_ms')):.0f} ms → {path}")
+        return path
+
+    def close(self, healthy=True):
+        """Final pull (if the page is still there) and flush."""
+        if healthy:
+            self.pull()
+        return self.flush("end" if healthy else "lost")
@@ -0,0 +1,207 @@
+# ============================================================
+# CareBridge — Selector microbenchmark on saved pre-join pages
+# Do the translate(.,'ABC…','abc…') XPaths cost more than CSS or
+# data-testid lookups on a Pi? This loads saved snapshots of the
+# Jitsi / Webex pre-join screens (MHTML, HTML, or dom_snapshot
+# .json.gz taken with --html) into headless Chromium and times, in
+# page, every selector the providers use plus the modal-dismissal
+# expressions and a few CSS alternatives — the same first-match
+# lookup cdp_channel does — in the top document and each same-origin
+# frame. Selectors that never match or are much slower are flagged.
+#
+# Save a pre-join page:  python3 selector_bench.py --capture https://meet.jit.si/Room jitsi.mhtml
+# Benchmark:             python3 selector_bench.py jitsi.mhtml webex.mhtml
+# ============================================================
+
+import os, time, tempfile, statistics
+
+import providers
+import modal_guard
+
+SLOW_US = 500              # per lookup, flag above this …
+SLOW_FACTOR = 10           # … or this many times the fastest selector
+MIN_ITER, MAX_ITER, BUDGET_MS = 20, 2000, 40
+
+# expressions from the old polling dismiss_auth_or_recover_modal (caredride / workingCode copies)
+MODAL_SELECTORS = [
+    "//*[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'recover password')]",
+    "//*[contains(translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'reset your password')]",
+    "//button[translate(normalize-space(.), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz') = 'cancel']",
+    "//button[contains(@aria-label, 'Close') or contains(@class, 'close') or contains(@aria-label, 'close')]",
+]
+
+# cheaper spellings of the same intent, for comparison
+ALTERNATIVES = [
+    "button[data-testid='prejoin.joinMeeting']",
+    "[data-testid='prejoin.joinMeeting']",
+    "button[aria-label*='join' i]",
+    "input[placeholder*='name' i]",
+    "//button[contains(., 'Join')]",
+    "//input[contains(@placeholder,'name')]",
+    "button[aria-label*='close' i], button[class*='close']",
+]
+
+# One call per page: per selector {matches, us} summed over all reachable documents.
+BENCH_JS = """
+const sels = arguments[0], minIter = arguments[1], maxIter = arguments[2], budget = arguments[3];
+const docs = [document];
+for (let i = 0; i < docs.length; i++)
+  for (const f of docs[i].querySelectorAll('iframe, frame')) {
+    try { if (f.contentDocument) docs.push(f.contentDocument); } catch (e) {}
+  }
+function first(d, s) {
+  if (s[0] === '/' || s[0] === '(')
+    return d.evaluate(s, d, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+  return d.querySelector(s);
+}
+function count(d, s) {
+  if (s[0] === '/' || s[0] === '(')
+    return d.evaluate(s, d, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+  return d.querySelectorAll(s).length;
+}
+const out = {};
+for (const s of sels) {
+  let matches = 0, us = 0, error = null;
+  try {
+    for (const d of docs) {
+      matches += count(d, s);
+      first(d, s);                         // warm
+      let n = 0;
+      const t0 = performance.now();
+      while (n < maxIter && (n < minIter || performance.now() - t0 < budget)) { first(d, s); n++; }
+      us += (performance.now() - t0) * 1000 / n;
+    }
+  } catch (e) { error = String(e).split('\\n')[0]; }
+  out[s] = {matches: matches, us: us, error: error};
+}
+return {docs: docs.length, results: out};
+"""
+
+# ----------------------------------------------------------------------
+# 🎯 SELECTOR SET
+# ----------------------------------------------------------------------
+def selector_set():
+    """[(group, selector)] — every provider's selectors, the modal ones, the alternatives."""
+    out = []
+    for name in providers.names():
+        p = providers.get(name)
+        for attr in ("ready", "browser_link", "name_field"):
+            if isinstance(getattr(p, attr, None), str):
+                out.append((f"{name}.{attr}", getattr(p, attr)))
+        for attr in ("name_selectors", "join_selectors"):
+            out += [(f"{name}.{attr}", s) for s in getattr(p, attr, [])]
+    out += [("modal", s) for s in MODAL_SELECTORS]
+    out.append(("modal_guard", modal_guard.DIALOG_SELECTOR))
+    out += [("alternative", s) for s in ALTERNATIVES]
+    seen, unique = set(), []
+    for g, s in out:
+        if s not in seen:
+            seen.add(s)
+            unique.append((g, s))
+    return unique
+
+# ----------------------------------------------------------------------
+# 📂 SNAPSHOTS
+# ----------------------------------------------------------------------
+def page_url(path):
+    """file:// URL Chromium can open; a dom_snapshot .json.gz is unpacked to its top-frame HTML."""
+    path = os.path.abspath(path)
+    if path.endswith(".json.gz"):
+        import dom_snapshot
+        snap = dom_snapshot.load(path)
+        html = next((f.get("html") for f in snap["frames"] if f.get("html")), None)
+        if not html:
+            raise ValueError(f"{path} was taken without --html")
+        fd, path = tempfile.mkstemp(suffix=".html", prefix="cb-snap-")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(html)
+    return "file://" + path
+
+def capture(driver, url, out, wait=10):
+    """Save url's rendered page (all frames) as MHTML via Page.captureSnapshot."""
+    driver.get(url)
+    time.sleep(wait)
+    data = driver.execute_cdp_cmd("Page.captureSnapshot", {"format": "mhtml"})["data"]
+    with open(out, "w", encoding="utf-8") as f:
+        f.write(data)
+    print(f"💾 Saved {url} → {out} ({len(data) // 1024} KB)")
+
+# ----------------------------------------------------------------------
+# ⏱️ BENCHMARK
+# ----------------------------------------------------------------------
+def bench_page(driver, path, sels, rounds=3):
+    """Median µs and match count per selector on one snapshot."""
+    driver.get(page_url(path))
+    runs = [driver.execute_script(BENCH_JS, [s for _, s in sels], MIN_ITER, MAX_ITER, BUDGET_MS)
+            for _ in range(rounds)]
+    res = {}
+    for _, s in sels:
+        r = [run["results"][s] for run in runs]
+        res[s] = {"matches": r[0]["matches"], "error": r[0]["error"],
+                  "us": statistics.median(x["us"] for x in r)}
+    return runs[0]["docs"], res
+
+def report(path, docs, sels, res):
+    fastest = min((r["us"] for r in res.values() if not r["error"] and r["us"] > 0), default=1)
+    print(f"\n📄 {os.path.basename(path)} — {docs} document(s)")
+    print(f"   {'µs/lookup':>10} {'matches':>8}  {'group':<20} selector")
+    for g, s in sorted(sels, key=lambda gs: -res[gs[1]]["us"]):
+        r = res[s]
+        flag = ""
+        if r["error"]:
+            flag = f"❌ {r['error']}"
+        elif r["us"] > SLOW_US or r["us"] > SLOW_FACTOR * fastest:
+            flag = "🐢 slow"
+        if not r["error"] and not r["matches"]:
+            flag = (flag + " " if flag else "") + "∅ no match"
+        short = s if len(s) <= 90 else s[:87] + "…"
+        print(f"   {r['us']:10.1f} {r['matches']:8d}  {g:<20} {short}  {flag}")
+
+def bench(paths, rounds=3):
+    """Benchmark every selector on every snapshot; prints per-file tables and a summary."""
+    import chromium_session
+    sels = selector_set()
+    driver = chromium_session.launch(chromium_session.build_options(extra_args=["--headless=new"]))
+    results = {}
+    try:
+        for path in paths:
+            docs, res = bench_page(driver, path, sels, rounds)
+            results[path] = res
+            report(path, docs, sels, res)
+    finally:
+        driver.quit()
+    never = [(g, s) for g, s in sels if not any(results[p][s]["matches"] for p in paths)]
+    print(f"\n📊 {len(sels)} selectors on {len(paths)} snapshot(s); {len(never)} never matched:")
+    for g, s in never:
+        print(f"   ∅ {g:<20} {s}")
+    by_kind = {"xpath+translate": [], "xpath": [], "css": []}
+    for _, s in sels:
+        kind = "css" if s[0] not in "/(" else ("xpath+translate" if "translate(" in s else "xpath")
+        by_kind[kind] += [results[p][s]["us"] for p in paths if not results[p][s]["error"]]
+    print("📊 median µs/lookup: " + ", ".join(
+        f"{k} {statistics.median(v):.1f}" for k, v in by_kind.items() if v))
+    return results
+
+if __name__ == "__main__":
+    import argparse
+    ap = argparse.ArgumentParser(description="Time provider / modal selectors on saved pre-join pages")
+    ap.add_argument("snapshots", nargs="*", help=".mhtml, .html or dom_snapshot .json.gz files")
+    ap.add_argument("--rounds", type=int, default=3)
+    ap.add_argument("--capture", nargs=2, metavar=("URL", "OUT"), help="save a live page as MHTML first")
+    ap.add_argument("--wait", type=float, default=10)
+    ap.add_argument("--list", action="store_true", help="print the selector set and exit")
+    args = ap.parse_args()
+    if args.list:
+        for g, s in selector_set():
+            print(f"{g:<20} {s}")
+    elif args.capture:
+        import chromium_session
+        drv = chromium_session.launch(chromium_session.build_options(extra_args=["--headless=new"]))
+        try:
+            capture(drv, args.capture[0], args.capture[1], args.wait)
+        finally:
+            drv.quit()
+    elif args.snapshots:
+        bench(args.snapshots, args.rounds)
+    else:
+        ap.error("give snapshot files, --capture URL OUT or --list")
@@ -0,0 +1,101 @@
+# ============================================================
+# CareBridge — Launch scheduler for parallel meeting sessions
+# Each session goes through two heavy phases:
+#   launch → Chromium + chromedriver start (disk, process spawn)
+#   load   → page load, JS parse/compile, pre-join, Join click (CPU)
+# The policy decides how many sessions may be in each phase at once,
+# so browser B can start while A is still loading instead of both
+# fighting for the Pi's CPU at the same moment.
+# ============================================================
+
+import time, threading
+from contextlib import contextmanager
+
+from chromium_session import JoinReport
+
+# slot counts: 0 = unlimited
+POLICIES = {
+    "parallel":   {"stagger_s": 0.0, "launch": 0, "load": 0, "session": 0},   # old behaviour
+    "staggered":  {"stagger_s": 3.0, "launch": 0, "load": 0, "session": 0},
+    "pipelined":  {"stagger_s": 0.0, "launch": 1, "load": 1, "session": 0},
+    "sequential": {"stagger_s": 0.0, "launch": 0, "load": 0, "session": 1},   # B starts after A joined
+}
+
+class LaunchScheduler:
+    """Runs session targets under a startup policy and reports time-to-all-joined."""
+
+    def __init__(self, policy="pipelined", expected=2, label="dual"):
+        if policy not in POLICIES:
+            print(f"⚠️ Unknown launch policy '{policy}' — using parallel")
+            policy = "parallel"
+        self.policy_name = policy
+        self.policy = POLICIES[policy]
+        self.slots = {k: threading.Semaphore(self.policy[k])
+                      for k in ("launch", "load", "session") if self.policy[k]}
+        self.report = JoinReport(f"{label} ({policy})", expected)
+        self.phases = []                   # (name, kind, waited_s, ran_s)
+        self._holding_session = set()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name, kind):
+        """Wrap one heavy phase of session `name`; blocks until a slot is free."""
+        t0 = time.monotonic()
+        if "session" in self.slots and name not in self._holding_session:
+            self.slots["session"].acquire()
+            self._holding_session.add(name)
+        slot = self.slots.get(kind)
+        if slot:
+            slot.acquire()
+        t1 = time.monotonic()
+        try:
+            yield
+        finally:
+            if slot:
+                slot.release()
+            with self._lock:
+                self.phases.append((name, kind, t1 - t0, time.monotonic() - t1))
+
+    def mark_joined(self, name, driver):
+        if name in self._holding_session:
+            self._holding_session.discard(name)
+            self.slots["session"].release()
+        self.report.mark_joined(name, driver)
+        if len(self.report.joined) == self.report.expected:
+            self.print_phases()
+
+    def release(self, name):
+        """Give back a session slot if the session failed before joining."""
+        if name in self._holding_session:
+            self._holding_session.discard(name)
+            self.slots["session"].release()
+
+    def print_phases(self):
+        with self._lock:
+            for name, kind, waited, ran in self.phases:
+                print(f"   ⏳ {name:<18} {kind:<6} waited {waited:5.1f} s, ran {ran:5.1f} s")
+
+    def run(self, jobs):
+        """jobs: list of (target, args); each target gets scheduler=self. Blocks until all return."""
+        threads = []
+        for i, (target, args) in enumerate(jobs):
+            if i and self.policy["stagger_s"]:
+                time.sleep(self.policy["stagger_s"])
+            t = threading.Thread(target=target, args=args, kwargs={"scheduler": self}, daemon=True)
+            t.start()
+            threads.append(t)
+        for t in threads:
+            t.join()
+
+class NullScheduler:
+    """Stand-in for a lone session: no slots, no report."""
+
+    @contextmanager
+    def phase(self, name, kind):
+        yield
+
+    def mark_joined(self, name, driver):
+        pass
+
+    def release(self, name):
+        pass
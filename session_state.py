@@ -0,0 +1,96 @@
+# ============================================================
+# CareBridge — Session state for reattaching after a panel restart
+# With REATTACH on, each slot's Chromium runs in its own process
+# session on a fixed remote-debugging port, so it outlives the
+# Python panel. This small JSON file records, per slot, what is
+# running there:
+#   {"1": {"port": 9301, "pid": 1234, "kind": "meeting",
+#          "name": "CareBridge Cam 1", "url": …, "camera": …,
+#          "profile": "default", "windows": null, "since": …}}
+# kind is "standby" (prewarmed, no call) or "meeting". On start-up
+# live() returns the slots whose browser still answers, and the
+# panel reattaches chromedriver to them instead of rejoining.
+# ============================================================
+
+import os, json, time, threading
+from urllib.request import urlopen
+
+from session_supervisor import process_alive
+
+STATE_FILE = os.path.expanduser("~/.cache/carebridge/sessions.json")
+PORTS = {"1": 9301, "2": 9302, "dual": 9303}
+PORT_BASE = 9310           # further slots: PORT_BASE + n
+
+_lock = threading.Lock()
+_children = {}             # pid → Popen of the detached browsers this panel started
+
+def port_for(slot):
+    if slot not in PORTS:
+        PORTS[slot] = PORT_BASE + len(PORTS)
+    return PORTS[slot]
+
+def _load():
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _store(state):
+    os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+    tmp = STATE_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=1)
+    os.replace(tmp, STATE_FILE)   # a crash mid-write never leaves half a file
+
+def record(slot, **info):
+    """Merge info into the slot's entry."""
+    with _lock:
+        state = _load()
+        entry = state.setdefault(slot, {"since": time.time()})
+        entry.update(info)
+        _store(state)
+
+def forget(slot):
+    with _lock:
+        state = _load()
+        if state.pop(slot, None) is not None:
+            _store(state)
+
+def devtools_alive(port):
+    try:
+        with urlopen(f"http://127.0.0.1:{port}/json/version", timeout=1) as r:
+            return r.status == 200
+    except OSError:
+        return False
+
+def adopt(proc):
+    """Keep the Popen of a browser we started, so it can be waited for and reaped."""
+    _children[proc.pid] = proc
+
+def child(pid):
+    return _children.get(pid)
+
+def pid_alive(pid):
+    """
+    True while pid runs. Our own children are polled (which reaps them);
+    for a reattached browser a zombie in /proc counts as gone.
+    """
+    if not pid:
+        return False
+    proc = _children.get(pid)
+    if proc is None:
+        return process_alive(pid)
+    if proc.poll() is None:
+        return True
+    _children.pop(pid, None)
+    return False
+
+def live():
+    """{slot: entry} for browsers still running and answering; stale entries are dropped."""
+    with _lock:
+        state = _load()
+        alive = {s: e for s, e in state.items() if pid_alive(e.get("pid")) and devtools_alive(e.get("port"))}
+        if alive != state:
+            _store(alive)
+    return alive
@@ -0,0 +1,155 @@
+# ============================================================
+# CareBridge — Crash detection with bounded auto-restart
+# A meeting loop used to sit in its GPIO poll with a dead browser
+# and a black screen. Supervisor.check() is called from that loop
+# and is cheap:
+#   • every CHECK_S  → /proc state of chromedriver and Chromium
+#                      (a crashed child shows up as gone or zombie)
+#   • every PING_S   → GET /json/version on the browser's DevTools
+#                      endpoint (the debuggerAddress chromedriver
+#                      reports) with a short socket timeout — no
+#                      WebDriver command, no DOM access
+# Either failing raises SessionLost. supervise() then tears down and
+# rejoins, with the rejoin bounded by RESTART_DEADLINE_S and at most
+# MAX_RESTARTS restarts per RESTART_WINDOW_S so a broken setup cannot
+# crash-loop the Pi.
+# ============================================================
+
+import json, time
+from urllib.request import urlopen
+
+CHECK_S = 1.0
+PING_S = 5.0
+PING_TIMEOUT_S = 3.0
+PING_FAILS = 2             # consecutive failed pings before giving up on the session
+RESTART_DEADLINE_S = 60    # lost → rejoined
+MAX_RESTARTS = 3
+RESTART_WINDOW_S = 600
+RESTART_BACKOFF_S = (0, 5, 15)   # wait before restart n (last value repeats)
+
+class SessionLost(Exception):
+    pass
+
+# ----------------------------------------------------------------------
+# 🩺 LIVENESS
+# ----------------------------------------------------------------------
+def process_alive(pid):
+    """True while pid exists and is not a zombie waiting to be reaped."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            data = f.read()
+    except OSError:
+        return False
+    return data[data.rindex(")") + 2] not in "ZX"
+
+def driver_pids(driver):
+    """{"chromedriver": pid, "chromium": pid} for whatever is known about this driver."""
+    pids = {}
+    try:
+        pids["chromedriver"] = driver.service.process.pid
+    except Exception:
+        pass
+    if getattr(driver, "browser_pid", None):
+        pids["chromium"] = driver.browser_pid
+    return pids
+
+def ping(driver, timeout=PING_TIMEOUT_S):
+    """One bounded round trip to the browser; raises on any failure."""
+    addr = driver.capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+    if not addr:
+        driver.execute("status")     # no DevTools endpoint known — chromedriver's own /status
+        return
+    with urlopen(f"http://{addr}/json/version", timeout=timeout) as r:
+        json.load(r)
+
+class Supervisor:
+    """Call check() from the meeting loop; raises SessionLost when the session is dead."""
+
+    def __init__(self, driver, label):
+        self.driver = driver
+        self.label = label
+        self.pids = driver_pids(driver)
+        self._next_check = 0.0
+        self._next_ping = time.monotonic() + PING_S
+        self._fails = 0
+
+    def check(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        self._next_check = now + CHECK_S
+        for what, pid in self.pids.items():
+            if not process_alive(pid):
+                raise SessionLost(f"{what} (pid {pid}) exited")
+        if now < self._next_ping:
+            return
+        self._next_ping = now + PING_S
+        try:
+            ping(self.driver)
+            self._fails = 0
+        except Exception as e:
+            self._fails += 1
+            if self._fails >= PING_FAILS:
+                raise SessionLost(f"WebDriver session not answering ({str(e).splitlines()[0]})")
+
+# ----------------------------------------------------------------------
+# 🔁 BOUNDED RESTART
+# ----------------------------------------------------------------------
+class RestartBudget:
+    """Restart bookkeeping for one session: storm cap, backoff and the rejoin deadline."""
+
+    def __init__(self, label):
+        self.label = label
+        self.restarts = []         # monotonic times of restarts inside the window
+        self.lost_at = None
+
+    def lost(self, reason):
+        self.lost_at = time.monotonic()
+        print(f"💥 [{self.label}] session lost: {reason}")
+
+    def allow(self):
+        now = time.monotonic()
+        self.restarts = [t for t in self.restarts if now - t < RESTART_WINDOW_S]
+        if len(self.restarts) >= MAX_RESTARTS:
+            print(f"🧯 [{self.label}] {len(self.restarts)} restarts in {RESTART_WINDOW_S // 60} min — giving up")
+            return False
+        wait = RESTART_BACKOFF_S[min(len(self.restarts), len(RESTART_BACKOFF_S) - 1)]
+        self.restarts.append(now)
+        print(f"🔁 [{self.label}] restart {len(self.restarts)}/{MAX_RESTARTS}"
+              + (f" in {wait} s" if wait else ""))
+        time.sleep(wait)
+        return True
+
+    def timeout(self, default):
+        """Timeout for the next join step: default, or what is left of the rejoin deadline."""
+        if self.lost_at is None:
+            return default
+        return max(1.0, min(default, self.lost_at + RESTART_DEADLINE_S - time.monotonic()))
+
+    def recovered(self):
+        """Call once the rejoin has completed."""
+        if self.lost_at is None:
+            return
+        took = time.monotonic() - self.lost_at
+        mark = "✅" if took <= RESTART_DEADLINE_S else "⚠️"
+        print(f"{mark} [{self.label}] rejoined {took:.1f} s after the crash (deadline {RESTART_DEADLINE_S} s)")
+        self.lost_at = None
+
+def supervise(label, attempt, stop=lambda: False):
+    """
+    Run attempt(budget) — join and stay — and rerun it after SessionLost
+    while the budget allows and stop() is false. During a restart any
+    other exception counts as a failed restart too.
+    """
+    budget = RestartBudget(label)
+    while True:
+        try:
+            return attempt(budget)
+        except SessionLost as e:
+            budget.lost(e)
+        except Exception as e:
+            if budget.lost_at is None:
+                raise
+            budget.lost(f"rejoin failed: {str(e).splitlines()[0]}")
+        if stop() or not budget.allow():
+            return None
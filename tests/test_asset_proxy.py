@@ -0,0 +1,52 @@
+import pytest
+
+import asset_proxy
+from asset_proxy import AssetCache
+
+@pytest.mark.parametrize("path, kind", [
+    ("/libs/app.bundle.min.js?v=7123", "immutable"),
+    ("/css/all.css?v=7123", "immutable"),
+    ("/libs/app.bundle.min.js", "revalidate"),
+    ("/", "revalidate"),
+    ("/FollowingWavesSupposeAcross", "revalidate"),
+    ("/http-bind?room=x", "pass"),
+    ("/config.js?room=x", "pass"),
+])
+def test_classify(path, kind):
+    assert asset_proxy.classify(path) == kind
+
+def test_cache_round_trip(tmp_path):
+    cache = AssetCache(str(tmp_path), max_mb=1)
+    cache.put("/libs/a.js?v=1", {"status": 200, "etag": "x"}, b"body")
+    assert cache.get("/libs/a.js?v=1") == ({"status": 200, "etag": "x"}, b"body")
+    assert cache.get("/libs/missing.js") is None
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = AssetCache(str(tmp_path), max_mb=250 / 1048576)      # room for two 100-byte bodies
+    cache.put("/a", {}, b"a" * 100)
+    cache.put("/b", {}, b"b" * 100)
+    cache.get("/a")                                             # /b is now the oldest
+    cache.put("/c", {}, b"c" * 100)
+    assert cache.get("/b") is None
+    assert cache.get("/a") is not None and cache.get("/c") is not None
+    assert cache.total == 200
+    assert not (tmp_path / f"{AssetCache.key('/b')}.body").exists()
+
+def test_cache_replacing_an_entry_updates_the_total(tmp_path):
+    cache = AssetCache(str(tmp_path), max_mb=1)
+    cache.put("/a", {}, b"a" * 100)
+    cache.put("/a", {}, b"a" * 40)
+    assert cache.total == 40
+
+def test_cache_reloads_entries_from_disk(tmp_path):
+    AssetCache(str(tmp_path), max_mb=1).put("/a", {"n": 1}, b"abc")
+    cache = AssetCache(str(tmp_path), max_mb=1)
+    assert cache.total == 3
+    assert cache.get("/a") == ({"n": 1}, b"abc")
+
+def test_cache_drops_entries_with_broken_meta(tmp_path):
+    cache = AssetCache(str(tmp_path), max_mb=1)
+    cache.put("/a", {}, b"abc")
+    (tmp_path / f"{AssetCache.key('/a')}.json").write_text("{not json")
+    assert cache.get("/a") is None
+    assert cache.total == 0
@@ -0,0 +1,56 @@
+import pytest
+
+import camera_watcher
+from camera_registry import CameraRegistry
+
+def cam(dev, usb_path, label="USB Camera"):
+    return {"dev": dev, "label": label, "usb_path": usb_path, "vid": "046d", "pid": "0825", "num": 0,
+            "serial": None}
+
+@pytest.fixture
+def registry():
+    reg = CameraRegistry()
+    reg.set_cameras([cam("/dev/video0", "1-1.2"), cam("/dev/video2", "1-1.3")], {})
+    return reg
+
+def test_parse_uevent():
+    data = b"add@/devices/platform/usb/video4linux/video0\0ACTION=add\0SUBSYSTEM=video4linux\0DEVNAME=video0\0"
+    assert camera_watcher.parse_uevent(data) == {"ACTION": "add", "SUBSYSTEM": "video4linux", "DEVNAME": "video0"}
+
+def test_parse_uevent_skips_fields_without_value():
+    assert camera_watcher.parse_uevent(b"remove@/x\0SEQNUM=7\0garbage\0") == {"SEQNUM": "7"}
+
+def test_spare_for_skips_cameras_in_use(registry):
+    w = camera_watcher.CameraWatcher(registry)
+    assert w.spare_for("/dev/video0") == "/dev/video2"
+    assert w.spare_for("/dev/video0", in_use={"/dev/video2"}) is None
+
+def test_rescan_bumps_generation_only_on_change(registry, monkeypatch):
+    cams = [cam("/dev/video0", "1-1.2")]
+    calls = []
+    monkeypatch.setattr(camera_watcher, "scan_cameras", lambda: list(cams))
+    monkeypatch.setattr(camera_watcher.v4l2_ioctl, "list_modes",
+                        lambda dev: calls.append(dev) or [("YUYV", 640, 480, 30)])
+    w = camera_watcher.CameraWatcher(registry)
+    w.rescan()
+    assert w.generation == 1                 # video2 went away
+    w.rescan()
+    assert w.generation == 1 and calls == ["/dev/video0"]   # modes are cached per camera
+    assert registry.modes("/dev/video0") == [("YUYV", 640, 480, 30)]
+
+def test_follow_camera_moves_to_a_spare(registry, monkeypatch):
+    w = camera_watcher.CameraWatcher(registry)
+    monkeypatch.setattr(camera_watcher, "_WATCHER", w)
+    monkeypatch.setattr(camera_watcher, "REGISTRY", registry)
+    moved = []
+    switch = lambda driver, dev: moved.append(dev) or "USB Camera"
+    assert camera_watcher.follow_camera(None, "/dev/video0", switch=switch) == "/dev/video0"
+    registry.set_cameras([cam("/dev/video2", "1-1.3")], {})
+    assert camera_watcher.follow_camera(None, "/dev/video0", switch=switch) == "/dev/video2"
+    assert moved == ["/dev/video2"]
+
+def test_follow_camera_keeps_camera_when_switch_fails(registry, monkeypatch):
+    monkeypatch.setattr(camera_watcher, "_WATCHER", camera_watcher.CameraWatcher(registry))
+    monkeypatch.setattr(camera_watcher, "REGISTRY", registry)
+    registry.set_cameras([cam("/dev/video2", "1-1.3")], {})
+    assert camera_watcher.follow_camera(None, "/dev/video0", switch=lambda d, dev: None) == "/dev/video0"
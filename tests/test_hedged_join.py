@@ -0,0 +1,76 @@
+import json, threading
+
+import pytest
+
+import hedged_join
+from hedged_join import Leg, HedgeCancelled
+
+@pytest.fixture(autouse=True)
+def stats_file(tmp_path, monkeypatch):
+    path = tmp_path / "hedge_stats.json"
+    monkeypatch.setattr(hedged_join, "STATS_FILE", str(path))
+    return path
+
+def make_leg(provider, closed, delay=0.0, fail=False, release=None):
+    """A leg whose browser is the string "<provider>-driver"; closed collects torn-down drivers."""
+    def join(leg):
+        leg.attach(f"{provider}-driver")
+        if release is not None:
+            release.wait(2)
+        elif delay:
+            threading.Event().wait(delay)
+        if fail:
+            raise RuntimeError(f"{provider} broke")
+        return f"{provider}-driver"
+    return Leg(provider, join, closed.append)
+
+def test_primary_within_budget_wins_alone(stats_file):
+    closed = []
+    started = []
+    secondary = Leg("webex", lambda leg: started.append(1), closed.append)
+    winner = hedged_join.race(make_leg("jitsi", closed), secondary, budget_s=1)
+    assert winner.provider == "jitsi" and winner.result == "jitsi-driver"
+    assert started == [] and closed == []
+    assert json.loads(stats_file.read_text())[-1]["hedged"] is False
+
+def test_slow_primary_loses_to_secondary_and_is_torn_down(stats_file):
+    closed = []
+    hold = threading.Event()
+    try:
+        winner = hedged_join.race(make_leg("jitsi", closed, release=hold), make_leg("webex", closed), budget_s=0.05)
+    finally:
+        hold.set()
+    assert winner.provider == "webex"
+    assert closed == ["jitsi-driver"]
+    entry = json.loads(stats_file.read_text())[-1]
+    assert entry["hedged"] and entry["winner"] == "webex" and not entry["primary_failed"]
+
+def test_failed_primary_starts_the_secondary_at_once(stats_file):
+    closed = []
+    winner = hedged_join.race(make_leg("jitsi", closed, fail=True), make_leg("webex", closed), budget_s=5)
+    assert winner.provider == "webex" and winner.took < 5
+    assert json.loads(stats_file.read_text())[-1]["primary_failed"] is True
+
+def test_both_failing_returns_none():
+    closed = []
+    assert hedged_join.race(make_leg("jitsi", closed, fail=True), make_leg("webex", closed, fail=True), 1) is None
+    assert sorted(closed) == ["jitsi-driver", "webex-driver"]
+
+def test_attach_after_abort_closes_the_new_browser():
+    closed = []
+    leg = Leg("jitsi", None, closed.append)
+    leg.abort()
+    with pytest.raises(HedgeCancelled):
+        leg.attach("late-driver")
+    assert closed == ["late-driver"]
+
+def test_time_saved_uses_the_primarys_usual_join_time(stats_file):
+    closed = []
+    hedged_join.race(make_leg("jitsi", closed, delay=0.3), make_leg("webex", closed), budget_s=1)
+    hold = threading.Event()
+    try:
+        hedged_join.race(make_leg("jitsi", closed, release=hold), make_leg("webex", closed), budget_s=0.05)
+    finally:
+        hold.set()
+    entry = json.loads(stats_file.read_text())[-1]
+    assert entry["winner"] == "webex" and 0 < entry["saved_s"] <= 0.3
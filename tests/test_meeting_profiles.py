@@ -0,0 +1,85 @@
+import json
+from urllib.parse import unquote
+
+import pytest
+
+import meeting_profiles as mp
+
+def test_unknown_profile_falls_back_to_default():
+    assert mp.get_profile("turbo")["name"] == "default"
+    assert mp.get_profile("low_power")["name"] == "low_power"
+
+def test_profile_url_without_overrides_is_unchanged():
+    url = "https://meet.jit.si/Room"
+    assert mp.profile_url(url, mp.get_profile("default")) == url
+
+def test_profile_url_puts_json_overrides_in_the_fragment():
+    url = mp.profile_url("https://meet.jit.si/Room", mp.get_profile("low_power"),
+                         {"userInfo.displayName": "CareBridge Cam 1"})
+    base, frag = url.split("#", 1)
+    params = dict(p.split("=", 1) for p in frag.split("&"))
+    assert base == "https://meet.jit.si/Room"
+    assert json.loads(unquote(params["config.channelLastN"])) == 1
+    assert json.loads(unquote(params["config.disableTileView"])) is True
+    assert json.loads(unquote(params["userInfo.displayName"])) == "CareBridge Cam 1"
+
+def test_profile_url_appends_to_an_existing_fragment():
+    url = mp.profile_url("https://meet.jit.si/Room#config.startWithAudioMuted=true",
+                         mp.get_profile("default"), {"config.prejoinConfig.enabled": False})
+    assert url.endswith("#config.startWithAudioMuted=true&config.prejoinConfig.enabled=false")
+
+def test_async_script_splices_the_expression():
+    script = mp.async_script("Promise.resolve(3)")
+    assert "eval(" not in script and "Promise.resolve(Promise.resolve(3)\n)" in script
+
+class FakeSampler:
+    def __init__(self, cpu):
+        self.cpu = cpu
+
+    def sample(self):
+        return (self.cpu, 300.0)
+
+class FakeDriver:
+    def __init__(self, loss):
+        self.loss = loss
+        self.audio_only = False
+
+    def execute_async_script(self, script):
+        return self.loss if "packetsLost" in script else None
+
+    def execute_script(self, script):
+        return None
+
+def watchdog(monkeypatch, summed_cpu, loss=0.0, cores=4):
+    monkeypatch.setattr(mp, "TreeSampler", lambda pid: FakeSampler(summed_cpu))
+    monkeypatch.setattr(mp, "driver_root_pid", lambda driver: 1)
+    monkeypatch.setattr(mp.os, "cpu_count", lambda: cores)
+    monkeypatch.setattr(mp.ProfileWatchdog, "_control", lambda self: None)
+    profile = mp.get_profile("low_power")
+    profile["receive_height"] = None
+    dog = mp.ProfileWatchdog(FakeDriver(loss), profile, "t")
+    dog.receive_limited = True
+    return dog
+
+def run(dog, monkeypatch, seconds):
+    """Tick the watchdog through `seconds` of fake time."""
+    clock = [0.0]
+    monkeypatch.setattr(mp.time, "monotonic", lambda: clock[0])
+    dog._next = dog._start = 0.0
+    fell_back = []
+    monkeypatch.setattr(dog, "_fall_back", lambda cpu, loss: fell_back.append((cpu, loss)))
+    while clock[0] <= seconds:
+        dog.tick()
+        clock[0] += mp.CHECK_INTERVAL
+    return fell_back
+
+@pytest.mark.parametrize("summed_cpu", [150.0, 250.0])
+def test_healthy_call_on_a_4_core_pi_stays_on_video(monkeypatch, summed_cpu):
+    assert run(watchdog(monkeypatch, summed_cpu), monkeypatch, 60) == []
+
+def test_cpu_overload_falls_back_after_hold(monkeypatch):
+    fell_back = run(watchdog(monkeypatch, 380.0), monkeypatch, 60)
+    assert fell_back and fell_back[0][0] == pytest.approx(95.0)
+
+def test_packet_loss_falls_back(monkeypatch):
+    assert run(watchdog(monkeypatch, 100.0, loss=12.0), monkeypatch, 60)
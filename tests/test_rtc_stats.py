@@ -0,0 +1,75 @@
+import csv, gzip, time
+
+import pytest
+
+import rtc_stats
+from rtc_stats import FIELDS, StatsRing, StatsCollector
+
+def row(t, loss=0.0, rtt=50.0):
+    r = [0.0] * len(FIELDS)
+    r[FIELDS.index("t")] = t
+    r[FIELDS.index("loss_pct")] = loss
+    r[FIELDS.index("rtt_ms")] = rtt
+    return r
+
+def test_ring_wraps_and_keeps_the_newest_rows():
+    ring = StatsRing(capacity=3, width=2)
+    for t in range(5):
+        ring.append([t, t * 10])
+    assert len(ring) == 3
+    assert list(ring.rows()) == [(2.0, 20.0), (3.0, 30.0), (4.0, 40.0)]
+
+def test_ring_filters_by_time_and_pads_short_rows():
+    ring = StatsRing(capacity=4, width=3)
+    ring.append([1, 5])
+    ring.append([2, None, 7])
+    assert list(ring.rows(since=2)) == [(2.0, 0.0, 7.0)]
+    assert list(ring.rows())[0] == (1.0, 5.0, 0.0)
+
+class FakeDriver:
+    def __init__(self):
+        self.batches = []
+
+    def execute_script(self, js):
+        assert js == rtc_stats.PULL_JS
+        return self.batches.pop(0) if self.batches else []
+
+@pytest.fixture
+def stats_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(rtc_stats, "STATS_DIR", str(tmp_path))
+    return tmp_path
+
+def test_pull_moves_the_batch_into_the_ring(stats_dir):
+    driver = FakeDriver()
+    now = time.time()
+    driver.batches.append([row(now - 4), row(now - 2)])
+    col = StatsCollector(driver, "Cam 1")
+    assert col.pull() == 2 and len(col.ring) == 2
+    assert list(stats_dir.iterdir()) == []
+
+def test_consecutive_bad_rows_flush_once_per_cooldown(stats_dir):
+    driver = FakeDriver()
+    now = time.time()
+    driver.batches.append([row(now - 6 + i, loss=20.0) for i in range(rtc_stats.BAD_ROWS)])
+    driver.batches.append([row(now - 1, rtt=2000.0)] * rtc_stats.BAD_ROWS)
+    col = StatsCollector(driver, "Cam 1")
+    col.pull()
+    col.pull()
+    files = list(stats_dir.iterdir())
+    assert len(files) == 1 and files[0].name.endswith("-bad.csv.gz")
+
+def test_flush_writes_recent_rows_as_gzip_csv(stats_dir):
+    col = StatsCollector(FakeDriver(), "Cam 1")
+    now = time.time()
+    col.ring.append(row(now - rtc_stats.FLUSH_S - 60))      # too old for the flush window
+    col.ring.append(row(now - 1, loss=1.234))
+    path = col.close(healthy=False)
+    assert path.endswith("-lost.csv.gz")
+    with gzip.open(path, "rt", newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(FIELDS)
+    assert len(rows) == 2 and rows[1][FIELDS.index("loss_pct")] == "1.23"
+
+def test_flush_of_an_empty_ring_writes_nothing(stats_dir):
+    assert StatsCollector(FakeDriver(), "Cam 1").flush() is None
+    assert list(stats_dir.iterdir()) == []
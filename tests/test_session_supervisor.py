@@ -0,0 +1,94 @@
+import pytest
+
+import session_supervisor as ss
+
+class Clock:
+    """Stands in for time.monotonic / time.sleep: sleeping advances the clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, s):
+        self.slept.append(s)
+        self.now += s
+
+@pytest.fixture
+def clock(monkeypatch):
+    c = Clock()
+    monkeypatch.setattr(ss.time, "monotonic", c.monotonic)
+    monkeypatch.setattr(ss.time, "sleep", c.sleep)
+    return c
+
+def test_backoff_grows_and_the_last_step_repeats(clock, monkeypatch):
+    monkeypatch.setattr(ss, "MAX_RESTARTS", 5)
+    budget = ss.RestartBudget("t")
+    assert all(budget.allow() for _ in range(5))
+    assert clock.slept == [0, 5, 15, 15, 15]
+
+def test_storm_cap_inside_the_window(clock):
+    budget = ss.RestartBudget("t")
+    assert [budget.allow() for _ in range(ss.MAX_RESTARTS + 1)] == [True] * ss.MAX_RESTARTS + [False]
+
+def test_restarts_age_out_of_the_window(clock):
+    budget = ss.RestartBudget("t")
+    for _ in range(ss.MAX_RESTARTS):
+        budget.allow()
+    clock.now += ss.RESTART_WINDOW_S
+    assert budget.allow()
+    assert clock.slept[-1] == 0                  # backoff starts over too
+
+def test_timeout_is_bounded_by_the_rejoin_deadline(clock):
+    budget = ss.RestartBudget("t")
+    assert budget.timeout(30) == 30
+    budget.lost("crash")
+    clock.now += ss.RESTART_DEADLINE_S - 10
+    assert budget.timeout(30) == 10
+    clock.now += 20
+    assert budget.timeout(30) == 1.0
+    budget.recovered()
+    assert budget.lost_at is None and budget.timeout(30) == 30
+
+def test_supervise_restarts_after_session_lost(clock):
+    calls = []
+
+    def attempt(budget):
+        calls.append(budget.lost_at)
+        if len(calls) < 3:
+            raise ss.SessionLost("tab crashed")
+        return "in call"
+
+    assert ss.supervise("t", attempt) == "in call"
+    assert len(calls) == 3 and calls[0] is None and calls[1] is not None
+
+def test_supervise_gives_up_when_the_budget_is_spent(clock):
+    calls = []
+
+    def attempt(budget):
+        calls.append(1)
+        raise ss.SessionLost("chromedriver exited")
+
+    assert ss.supervise("t", attempt) is None
+    assert len(calls) == ss.MAX_RESTARTS + 1
+
+def test_supervise_reraises_errors_outside_a_restart(clock):
+    def attempt(budget):
+        raise ValueError("bad config")
+
+    with pytest.raises(ValueError):
+        ss.supervise("t", attempt)
+
+def test_supervise_stops_when_asked(clock):
+    def attempt(budget):
+        raise ss.SessionLost("gone")
+
+    assert ss.supervise("t", attempt, stop=lambda: True) is None
+    assert clock.slept == []
+
+def test_process_alive_for_this_process():
+    import os
+    assert ss.process_alive(os.getpid())
+    assert not ss.process_alive(2 ** 22 + 12345)
@@ -0,0 +1,66 @@
+import pytest
+
+import usb_planner
+
+class FakeRegistry:
+    def __init__(self, modes):
+        self._modes = modes
+        self.constraints = {}
+
+    def modes(self, dev):
+        return self._modes[dev]
+
+    def set_constraints(self, dev, constraints):
+        self.constraints[dev] = constraints
+
+UVC_MODES = [
+    ("MJPG", 1280, 720, 30), ("YUYV", 1280, 720, 30),
+    ("MJPG", 640, 480, 30), ("YUYV", 640, 480, 30),
+    ("YUYV", 320, 240, 30),
+]
+
+@pytest.fixture
+def registry(monkeypatch):
+    reg = FakeRegistry({"/dev/video0": UVC_MODES, "/dev/video2": UVC_MODES})
+    monkeypatch.setattr(usb_planner, "REGISTRY", reg)
+    monkeypatch.setattr(usb_planner, "bus_of", lambda dev: ("1", 480))
+    return reg
+
+def test_chromium_format_prefers_uncompressed():
+    assert usb_planner.chromium_format(["MJPG", "YUYV"]) == "YUYV"
+    assert usb_planner.chromium_format(["MJPG"]) == "MJPG"
+
+def test_candidate_modes_cost_the_format_chromium_streams(registry):
+    modes = usb_planner.candidate_modes("/dev/video0")
+    assert modes[0] == ("YUYV", 1280, 720, 30)
+    assert all(m[0] == "YUYV" for m in modes)
+    assert [m[2] for m in modes] == [720, 480, 240]
+
+def test_candidate_modes_keep_mjpeg_only_sizes(registry):
+    registry._modes["/dev/video0"] = [("MJPG", 1280, 720, 30), ("YUYV", 1280, 720, 10)]
+    modes = usb_planner.candidate_modes("/dev/video0")
+    assert modes == [("MJPG", 1280, 720, 30), ("YUYV", 1280, 720, 10)]
+
+def test_plan_steps_down_until_the_bus_fits(registry):
+    result = usb_planner.plan(["/dev/video0", "/dev/video2"])
+    assert {p["height"] for p in result.values()} == {480}
+    total = sum(usb_planner.mode_cost((p["fourcc"], p["width"], p["height"], p["fps"])) for p in result.values())
+    assert total <= usb_planner.BUS_BUDGET[480]
+
+def test_plan_keeps_best_modes_when_budget_allows(registry):
+    result = usb_planner.plan(["/dev/video0", "/dev/video2"], budgets={"1": 200e6})
+    assert all((p["width"], p["height"]) == (1280, 720) for p in result.values())
+
+def test_plan_falls_to_lowest_modes_when_nothing_fits(registry):
+    result = usb_planner.plan(["/dev/video0", "/dev/video2"], budgets={"1": 1e6})
+    assert {p["height"] for p in result.values()} == {240}
+
+def test_plan_skips_cameras_without_usable_modes(registry):
+    registry._modes["/dev/video2"] = [("H264", 1920, 1080, 30)]
+    assert list(usb_planner.plan(["/dev/video0", "/dev/video2"])) == ["/dev/video0"]
+
+def test_apply_plan_sets_browser_constraints(registry):
+    usb_planner.apply_plan(["/dev/video0"])
+    c = registry.constraints["/dev/video0"]
+    assert c["height"] == {"ideal": 480}     # YUYV 720p alone is over the USB 2.0 budget
+    assert c["frameRate"] == {"ideal": 30, "max": 30}
@@ -0,0 +1,142 @@
+# ============================================================
+# CareBridge — USB bandwidth / capture-format planner
+# Two UVC cameras on one Pi USB controller often fail to start or
+# drop frames at YUYV 720p: uncompressed video reserves most of a
+# USB 2.0 bus per camera. The planner lists each camera's modes via
+# V4L2 ioctls, groups cameras by USB bus and picks the best
+# size × fps combination that fits the shared budget.
+# The chosen size/fps is handed to the browser through the camera
+# registry so every session asks for exactly what the bus allows.
+#
+# Limitation: getUserMedia cannot ask for a pixel format. Chromium's
+# V4L2 capturer takes an uncompressed format (YUYV) whenever the camera
+# offers one at the requested size and fps, and MJPEG only when it
+# does not. Each size/fps is therefore costed in the format Chromium
+# will stream (CHROMIUM_ORDER), so a fitting plan usually means a
+# smaller YUYV size, not the same size in MJPEG.
+#
+#   python3 usb_planner.py /dev/video0 /dev/video2
+# ============================================================
+
+import os
+
+from camera_registry import REGISTRY, SYSFS_V4L, read_sysfs, usb_device_dir
+
+# usable isochronous budget per bus, bytes/s (USB 2.0 HS ≈ 60 MB/s periodic max)
+BUS_BUDGET = {480: 40e6, 5000: 300e6, 12: 1.0e6}
+DEFAULT_BUDGET = 40e6
+
+# bytes per pixel on the wire
+BYTES_PER_PIXEL = {"YUYV": 2.0, "UYVY": 2.0, "NV12": 1.5, "MJPG": 0.35, "H264": 0.08}
+
+MAX_HEIGHT = 720
+MAX_FPS = 30
+PREFERRED = ("MJPG", "YUYV")
+# Chromium's capture format preference for one size/fps (first offered wins)
+CHROMIUM_ORDER = ("NV12", "YUYV", "UYVY", "MJPG")
+
+# ----------------------------------------------------------------------
+# 📐 COST MODEL
+# ----------------------------------------------------------------------
+def mode_cost(mode):
+    """Estimated bus bytes/s for one (fourcc, w, h, fps) mode."""
+    fmt, w, h, fps = mode
+    return w * h * fps * BYTES_PER_PIXEL.get(fmt, 2.0)
+
+def mode_quality(mode):
+    """Sort key: higher is better — resolution first, then frame rate, then the cheaper format."""
+    fmt, w, h, fps = mode
+    return (min(h, MAX_HEIGHT) * w, min(fps, MAX_FPS), -mode_cost(mode))
+
+def chromium_format(fmts):
+    """The fourcc Chromium streams when a size/fps is offered in fmts."""
+    return min(fmts, key=lambda f: CHROMIUM_ORDER.index(f) if f in CHROMIUM_ORDER else len(CHROMIUM_ORDER))
+
+def bus_of(dev):
+    """Return (bus id, link speed Mbit/s) for a /dev/videoN node."""
+    usb = usb_device_dir(os.path.join(SYSFS_V4L, os.path.basename(dev)))
+    if not usb:
+        return "unknown", 480
+    speed = read_sysfs(os.path.join(usb, "speed"), "480")
+    try:
+        speed = int(float(speed))
+    except ValueError:
+        speed = 480
+    return read_sysfs(os.path.join(usb, "busnum"), "unknown"), speed
+
+def candidate_modes(dev):
+    """Usable modes for dev, best first, each in the format Chromium will pick for it."""
+    try:
+        modes = REGISTRY.modes(dev)
+    except OSError as e:
+        print(f"⚠️ Cannot query {dev}: {e}")
+        return []
+    modes = [m for m in modes
+             if m[0] in PREFERRED and m[2] <= MAX_HEIGHT and 5 <= m[3] <= MAX_FPS]
+    # one entry per (size, fps), costed in the format that will really stream
+    fmts = {}
+    for m in modes:
+        fmts.setdefault((m[1], m[2], m[3]), []).append(m[0])
+    best = [(chromium_format(f),) + key for key, f in fmts.items()]
+    return sorted(best, key=mode_quality, reverse=True)
+
+# ----------------------------------------------------------------------
+# 🧮 PLANNER
+# ----------------------------------------------------------------------
+def plan(devs, budgets=None):
+    """
+    Return {dev: {"fourcc", "width", "height", "fps", "mbps", "bus"}}.
+    Every camera starts at its best mode; while a bus is over budget the
+    most expensive camera on it steps down to its next cheaper mode.
+    """
+    budgets = budgets or {}
+    cands, choice, buses = {}, {}, {}
+    for dev in devs:
+        modes = candidate_modes(dev)
+        if not modes:
+            print(f"⚠️ {dev}: no usable capture modes — skipped")
+            continue
+        cands[dev] = modes
+        choice[dev] = 0
+        bus, speed = bus_of(dev)
+        buses.setdefault(bus, {"speed": speed, "devs": []})["devs"].append(dev)
+
+    for bus, info in buses.items():
+        budget = budgets.get(bus, BUS_BUDGET.get(info["speed"], DEFAULT_BUDGET))
+        while True:
+            total = sum(mode_cost(cands[d][choice[d]]) for d in info["devs"])
+            if total <= budget:
+                break
+            # step down the camera that costs most and still has a cheaper mode
+            movable = [d for d in info["devs"]
+                       if any(mode_cost(m) < mode_cost(cands[d][choice[d]]) for m in cands[d][choice[d] + 1:])]
+            if not movable:
+                print(f"⚠️ Bus {bus}: cameras need {total / 1e6:.0f} MB/s, budget {budget / 1e6:.0f} MB/s — using lowest modes")
+                break
+            d = max(movable, key=lambda d: mode_cost(cands[d][choice[d]]))
+            cur = mode_cost(cands[d][choice[d]])
+            choice[d] = next(i for i in range(choice[d] + 1, len(cands[d])) if mode_cost(cands[d][i]) < cur)
+
+    result = {}
+    for dev, idx in choice.items():
+        fmt, w, h, fps = cands[dev][idx]
+        result[dev] = {"fourcc": fmt, "width": w, "height": h, "fps": fps,
+                       "mbps": mode_cost(cands[dev][idx]) * 8 / 1e6, "bus": bus_of(dev)[0]}
+    return result
+
+def apply_plan(devs, budgets=None):
+    """Plan devs and store the result as browser constraints in the camera registry."""
+    result = plan(devs, budgets)
+    for dev, p in result.items():
+        REGISTRY.set_constraints(dev, {
+            "width": {"ideal": p["width"]},
+            "height": {"ideal": p["height"]},
+            "frameRate": {"ideal": p["fps"], "max": p["fps"]},
+        })
+        print(f"📐 {dev}: {p['fourcc']} {p['width']}x{p['height']} @ {p['fps']:g} fps "
+              f"≈ {p['mbps']:.0f} Mbit/s on bus {p['bus']}")
+    return result
+
+if __name__ == "__main__":
+    import sys
+    apply_plan(sys.argv[1:] or [c["dev"] for c in REGISTRY.cameras()])
@@ -0,0 +1,227 @@
+# ============================================================
+# CareBridge — Minimal V4L2 ioctl helpers (stdlib only)
+# Enough of the V4L2 API to list a camera's capture modes
+# (format × size × frame rate) and to grab a few frames through
+# mmap'd driver buffers, without v4l2-ctl or extra packages.
+# ============================================================
+
+import os, fcntl, struct, mmap, select, time
+
+# ----------------------------------------------------------------------
+# ⚙️ IOCTL NUMBERS  (asm-generic _IOC layout, same on ARM and x86)
+# ----------------------------------------------------------------------
+_IOC_WRITE, _IOC_READ = 1, 2
+
+def _IOC(direction, nr, size):
+    return (direction << 30) | (size << 16) | (ord("V") << 8) | nr
+
+def _IOW(nr, size):  return _IOC(_IOC_WRITE, nr, size)
+def _IOR(nr, size):  return _IOC(_IOC_READ, nr, size)
+def _IOWR(nr, size): return _IOC(_IOC_READ | _IOC_WRITE, nr, size)
+
+CAPABILITY     = struct.Struct("16s32s32sIII3I")        # struct v4l2_capability
+FMTDESC        = struct.Struct("III32sII3I")             # struct v4l2_fmtdesc
+FRMSIZEENUM    = struct.Struct("III6I2I")                # struct v4l2_frmsizeenum
+FRMIVALENUM    = struct.Struct("IIIII6I2I")              # struct v4l2_frmivalenum
+
+_LONG64 = struct.calcsize("P") == 8
+# struct v4l2_format: u32 type + 200-byte union (8-aligned on 64-bit); only pix is used
+FORMAT_PIX     = struct.Struct("=I4x12I152x" if _LONG64 else "=I12I152x")
+REQUESTBUFFERS = struct.Struct("=4I4B")                  # struct v4l2_requestbuffers
+# struct v4l2_buffer — timeval and the m union follow the userland word size
+BUFFER         = struct.Struct("=5I4xqq16s2IQ3I4x" if _LONG64 else "=5Ill16s2II3I")
+
+VIDIOC_QUERYCAP            = _IOR(0, CAPABILITY.size)
+VIDIOC_S_FMT               = _IOWR(5, FORMAT_PIX.size)
+VIDIOC_REQBUFS             = _IOWR(8, REQUESTBUFFERS.size)
+VIDIOC_QUERYBUF            = _IOWR(9, BUFFER.size)
+VIDIOC_QBUF                = _IOWR(15, BUFFER.size)
+VIDIOC_DQBUF               = _IOWR(17, BUFFER.size)
+VIDIOC_STREAMON            = _IOW(18, 4)
+VIDIOC_STREAMOFF           = _IOW(19, 4)
+VIDIOC_ENUM_FMT            = _IOWR(2, FMTDESC.size)
+VIDIOC_ENUM_FRAMESIZES     = _IOWR(74, FRMSIZEENUM.size)
+VIDIOC_ENUM_FRAMEINTERVALS = _IOWR(75, FRMIVALENUM.size)
+
+V4L2_BUF_TYPE_VIDEO_CAPTURE = 1
+V4L2_CAP_VIDEO_CAPTURE      = 0x00000001
+V4L2_CAP_DEVICE_CAPS        = 0x80000000
+V4L2_FRMSIZE_TYPE_DISCRETE  = 1
+V4L2_FRMIVAL_TYPE_DISCRETE  = 1
+V4L2_MEMORY_MMAP            = 1
+V4L2_FIELD_ANY              = 0
+
+# sizes tried when a camera reports a stepwise/continuous range
+COMMON_SIZES = [(320, 240), (640, 360), (640, 480), (800, 600), (1024, 576),
+                (1280, 720), (1280, 960), (1920, 1080)]
+
+def fourcc(code):
+    return struct.pack("<I", code).decode("ascii", errors="replace")
+
+def fourcc_code(text):
+    return struct.unpack("<I", text.encode("ascii"))[0]
+
+def _ioctl(fd, request, st, *values):
+    buf = bytearray(st.pack(*values))
+    fcntl.ioctl(fd, request, buf)
+    return st.unpack(bytes(buf))
+
+def _cstr(raw):
+    return raw.split(b"\0", 1)[0].decode(errors="replace")
+
+# ----------------------------------------------------------------------
+# 🔎 QUERIES
+# ----------------------------------------------------------------------
+def query_cap(fd):
+    """Return dict(driver, card, bus_info, capture) for an open device."""
+    drv, card, bus, _ver, caps, dev_caps, *_ = _ioctl(fd, VIDIOC_QUERYCAP, CAPABILITY,
+                                                       b"", b"", b"", 0, 0, 0, 0, 0, 0)
+    effective = dev_caps if caps & V4L2_CAP_DEVICE_CAPS else caps
+    return {
+        "driver": _cstr(drv),
+        "card": _cstr(card),
+        "bus_info": _cstr(bus),
+        "capture": bool(effective & V4L2_CAP_VIDEO_CAPTURE),
+    }
+
+def enum_formats(fd):
+    """Yield (fourcc_code, description) for every capture pixel format."""
+    i = 0
+    while True:
+        try:
+            _, _, _, desc, pixfmt, *_ = _ioctl(fd, VIDIOC_ENUM_FMT, FMTDESC,
+                                               i, V4L2_BUF_TYPE_VIDEO_CAPTURE, 0, b"", 0, 0, 0, 0, 0)
+        except OSError:
+            return
+        yield pixfmt, _cstr(desc)
+        i += 1
+
+def enum_frame_sizes(fd, pixfmt):
+    """Yield (width, height) for a pixel format."""
+    i = 0
+    while True:
+        try:
+            _, _, ftype, *u = _ioctl(fd, VIDIOC_ENUM_FRAMESIZES, FRMSIZEENUM,
+                                     i, pixfmt, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+        except OSError:
+            return
+        if ftype == V4L2_FRMSIZE_TYPE_DISCRETE:
+            yield u[0], u[1]
+            i += 1
+            continue
+        min_w, max_w, _, min_h, max_h, _ = u[:6]
+        for w, h in COMMON_SIZES:
+            if min_w <= w <= max_w and min_h <= h <= max_h:
+                yield w, h
+        return
+
+def enum_frame_rates(fd, pixfmt, width, height):
+    """Yield frame rates (fps, float) for one format/size."""
+    i = 0
+    while True:
+        try:
+            _, _, _, _, itype, *u = _ioctl(fd, VIDIOC_ENUM_FRAMEINTERVALS, FRMIVALENUM,
+                                           i, pixfmt, width, height, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+        except OSError:
+            return
+        if itype == V4L2_FRMIVAL_TYPE_DISCRETE:
+            num, den = u[0], u[1]
+            if num:
+                yield den / num
+            i += 1
+            continue
+        # stepwise: min interval → max fps
+        min_num, min_den, max_num, max_den = u[:4]
+        top = min_den / min_num if min_num else 30.0
+        low = max_den / max_num if max_num else 1.0
+        for fps in (30.0, 25.0, 20.0, 15.0, 10.0, 5.0):
+            if low <= fps <= top:
+                yield fps
+        return
+
+def list_modes(dev):
+    """Return [(fourcc, width, height, fps)] for a /dev/videoN node ([] if not a capture node)."""
+    modes = []
+    fd = os.open(dev, os.O_RDWR | os.O_NONBLOCK)
+    try:
+        if not query_cap(fd)["capture"]:
+            return modes
+        for pixfmt, _ in enum_formats(fd):
+            for w, h in enum_frame_sizes(fd, pixfmt):
+                for fps in enum_frame_rates(fd, pixfmt, w, h):
+                    modes.append((fourcc(pixfmt), w, h, round(fps, 2)))
+    finally:
+        os.close(fd)
+    return modes
+
+# ----------------------------------------------------------------------
+# 📸 MMAP CAPTURE
+# ----------------------------------------------------------------------
+def _buffer(index=0, bytesused=0, offset=0, length=0):
+    """Pack a v4l2_buffer for a capture/mmap request."""
+    return (index, V4L2_BUF_TYPE_VIDEO_CAPTURE, bytesused, 0, V4L2_FIELD_ANY,
+            0, 0, b"", 0, V4L2_MEMORY_MMAP, offset, length, 0, 0)
+
+class MmapCapture:
+    """
+    Streams frames through driver buffers mapped into our address space.
+    frames() yields memoryviews over the mapped buffer — valid only until
+    the next iteration, when the buffer is handed back to the driver.
+    """
+
+    def __init__(self, dev, width=320, height=240, pixfmt="YUYV", buffers=2):
+        self.dev = dev
+        self.fd = os.open(dev, os.O_RDWR | os.O_NONBLOCK)
+        self.maps = []
+        self.streaming = False
+        try:
+            fields = [V4L2_BUF_TYPE_VIDEO_CAPTURE, width, height, fourcc_code(pixfmt), V4L2_FIELD_ANY] + [0] * 8
+            out = _ioctl(self.fd, VIDIOC_S_FMT, FORMAT_PIX, *fields)
+            self.width, self.height, self.pixfmt = out[1], out[2], fourcc(out[3])
+            self.bytesperline = out[5] or self.width * 2
+            count = _ioctl(self.fd, VIDIOC_REQBUFS, REQUESTBUFFERS,
+                           buffers, V4L2_BUF_TYPE_VIDEO_CAPTURE, V4L2_MEMORY_MMAP, 0, 0, 0, 0, 0)[0]
+            for i in range(count):
+                b = _ioctl(self.fd, VIDIOC_QUERYBUF, BUFFER, *_buffer(i))
+                self.maps.append(mmap.mmap(self.fd, b[11], mmap.MAP_SHARED, mmap.PROT_READ, offset=b[10]))
+                _ioctl(self.fd, VIDIOC_QBUF, BUFFER, *_buffer(i))
+            fcntl.ioctl(self.fd, VIDIOC_STREAMON, struct.pack("I", V4L2_BUF_TYPE_VIDEO_CAPTURE))
+            self.streaming = True
+        except Exception:
+            self.close()
+            raise
+
+    def frames(self, count, deadline):
+        """Yield up to count memoryviews, stopping at time.monotonic() >= deadline."""
+        for _ in range(count):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([self.fd], [], [], remaining)[0]:
+                return
+            b = _ioctl(self.fd, VIDIOC_DQBUF, BUFFER, *_buffer())
+            index, bytesused = b[0], b[2]
+            view = memoryview(self.maps[index])[:bytesused]
+            try:
+                yield view
+            finally:
+                view.release()
+                _ioctl(self.fd, VIDIOC_QBUF, BUFFER, *_buffer(index))
+
+    def close(self):
+        if self.streaming:
+            try:
+                fcntl.ioctl(self.fd, VIDIOC_STREAMOFF, struct.pack("I", V4L2_BUF_TYPE_VIDEO_CAPTURE))
+            except OSError:
+                pass
+            self.streaming = False
+        for m in self.maps:
+            m.close()
+        self.maps = []
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()